@@ -0,0 +1,493 @@
+"""Benchmark the extraction pipeline on synthetic admission-table PDFs.
+
+    python -m admissions.bench                     # all layouts at 4, 16 and 64 pages
+    python -m admissions.bench --save-baseline     # store the results as the baseline
+    python -m admissions.bench --compare           # exit 1 on regressions against it
+    python -m admissions.bench --compare --baseline ci_baseline.json
+    python -m admissions.bench --memory            # RSS must stay flat over a 1000-page PDF
+    python -m admissions.bench --engine words      # read every layout with the word engine
+    python -m admissions.bench --manual            # bsu-2025 must read back the manual 2025 list
+    python -m admissions.bench --ocr               # OCR accuracy on screenshots of that list
+
+Synthetic PDFs (needs reportlab) are generated once per layout and size into
+.bench/; the registered real PDFs are added with --real when present. Each case
+runs in a fresh process, so its peak RSS is its own, and reports the time spent
+in pdfplumber (extract), the row parsers (parse) and the JSON writer (write).
+The baseline is tracked in admissions/bench_baseline.json so --compare works
+on any checkout; throughput depends on the machine, so --baseline takes one
+recorded where the comparison runs.
+--memory instead streams one long PDF page by page, samples the RSS of the
+process as it goes and fails when it grows by more than MEMORY_GROWTH_MB;
+tests/test_memory.py asserts the same bound (marked slow).
+--manual prints the hand-kept 2025 list (manual.py) as a 2025-style PDF, long
+names wrapped, and fails unless the bsu-2025 layout reads every record back.
+--ocr renders that PDF as screen-resolution PNGs, reads them with ocr.py
+(needs tesserocr and the language data) and reports per-field accuracy.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+
+from admissions.layouts import (HEADER_BLACKLIST, LAYOUTS, RULED_TABLES, TEXT_COLUMN_TABLES, WORD_COLUMNS,
+                                compile_layout, parse_page)
+from admissions import ocr
+from admissions.manual import get_2025_manual_data
+from admissions.metrics import current_rss_mb, peak_rss_mb
+from admissions.output import RecordWriter
+from admissions.pages import iter_page_tables
+from admissions.registry import EXTRACTORS, discover
+from admissions.words import is_word_engine
+
+BENCH_DIR = '.bench'
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+DEFAULT_PAGES = (4, 16, 64)
+ROWS_PER_PAGE = 30
+COLUMN_WIDTHS = {'name': 260, 'faculty': 200}
+ENGINES = ('tables', 'words')
+MANUAL_LAYOUT = 'bsu-2025'
+# --ocr renders screenshots at this resolution (the 8-pt synthetic text comes
+# out about 16 px high, like text in a browser screenshot) and fails below
+# this share of correctly read fields.
+SCREENSHOT_DPI = 144
+OCR_MIN_ACCURACY = 0.95
+# A case is a regression when it is this much slower or bigger than its baseline.
+DEFAULT_TOLERANCE = 0.2
+MEMORY_LAYOUT = 'bsu-2024'
+MEMORY_PAGES = 1000
+MEMORY_SAMPLES = 20
+# RSS growth from the first sample to the last that --memory still calls flat.
+MEMORY_GROWTH_MB = 32
+FONT_PATHS = (
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+    '/Library/Fonts/Arial Unicode.ttf',
+    'C:/Windows/Fonts/arial.ttf',
+)
+
+FACULTIES = ('Факультет прикладной математики и информатики', 'Механико-математический факультет',
+             'Институт бизнеса', 'Международный государственный экологический институт')
+WORDS = ('прикладная', 'математика', 'информатика', 'физика', 'биология', 'экономика', 'менеджмент',
+         'международные', 'отношения', 'компьютерная', 'безопасность', 'технологии', 'история')
+
+
+def _reportlab():
+    try:
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        from reportlab.pdfgen import canvas
+    except ImportError:
+        raise SystemExit("synthetic PDFs need reportlab: pip install reportlab") from None
+    return landscape(A4), pdfmetrics, TTFont, canvas
+
+
+def synthetic_rows(layout, count, rng):
+    """Table rows shaped like the layout's PDF, faculty rows included."""
+    fields = {index: field for field, index, _ in layout['columns']}
+    width = max(fields) + 1
+    grouped = bool(layout.get('faculty_keywords'))
+    rows = []
+    for number in range(1, count + 1):
+        faculty = FACULTIES[(number // 8) % len(FACULTIES)]
+        row = []
+        for index in range(width):
+            field = fields.get(index)
+            if field == 'num':
+                row.append(str(number))
+            elif field == 'faculty':
+                row.append(faculty if not grouped or number % 8 == 1 else '')
+            elif field == 'name':
+                row.append(' '.join(rng.sample(WORDS, 2)))
+            elif field == 'code':
+                row.append(f'1-{rng.randint(10, 99)} 01 {rng.randint(1, 9):02}')
+            else:
+                value = str(rng.randint(150, 400))
+                row.append(value + ' (к)' if field == 'score_paid' and number % 5 == 0 else value)
+        rows.append(row)
+    return rows
+
+
+def header_row(layout):
+    fields = {index: field for field, index, _ in layout['columns']}
+    return [HEADER_BLACKLIST[0] if fields.get(index) == 'name' else fields.get(index, '-')
+            for index in range(max(fields) + 1)]
+
+
+def _wrap(text, width, string_width):
+    lines = []
+    for word in text.split(' '):
+        if lines and string_width(f'{lines[-1]} {word}') <= width:
+            lines[-1] = f'{lines[-1]} {word}'
+        else:
+            lines.append(word)
+    return lines or ['']
+
+
+def write_pdf(path, layout, pages, font_path, seed=0, rows=None):
+    """Ruled tables like the 2022-2024 PDFs; only horizontal rules for text-column layouts.
+
+    rows replaces the synthetic rows. Cells wider than their column wrap onto
+    more lines of the row, as in the real PDFs, for given rows and for layouts
+    read with the word engine; other synthetic cells stay on one line (text
+    overflowing a ruled cell does not bother the table finder).
+    """
+    page_size, pdfmetrics, TTFont, canvas = _reportlab()
+    pdfmetrics.registerFont(TTFont('BenchSans', font_path))
+    settings = layout.get('table_settings') or RULED_TABLES
+    vertical_rules = settings.get('vertical_strategy') == 'lines'
+    header = header_row(layout)
+    fields = {index: field for field, index, _ in layout['columns']}
+    widths = [COLUMN_WIDTHS.get(fields.get(index), 60) for index in range(len(header))]
+    left, top, bottom_margin, row_height, leading = 30, page_size[1] - 40, 40, 16, 8
+
+    def string_width(text):
+        return pdfmetrics.stringWidth(text, 'BenchSans', 7)
+
+    def draw_page(page_rows):
+        pdf.setFont('BenchSans', 7)
+        right = left + sum(widths)
+        y = top
+        pdf.line(left, y, right, y)
+        for row in page_rows:
+            x = left
+            for cell_lines, width in zip(row, widths):
+                for i, line in enumerate(cell_lines):
+                    pdf.drawString(x + 3, y - row_height + 5 - i * leading, line)
+                x += width
+            y -= row_height + leading * (max(map(len, row)) - 1)
+            pdf.line(left, y, right, y)
+        if vertical_rules:
+            x = left
+            for width in [0] + widths:
+                x += width
+                pdf.line(x, top, x, y)
+        pdf.showPage()
+
+    def wrap(row):
+        if not wrap_cells:
+            return [[cell] for cell in row]
+        return [_wrap(cell, width - 6, string_width) for cell, width in zip(row, widths)]
+
+    pdf = canvas.Canvas(path, pagesize=page_size)
+    wrap_cells = rows is not None or is_word_engine(layout['table_settings'])
+    if rows is None:
+        rows = synthetic_rows(layout, pages * ROWS_PER_PAGE, random.Random(seed))
+    wrapped_header = wrap(header)
+    page_rows = [wrapped_header]
+    height = row_height
+    for row in rows:
+        wrapped = wrap(row)
+        row_size = row_height + leading * (max(map(len, wrapped)) - 1)
+        if len(page_rows) > ROWS_PER_PAGE or top - height - row_size < bottom_margin:
+            draw_page(page_rows)
+            page_rows = [wrapped_header]
+            height = row_height
+        page_rows.append(wrapped)
+        height += row_size
+    draw_page(page_rows)
+    pdf.save()
+
+
+def synthetic_cases(layout_names, page_counts, font_path, directory=BENCH_DIR):
+    """[(case name, pdf path, layout name)], generating missing PDFs."""
+    os.makedirs(directory, exist_ok=True)
+    cases = []
+    for layout_name in layout_names:
+        for pages in page_counts:
+            path = os.path.join(directory, f'{layout_name}-{pages}p.pdf')
+            if not os.path.exists(path):
+                write_pdf(path, LAYOUTS[layout_name], pages, font_path)
+            cases.append((f'{layout_name}/{pages}p', path, layout_name))
+    return cases
+
+
+def real_cases():
+    extractors = [extractor for extractor in EXTRACTORS.values() if extractor['layout']]
+    return [(f"{extractor['name']}/real", path, extractor['layout']) for extractor, path in discover(extractors)]
+
+
+def with_engine(layout, engine=None):
+    """layout read by pdfplumber's table finder ('tables') or the word engine ('words')."""
+    if engine == 'words':
+        return dict(layout, table_settings=WORD_COLUMNS, region=None)
+    if engine == 'tables' and is_word_engine(layout.get('table_settings')):
+        return dict(layout, table_settings=TEXT_COLUMN_TABLES, region='auto')
+    return layout
+
+
+def run_case(pdf_path, layout_name, workers=1, engine=None):
+    """Extract, parse and write one PDF; meant to run in its own process."""
+    layout = with_engine(LAYOUTS[layout_name], engine)
+    started = time.perf_counter()
+    pages = [tables for _, _, tables in iter_page_tables([pdf_path], workers=workers,
+                                                         profiles={pdf_path: layout})]
+    extracted = time.perf_counter()
+    parse_row = compile_layout(layout)
+    records = [parse_page(parse_row, tables) for tables in pages]
+    parsed = time.perf_counter()
+    output = f'{pdf_path}.bench.json'
+    with RecordWriter(output) as writer:
+        for page_records in records:
+            writer.write(page_records)
+    written = time.perf_counter()
+    os.remove(output)
+
+    total = written - started
+    return {
+        'pages': len(pages),
+        'rows': writer.count,
+        'seconds': {
+            'extract': round(extracted - started, 4),
+            'parse': round(parsed - extracted, 4),
+            'write': round(written - parsed, 4),
+            'total': round(total, 4),
+        },
+        'pages_per_sec': round(len(pages) / total, 2),
+        'rows_per_sec': round(writer.count / total, 1),
+        'peak_rss_mb': peak_rss_mb(children=True),
+    }
+
+
+def run_memory_case(pdf_path, layout_name, pages, workers=1, samples=MEMORY_SAMPLES):
+    """Stream one PDF through extract, parse and write, sampling the RSS of this process."""
+    layout = LAYOUTS[layout_name]
+    parse_row = compile_layout(layout)
+    every = max(1, pages // samples)
+    rss = []
+    output = f'{pdf_path}.bench.json'
+    with RecordWriter(output) as writer:
+        for _, page, tables in iter_page_tables([pdf_path], workers=workers, profiles={pdf_path: layout}):
+            writer.write(parse_page(parse_row, tables))
+            if page % every == 0 or page == pages - 1:
+                rss.append((page + 1, current_rss_mb()))
+    os.remove(output)
+    return {'pages': pages, 'rows': writer.count, 'rss_mb': rss, 'peak_rss_mb': peak_rss_mb()}
+
+
+def run_isolated(case, *args):
+    """case(*args) in a fresh spawned process, so the peak RSS it reports is its own."""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(case, *args).result()
+
+
+def regressions(result, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Names of the metrics where result is worse than baseline beyond tolerance."""
+    worse = []
+    if result['pages_per_sec'] < baseline['pages_per_sec'] * (1 - tolerance):
+        worse.append('pages/s')
+    if result['rows_per_sec'] < baseline['rows_per_sec'] * (1 - tolerance):
+        worse.append('rows/s')
+    if result['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + tolerance):
+        worse.append('rss')
+    return worse
+
+
+def _change(value, baseline):
+    return f'{(value / baseline - 1) * 100:+.0f}%' if baseline else '-'
+
+
+def print_results(results, baseline=None, tolerance=DEFAULT_TOLERANCE, out=sys.stdout):
+    """Print one line per case; returns the number of regressed cases."""
+    print(f"{'case':28} {'pages':>5} {'rows':>6} {'extract':>8} {'parse':>7} {'write':>7} "
+          f"{'pages/s':>8} {'rows/s':>8} {'rss MB':>7}", file=out)
+    regressed = 0
+    for case, result in results.items():
+        seconds = result['seconds']
+        line = (f"{case:28} {result['pages']:>5} {result['rows']:>6} {seconds['extract']:>8.3f} "
+                f"{seconds['parse']:>7.3f} {seconds['write']:>7.3f} {result['pages_per_sec']:>8.1f} "
+                f"{result['rows_per_sec']:>8.0f} {result['peak_rss_mb']:>7.1f}")
+        previous = (baseline or {}).get(case)
+        if previous:
+            line += (f"  | vs baseline {_change(result['pages_per_sec'], previous['pages_per_sec'])} pages/s, "
+                     f"{_change(result['peak_rss_mb'], previous['peak_rss_mb'])} rss")
+            worse = regressions(result, previous, tolerance)
+            if worse:
+                regressed += 1
+                line += f"  REGRESSION ({', '.join(worse)})"
+        print(line, file=out)
+    return regressed
+
+
+def check_memory(layout_name, pages, font_path, workers=1):
+    """Print the RSS samples of a pages-long synthetic PDF; returns True when RSS stayed flat."""
+    (case, pdf_path, _), = synthetic_cases([layout_name], [pages], font_path)
+    result = run_isolated(run_memory_case, pdf_path, layout_name, pages, workers)
+    samples = result['rss_mb']
+    if samples[0][1] is None:
+        print("current RSS is only available on Linux (/proc/self/statm)")
+        return True
+    print(f"{case}: {result['rows']} rows")
+    print(f"{'pages':>6} {'rss MB':>7}")
+    for page, rss_mb in samples:
+        print(f"{page:>6} {rss_mb:>7.1f}")
+    growth = samples[-1][1] - samples[0][1]
+    flat = growth <= MEMORY_GROWTH_MB
+    print(f"growth {growth:+.1f} MB over {pages} pages (limit {MEMORY_GROWTH_MB} MB): "
+          f"{'flat' if flat else 'REGRESSION'}, peak {result['peak_rss_mb']} MB")
+    return flat
+
+
+def manual_rows(layout, records):
+    """Table rows of layout holding the name and scores of records."""
+    fields = {index: field for field, index, _ in layout['columns']}
+    return [['' if record.get(fields.get(index)) is None else str(record[fields[index]])
+             for index in range(max(fields) + 1)] for record in records]
+
+
+def manual_pdf(font_path, directory=BENCH_DIR):
+    """Path of the manual 2025 list printed in the bsu-2025 layout, generated once."""
+    layout = LAYOUTS[MANUAL_LAYOUT]
+    os.makedirs(directory, exist_ok=True)
+    pdf_path = os.path.join(directory, f'{MANUAL_LAYOUT}-manual.pdf')
+    if not os.path.exists(pdf_path):
+        write_pdf(pdf_path, layout, 0, font_path, rows=manual_rows(layout, get_2025_manual_data()))
+    return pdf_path
+
+
+def manual_screenshots(font_path, directory=BENCH_DIR):
+    """PNG paths of the manual PDF's pages at SCREENSHOT_DPI, generated once."""
+    import pdfplumber
+
+    pdf_path = manual_pdf(font_path, directory)
+    paths = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for i, page in enumerate(pdf.pages):
+            path = os.path.join(directory, f'{MANUAL_LAYOUT}-manual-{i + 1}.png')
+            if not os.path.exists(path):
+                page.to_image(resolution=SCREENSHOT_DPI).original.save(path, dpi=(SCREENSHOT_DPI, SCREENSHOT_DPI))
+            paths.append(path)
+    return paths
+
+
+def check_manual(font_path, engine=None, directory=BENCH_DIR):
+    """Print the manual 2025 list as a PDF and read it back; returns True when nothing differs."""
+    layout = LAYOUTS[MANUAL_LAYOUT]
+    expected = get_2025_manual_data()
+    pdf_path = manual_pdf(font_path, directory)
+    read_layout = with_engine(layout, engine)
+    started = time.perf_counter()
+    pages = [tables for _, _, tables in iter_page_tables([pdf_path], profiles={pdf_path: read_layout})]
+    extracted = time.perf_counter() - started
+    parse_row = compile_layout(read_layout)
+    records = [record for tables in pages for record in parse_page(parse_row, tables)]
+
+    fields = ('name', 'score_budget', 'score_paid')
+    mismatches = 0
+    for i in range(max(len(records), len(expected))):
+        got = tuple(records[i].get(field) for field in fields) if i < len(records) else None
+        want = tuple(expected[i].get(field) for field in fields) if i < len(expected) else None
+        if got != want:
+            mismatches += 1
+            print(f"  #{i + 1}: expected {want}, read {got}")
+    table_settings = read_layout['table_settings']
+    engine_name = 'words' if is_word_engine(table_settings) else 'tables'
+    print(f"{MANUAL_LAYOUT} ({engine_name}): {len(records)} of {len(expected)} manual records read back "
+          f"from {len(pages)} pages in {extracted:.2f}s, {mismatches} mismatched")
+    return mismatches == 0
+
+
+def check_manual_ocr(font_path, lang=ocr.DEFAULT_LANG, tessdata=None, workers=1, directory=BENCH_DIR):
+    """OCR screenshots of the manual 2025 list; returns True when OCR_MIN_ACCURACY of its fields are read right.
+
+    Read records are aligned to the list on their scores, so a header read as
+    a record or a row OCR lost shifts nothing after it.
+    """
+    expected = get_2025_manual_data()
+    images = manual_screenshots(font_path, directory)
+    started = time.perf_counter()
+    records = [record for _, _, page_records, _ in ocr.iter_records(images, MANUAL_LAYOUT, lang, tessdata, workers)
+               for record in page_records]
+    elapsed = time.perf_counter() - started
+
+    fields = ('name', 'score_budget', 'score_paid')
+    scores = [(record.get('score_budget'), record.get('score_paid')) for record in records]
+    matcher = SequenceMatcher(None, [(record.get('score_budget'), record.get('score_paid')) for record in expected],
+                              scores, autojunk=False)
+    pairs = [pair for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag in ('equal', 'replace')
+             for pair in zip(range(i1, i2), range(j1, j2))]
+    right = Counter()
+    for i, j in pairs:
+        for field in fields:
+            right[field] += records[j].get(field) == expected[i].get(field)
+    for field in fields:
+        print(f"  {field:13} {right[field]:>4} of {len(expected)} right ({right[field] / len(expected):.1%})")
+    accuracy = sum(right.values()) / (len(fields) * len(expected))
+    print(f"{MANUAL_LAYOUT} (ocr, {lang}): {len(records)} records from {len(images)} screenshots at "
+          f"{SCREENSHOT_DPI} dpi in {elapsed:.1f}s, {len(records) - len(pairs)} extra; "
+          f"{accuracy:.1%} of fields right (need {OCR_MIN_ACCURACY:.0%})")
+    return accuracy >= OCR_MIN_ACCURACY
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction on synthetic admission tables")
+    parser.add_argument('--layouts', nargs='+', choices=sorted(LAYOUTS), default=sorted(LAYOUTS))
+    parser.add_argument('--pages', nargs='+', type=int, default=DEFAULT_PAGES)
+    parser.add_argument('--memory', nargs='?', type=int, const=MEMORY_PAGES, metavar='PAGES',
+                        help=f"check that RSS stays flat over one long {MEMORY_LAYOUT} PDF "
+                             f"(default: {MEMORY_PAGES} pages); exit 1 if not")
+    parser.add_argument('--manual', action='store_true',
+                        help=f"check that {MANUAL_LAYOUT} reads the manual 2025 list back from a PDF; exit 1 if not")
+    parser.add_argument('--ocr', action='store_true',
+                        help=f"OCR screenshots of the manual 2025 list; exit 1 below {OCR_MIN_ACCURACY:.0%} accuracy")
+    parser.add_argument('--lang', default=ocr.DEFAULT_LANG, help="Tesseract language(s) for --ocr")
+    parser.add_argument('--tessdata', default=os.environ.get('TESSDATA_PREFIX'),
+                        help="directory of the .traineddata files (default: $TESSDATA_PREFIX)")
+    parser.add_argument('--engine', choices=ENGINES,
+                        help="read every layout with this engine instead of its own (case names get @engine)")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--real', action='store_true', help="also benchmark the registered PDFs that are present")
+    parser.add_argument('--font', help="TTF font with Cyrillic glyphs for the synthetic PDFs")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help="results to compare with and to save into (default: admissions/bench_baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the baseline")
+    parser.add_argument('--compare', action='store_true', help="exit 1 when a case regressed")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    font_path = args.font or next((path for path in FONT_PATHS if os.path.exists(path)), None)
+    if font_path is None:
+        parser.error("no Cyrillic font found: pass --font path/to/font.ttf")
+    if args.memory:
+        return 0 if check_memory(MEMORY_LAYOUT, args.memory, font_path, args.workers) else 1
+    if args.manual:
+        return 0 if check_manual(font_path, args.engine) else 1
+    if args.ocr:
+        return 0 if check_manual_ocr(font_path, args.lang, args.tessdata, args.workers) else 1
+    cases = synthetic_cases(args.layouts, args.pages, font_path)
+    if args.real:
+        cases += real_cases()
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = {}
+    for case, pdf_path, layout_name in cases:
+        if args.engine:
+            case = f'{case}@{args.engine}'
+        results[case] = run_isolated(run_case, pdf_path, layout_name, args.workers, args.engine)
+    regressed = print_results(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    if args.compare:
+        if baseline is None:
+            parser.error(f"no baseline at {args.baseline}: run with --save-baseline first")
+        print(f"\n{regressed} regressed case(s)")
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import shutil
+
+DEFAULT_CACHE_DIR = '.extract_cache'
+DEFAULT_MAX_MB = 512
+
+# Bump when the layout of cached pages changes so old entries stop matching.
+CACHE_VERSION = 1
+
+TABLE_EXTRACTOR = 'pdfplumber.extract_tables'
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(path, *parts, digest=None):
+    """Cache key: content hash of path + whatever else decides what is cached for it.
+
+    digest is path's file_digest, when the caller already has it.
+    """
+    parts = [digest or file_digest(path), *parts, str(CACHE_VERSION)]
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+def document_key(pdf_path, extractor=TABLE_EXTRACTOR, digest=None):
+    """Cache key: PDF content hash + table extractor + its version."""
+    import pdfplumber
+
+    return cache_key(pdf_path, extractor, pdfplumber.__version__, digest=digest)
+
+
+class TableCache:
+    """Raw extract_tables() output per page, stored as one JSON file per page.
+
+    Entries live in <directory>/<document_key>/; a document's page count is
+    kept next to its pages so a fully cached PDF is never opened. Once the
+    directory grows past max_bytes the least recently used pages are dropped.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _document_dir(self, key):
+        return os.path.join(self.directory, key)
+
+    def _write(self, path, value):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _read(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+        return value
+
+    def page_count(self, key):
+        meta = self._read(os.path.join(self._document_dir(key), 'meta.json'))
+        return meta['page_count'] if meta else None
+
+    def set_page_count(self, key, page_count):
+        self._write(os.path.join(self._document_dir(key), 'meta.json'), {'page_count': page_count})
+
+    def has_page(self, key, page_index):
+        return os.path.exists(os.path.join(self._document_dir(key), f'{page_index}.json'))
+
+    def get_page(self, key, page_index):
+        return self._read(os.path.join(self._document_dir(key), f'{page_index}.json'))
+
+    def put_page(self, key, page_index, tables):
+        self._write(os.path.join(self._document_dir(key), f'{page_index}.json'), tables)
+
+    def load_regions(self):
+        return self._read(os.path.join(self.directory, 'regions.json')) or {}
+
+    def save_regions(self, regions):
+        self._write(os.path.join(self.directory, 'regions.json'), regions)
+
+    def invalidate(self, key):
+        shutil.rmtree(self._document_dir(key), ignore_errors=True)
+
+    def evict(self):
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+        return total
+
+
+def add_cache_arguments(parser):
+    parser.add_argument('--no-cache', action='store_true',
+                        help="always run pdfplumber, ignoring and not filling the page cache")
+    parser.add_argument('--invalidate', action='store_true',
+                        help="drop cached pages of the input PDFs before extracting")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f"page cache location (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_MB,
+                        help=f"evict least recently used pages above this size (default: {DEFAULT_MAX_MB})")
+
+
+def cache_from_args(args):
+    if args.no_cache:
+        return None
+    return TableCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
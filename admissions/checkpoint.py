@@ -0,0 +1,84 @@
+import json
+import os
+
+from admissions.cache import file_digest
+from admissions.output import read_records
+
+
+def checkpoint_path(output):
+    return f'{output}.checkpoint.json'
+
+
+class Checkpoint:
+    """Manifest of the (pdf, page) units already written to an output file.
+
+    Units are listed in output order with their row counts, so the records of
+    each unit can be cut back out of the output on the next run. A unit is
+    reused when its PDF bytes and layout fingerprint are unchanged; 'state' is
+    the layout state after the page (the carried-over faculty), restored
+    before the next page is parsed. Units without a pdf (manual data) are
+    always rebuilt.
+
+    The manifest is NDJSON: a header line naming the output, then one line
+    per unit, appended and flushed as the unit is written. A page costs one
+    line, not a rewrite of the whole manifest, and a line cut short by a
+    crash is ignored.
+    """
+
+    def __init__(self, output, path=None):
+        self.output = output
+        self.path = path or checkpoint_path(output)
+        self._file = None
+
+    def load_reusable(self, fingerprints):
+        """Return {(pdf, page): (records, state)} for units that can be kept as-is.
+
+        fingerprints maps each pdf of this run to its layout fingerprint.
+        """
+        try:
+            manifest = read_records(self.path, partial=True)
+            records = read_records(self.output, partial=True)
+        except (OSError, ValueError):
+            return {}
+        if not manifest or manifest[0] != {'output': self.output}:
+            return {}
+
+        digests = {}
+        reusable = {}
+        offset = 0
+        for unit in manifest[1:]:
+            rows = records[offset:offset + unit['rows']]
+            offset += unit['rows']
+            if len(rows) < unit['rows']:
+                break
+            pdf = unit['pdf']
+            if pdf not in fingerprints or unit['layout'] != fingerprints[pdf]:
+                continue
+            if pdf not in digests:
+                digests[pdf] = file_digest(pdf) if os.path.exists(pdf) else None
+            if unit['digest'] == digests[pdf]:
+                reusable[(pdf, unit['page'])] = (rows, unit['state'])
+        return reusable
+
+    def add(self, pdf, page, digest, layout, rows, state):
+        """Record a unit written to the output; the first call starts a new manifest."""
+        if self._file is None:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._append({'output': self.output})
+        self._append({
+            'pdf': pdf,
+            'page': page,
+            'digest': digest,
+            'layout': layout,
+            'rows': rows,
+            'state': dict(state),
+        })
+
+    def _append(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,130 @@
+"""Extract every registered university and year into one merged dataset.
+
+    python -m admissions                                # all default extractors
+    python -m admissions --list                         # extractors and the files they match
+    python -m admissions --university bsu --year 2024 --workers 4
+
+Extractors and their input globs live in registry.py. All matched PDFs share
+one process pool, so each added university costs its pages, not another
+sequential script run. Records carry a 'university' field in front of the
+fields the layout produces.
+"""
+import argparse
+import sys
+from collections import Counter
+
+from admissions.cache import add_cache_arguments, cache_from_args
+from admissions.layouts import LAYOUTS, compile_layout, parse_page
+from admissions.metrics import RunMetrics
+from admissions.output import FORMATS, RecordWriter
+from admissions.pages import iter_page_tables, split_by_pdf
+from admissions.registry import EXTRACTORS, discover, select
+
+DEFAULT_OUTPUT = 'admission_data.json'
+
+
+def with_university(records, university):
+    return [dict({'university': university}, **record) for record in records]
+
+
+def extract(jobs, writer, workers=1, cache=None, invalidate=False, metrics=None, specialty_ids=False, pool=None):
+    """Write the records of discovered jobs to writer in job order; returns rows per extractor.
+
+    pool is an executor kept by the caller across calls (see watch.py).
+    """
+    metrics = metrics or RunMetrics()
+    profiles = {path: LAYOUTS[extractor['layout']] for extractor, path in jobs if extractor['layout']}
+    page_stream = iter_page_tables(list(profiles), workers=workers, cache=cache, invalidate=invalidate,
+                                   profiles=profiles, metrics=metrics, pool=pool)
+    documents = split_by_pdf(page_stream, list(profiles))
+    indexes = {}
+    counts = Counter()
+
+    def write(extractor, records, path=None, page=None):
+        if specialty_ids:
+            from admissions.specialties import SpecialtyIndex, annotate
+
+            university = extractor['university']
+            if university not in indexes:
+                indexes[university] = SpecialtyIndex.for_university(university)
+            annotate(records, indexes[university])
+        with metrics.stage('write', path, page):
+            writer.write(records)
+        counts[extractor['name']] += len(records)
+
+    for extractor, path in jobs:
+        if extractor['layout'] is None:
+            records = extractor['records'](path) if path else extractor['records']()
+            write(extractor, with_university(records, extractor['university']), path)
+            continue
+        _, pages = next(documents)
+        drops = Counter()
+        parse_row = compile_layout(profiles[path], {}, drops)
+        for page, tables in enumerate(pages):
+            dropped_before = Counter(drops)
+            with metrics.stage('parse', path, page):
+                records = with_university(parse_page(parse_row, tables), extractor['university'])
+            metrics.count_rows(path, page, len(records), drops - dropped_before)
+            write(extractor, records, path, page)
+    return counts
+
+
+def print_extractors(extractors, root):
+    matched = {}
+    for extractor, path in discover(extractors, root):
+        matched.setdefault(extractor['name'], []).append(path or 'records')
+    for extractor in extractors:
+        source = f"layout {extractor['layout']}" if extractor['layout'] else 'records'
+        flag = '' if extractor['default'] else ' (opt-in)'
+        print(f"{extractor['name']:18} | {extractor['university']:5} | {extractor['year']} | {source}{flag}")
+        for path in matched.get(extractor['name'], ['no input matched: ' + str(extractor['inputs'])]):
+            print(f"{'':18}   {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m admissions',
+                                     description="Extract admission tables of all registered universities")
+    parser.add_argument('--extractor', action='append', choices=sorted(EXTRACTORS), metavar='NAME',
+                        help="run only these extractors, opt-in ones included (repeatable)")
+    parser.add_argument('--university', action='append', help="only these universities (repeatable)")
+    parser.add_argument('--year', action='append', type=int, help="only these years (repeatable)")
+    parser.add_argument('--input-dir', default='.', help="directory the input globs are relative to")
+    parser.add_argument('--list', action='store_true', help="show extractors and matched inputs, extract nothing")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes shared by all PDFs for table detection (default: 1, serial)")
+    parser.add_argument('--format', choices=FORMATS, default='json')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--specialty-ids', action='store_true', help="add specialty_id to every record")
+    parser.add_argument('--profile', nargs='?', const='extract_metrics.json', metavar='PATH',
+                        help="write per-stage, per-page timings as JSON (default: extract_metrics.json)")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    extractors = select(args.extractor, args.university, args.year)
+    if not extractors:
+        parser.error("no extractor matches the given filters")
+    try:
+        jobs = discover(extractors, args.input_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.list:
+        print_extractors(extractors, args.input_dir)
+        return 0
+
+    missing = {extractor['name'] for extractor in extractors} - {extractor['name'] for extractor, _ in jobs}
+    for name in sorted(missing):
+        print(f"warning: {name}: no input matched {EXTRACTORS[name]['inputs']}", file=sys.stderr)
+
+    metrics = RunMetrics()
+    with RecordWriter(args.output, args.format) as writer:
+        counts = extract(jobs, writer, workers=args.workers, cache=cache_from_args(args),
+                         invalidate=args.invalidate, metrics=metrics, specialty_ids=args.specialty_ids)
+
+    for extractor in extractors:
+        if extractor['name'] not in missing:
+            print(f"{extractor['name']:18} {counts[extractor['name']]:>6} records")
+    print(f"{'TOTAL':18} {writer.count:>6} records -> {args.output}")
+    if args.profile:
+        metrics.write(args.profile)
+        metrics.print_summary()
+    return 0
@@ -0,0 +1,163 @@
+"""Columnar copies of the admission dataset (optional, needs pyarrow).
+
+    python -m admissions.columnar export bsu_admission_all_data.json bsu_admission.parquet
+    python -m admissions.columnar scan bsu_admission.parquet --columns name score_budget --year 2024
+
+Rows are stored sorted by university and year, one Parquet row group (Arrow
+record batch) per university and year. A .parquet file is zstd-compressed
+and its row-group statistics let year filters skip whole groups. A .arrow
+file (Arrow IPC) is uncompressed and read through a memory map. Text columns
+that repeat (university, type, faculty, name, code, specialty_id) are
+dictionary-encoded in both. Every record gets every column of the file;
+fields a layout does not produce read back as None.
+"""
+import argparse
+import sys
+
+from admissions.output import read_records
+
+COLUMNAR_FORMATS = {'.parquet': 'parquet', '.arrow': 'ipc', '.feather': 'ipc'}
+DICTIONARY_FIELDS = ('university', 'type', 'faculty', 'name', 'code', 'specialty_id')
+# Known fields in file order; others are appended with the type pyarrow infers.
+FIELD_TYPES = {
+    'university': 'dictionary',
+    'year': 'int16',
+    'type': 'dictionary',
+    'num': 'int32',
+    'faculty': 'dictionary',
+    'name': 'dictionary',
+    'code': 'dictionary',
+    'places_budget': 'int32',
+    'score_budget': 'int32',
+    'score_paid': 'int32',
+    'avg_budget': 'int32',
+    'specialty_id': 'dictionary',
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("columnar files need pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def columnar_format(path):
+    """'parquet', 'ipc' or None for the non-columnar formats of output.py."""
+    for extension, format in COLUMNAR_FORMATS.items():
+        if path.endswith(extension):
+            return format
+    return None
+
+
+def _arrow_type(pa, name):
+    kind = FIELD_TYPES[name]
+    if kind == 'dictionary':
+        return pa.dictionary(pa.int32(), pa.string())
+    return getattr(pa, kind)()
+
+
+def to_table(records):
+    """pyarrow Table of records; columns are the union of their fields."""
+    pa = _pyarrow()
+    records = list(records)
+    present = dict.fromkeys(name for record in records for name in record)
+    names = [name for name in FIELD_TYPES if name in present]
+    names += [name for name in present if name not in FIELD_TYPES]
+    columns = {}
+    for name in names:
+        values = [record.get(name) for record in records]
+        if name in FIELD_TYPES:
+            columns[name] = pa.array(values, type=_arrow_type(pa, name))
+        else:
+            columns[name] = pa.array(values)
+    return pa.table(columns)
+
+
+def _group_key(record):
+    return record.get('university') or '', record.get('year') or 0
+
+
+def write_table(records, path):
+    """Write records to a .parquet or .arrow/.feather file; returns the row count."""
+    pa = _pyarrow()
+    format = columnar_format(path)
+    if format is None:
+        raise ValueError(f"{path}: expected one of {', '.join(COLUMNAR_FORMATS)}")
+    records = sorted(records, key=_group_key)
+    table = to_table(records)
+    groups = []
+    for index, record in enumerate(records):
+        if not groups or _group_key(records[groups[-1][0]]) != _group_key(record):
+            groups.append([index, 0])
+        groups[-1][1] += 1
+
+    if format == 'parquet':
+        dictionary = [name for name in DICTIONARY_FIELDS if name in table.column_names]
+        with pa.parquet.ParquetWriter(path, table.schema, compression='zstd', use_dictionary=dictionary) as writer:
+            for start, length in groups:
+                writer.write_table(table.slice(start, length))
+    else:
+        options = pa.ipc.IpcWriteOptions(unify_dictionaries=True)
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            for start, length in groups:
+                writer.write_table(table.slice(start, length))
+    return table.num_rows
+
+
+def scan(path, columns=None, years=None, universities=None):
+    """Read a columnar file as a pyarrow Table, only the given columns and rows.
+
+    Filters are pushed down: Parquet row groups whose year statistics miss
+    are not read, Arrow files are memory-mapped and filtered in place.
+    """
+    pa = _pyarrow()
+    condition = None
+    for field, values in (('year', years), ('university', universities)):
+        if values:
+            expression = pa.dataset.field(field).isin(list(values))
+            condition = expression if condition is None else condition & expression
+    if columnar_format(path) == 'ipc':
+        # read_all() on a memory map copies nothing; the map stays open as
+        # long as the returned table references it.
+        dataset = pa.dataset.dataset(pa.ipc.open_file(pa.memory_map(path)).read_all())
+    else:
+        dataset = pa.dataset.dataset(path, format='parquet')
+    return dataset.to_table(columns=list(columns) if columns else None, filter=condition)
+
+
+def read_columnar(path, columns=None, years=None, universities=None):
+    """Records (dicts) of a columnar file; see scan()."""
+    return scan(path, columns, years, universities).to_pylist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the admission dataset to Parquet/Arrow and scan it")
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help="convert a json/ndjson output file")
+    export.add_argument('source', nargs='?', default='bsu_admission_all_data.json')
+    export.add_argument('target', nargs='?', default='bsu_admission_all_data.parquet',
+                        help=f"output file, format from its extension ({', '.join(COLUMNAR_FORMATS)})")
+    read = commands.add_parser('scan', help="print selected columns and rows of a columnar file")
+    read.add_argument('path')
+    read.add_argument('--columns', nargs='+')
+    read.add_argument('--year', type=int, action='append')
+    read.add_argument('--university', action='append')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        rows = write_table(read_records(args.source), args.target)
+        print(f"Wrote {rows} records to {args.target}")
+        return 0
+    table = scan(args.path, args.columns, args.year, args.university)
+    for record in table.to_pylist():
+        print(' | '.join('-' if value is None else str(value) for value in record.values()))
+    print(f"{table.num_rows} records", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
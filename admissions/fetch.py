@@ -0,0 +1,180 @@
+"""Download the source PDFs of registered extractors (needs aiohttp).
+
+    python -m admissions.fetch                          # every extractor with a url
+    python -m admissions.fetch --source graduates/БГУ2024.pdf=http://localhost:8000/bsu2024.pdf
+    python -m admissions.fetch --extract                # then extract the files that changed
+
+Source URLs come from the registry (register(..., url=...)) and --source.
+Downloads run concurrently over one pooled aiohttp session. The ETag and
+Last-Modified of every download are kept in .fetch_state.json under the input
+directory, so later runs send conditional requests and an unchanged file costs
+a 304. Bodies stream to a temporary file that replaces the old one only once
+the download completed with different content; only such files count as
+changed and go to the extractor.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+
+from admissions.cache import add_cache_arguments, cache_from_args, file_digest
+from admissions.registry import EXTRACTORS, discover, select
+
+FETCH_STATE = '.fetch_state.json'
+DEFAULT_CONCURRENCY = 4
+CHUNK_SIZE = 1 << 16
+
+
+def _aiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        raise SystemExit("fetching needs aiohttp: pip install aiohttp") from None
+    return aiohttp
+
+
+def _read_state(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_state(path, state):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+async def fetch_one(session, url, path, known=None):
+    """Download url to path unless the server or the content says it is unchanged.
+
+    known is the state entry of the previous download; returns (new entry, changed).
+    """
+    exists = os.path.exists(path)
+    headers = {}
+    if exists and known and known.get('url') == url:
+        if known.get('etag'):
+            headers['If-None-Match'] = known['etag']
+        if known.get('last_modified'):
+            headers['If-Modified-Since'] = known['last_modified']
+
+    async with session.get(url, headers=headers) as response:
+        if response.status == 304:
+            return known, False
+        response.raise_for_status()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.part'
+        digest = hashlib.sha256()
+        try:
+            with open(tmp_path, 'wb') as f:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        entry = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'sha256': digest.hexdigest(),
+        }
+
+    # A hand-downloaded file has no state yet; compare its content instead.
+    previous = known.get('sha256') if known else None
+    if exists and previous is None:
+        previous = file_digest(path)
+    if exists and previous == entry['sha256']:
+        os.remove(tmp_path)
+        return entry, False
+    os.replace(tmp_path, path)
+    return entry, True
+
+
+async def _fetch_all(sources, root, state, concurrency):
+    aiohttp = _aiohttp()
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        downloads = [fetch_one(session, url, os.path.join(root, path), state.get(path))
+                     for path, url in sources.items()]
+        return await asyncio.gather(*downloads, return_exceptions=True)
+
+
+def fetch_all(sources, root='.', concurrency=DEFAULT_CONCURRENCY):
+    """Fetch {path: url} (paths relative to root); returns (changed paths, {path: error}).
+
+    Changed paths are joined with root and normalized like registry.discover().
+    """
+    state_path = os.path.join(root, FETCH_STATE)
+    state = _read_state(state_path)
+    results = asyncio.run(_fetch_all(sources, root, state, concurrency))
+    changed = []
+    errors = {}
+    for path, result in zip(sources, results):
+        if isinstance(result, Exception):
+            errors[path] = result
+            continue
+        state[path], is_changed = result
+        if is_changed:
+            changed.append(os.path.normpath(os.path.join(root, path)))
+    _write_state(state_path, state)
+    return changed, errors
+
+
+def configured_sources(extractors):
+    """{input path: url} of the extractors that have a url."""
+    return {extractor['inputs']: extractor['url'] for extractor in extractors if extractor['url']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download source PDFs and extract the changed ones")
+    parser.add_argument('--extractor', action='append', choices=sorted(EXTRACTORS), metavar='NAME',
+                        help="fetch only the sources of these extractors (repeatable)")
+    parser.add_argument('--source', action='append', default=[], metavar='PATH=URL',
+                        help="fetch URL to PATH, overriding the registry url for PATH (repeatable)")
+    parser.add_argument('--input-dir', default='.', help="directory the source paths are relative to")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"simultaneous connections (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--extract', nargs='?', const='fetched_admission_data.json', metavar='PATH',
+                        help="extract the changed PDFs to PATH (default: fetched_admission_data.json)")
+    parser.add_argument('--workers', type=int, default=1, help="processes for --extract (default: 1)")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    sources = configured_sources(select(args.extractor or list(EXTRACTORS)))
+    for item in args.source:
+        path, separator, url = item.partition('=')
+        if not separator or not path or not url:
+            parser.error(f"--source expects PATH=URL, got {item!r}")
+        sources[path] = url
+    if not sources:
+        parser.error("no source URLs: register extractors with url=... or pass --source PATH=URL")
+
+    changed, errors = fetch_all(sources, args.input_dir, args.concurrency)
+    for path, error in errors.items():
+        print(f"error: {path}: {error}", file=sys.stderr)
+    print(f"{len(sources)} sources: {len(changed)} changed, {len(errors)} failed")
+    for path in changed:
+        print(f"  {path}")
+
+    if args.extract and changed:
+        from admissions.cli import extract
+        from admissions.output import RecordWriter
+
+        jobs = [job for job in discover(select(list(EXTRACTORS)), args.input_dir) if job[1] in changed]
+        for path in sorted(set(changed) - {path for _, path in jobs}):
+            print(f"warning: {path}: no extractor reads this file", file=sys.stderr)
+        with RecordWriter(args.extract) as writer:
+            extract(jobs, writer, workers=args.workers, cache=cache_from_args(args), invalidate=args.invalidate)
+        print(f"{writer.count} records -> {args.extract}")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Next year's passing scores for every specialty (needs numpy).
+
+    python -m admissions.forecast [--input bsu_admission_all_data.json] [--output admission_forecasts.json]
+    python -m admissions.forecast --from-db --load --dsn postgresql://...
+
+Each score series (a specialty's min_score or paid_min_score over the years,
+see loader.stats_rows) gets a least-squares line, all series at once as one
+masked matrix: a few thousand refit in milliseconds. The band is the 95%
+prediction interval of the line. Series with too few years for their own
+residuals (one or two years) borrow the pooled residual spread of the others.
+Rows keep the admission_stats key, ready for public.admission_forecasts.
+"""
+import argparse
+import sys
+import time
+
+from admissions.frame import SCORE_MAX, SCORE_MIN
+from admissions.loader import KEY, add_input_arguments, connect, load, rows_from_args
+from admissions.output import add_output_argument, write_output
+
+FORECASTS_TABLE = 'public.admission_forecasts'
+FORECAST_FIELDS = ('min_score', 'paid_min_score')
+FORECAST_COLUMNS = tuple(
+    f'{field}{suffix}' for field in FORECAST_FIELDS for suffix in ('', '_low', '_high')
+) + ('observed_years',)
+# Two-sided 95% Student t quantiles for 1..10 degrees of freedom, then the normal one.
+T_QUANTILES = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228, 1.960)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise SystemExit("forecasts need numpy: pip install numpy") from None
+    return numpy
+
+
+def series_matrix(rows, field):
+    """(specialty ids, years, specialty x year array of field with NaN gaps)."""
+    np = _numpy()
+    specialties = sorted({row['specialty_id'] for row in rows})
+    first = min(row['year'] for row in rows)
+    years = list(range(first, max(row['year'] for row in rows) + 1))
+    position = {specialty_id: i for i, specialty_id in enumerate(specialties)}
+    matrix = np.full((len(specialties), len(years)), np.nan)
+    for row in rows:
+        if row[field] is not None:
+            matrix[position[row['specialty_id']], row['year'] - first] = float(row[field])
+    return specialties, years, matrix
+
+
+def line_fits(matrix, years, target):
+    """Least-squares line through every row of matrix, evaluated at year target.
+
+    Returns (value, residual sum of squares, degrees of freedom, observations,
+    spread) arrays with one entry per row, spread being the factor
+    sqrt(1 + 1/n + leverage) that turns the residual scale into the scale of
+    a prediction at target. Rows without any value give NaN.
+    """
+    np = _numpy()
+    x = np.asarray(years, dtype='float64')
+    observed = ~np.isnan(matrix)
+    weight = observed.astype('float64')
+    y = np.where(observed, matrix, 0.0)
+    n = weight.sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = (weight * x).sum(axis=1) / n
+        y_mean = y.sum(axis=1) / n
+        dx = (x - x_mean[:, None]) * weight
+        sxx = (dx * dx).sum(axis=1)
+        slope = np.where(sxx > 0, (dx * (y - y_mean[:, None])).sum(axis=1) / sxx, 0.0)
+        residuals = (y - y_mean[:, None] - slope[:, None] * dx) * weight
+        sse = (residuals * residuals).sum(axis=1)
+        leverage = np.where(sxx > 0, (target - x_mean) ** 2 / sxx, 0.0)
+        spread = np.sqrt(1 + 1 / n + leverage)
+    return y_mean + slope * (target - x_mean), sse, n - 2, n, spread
+
+
+def fit_lines(matrix, years, target):
+    """Least-squares line through every row of matrix, evaluated at year target.
+
+    Returns (forecast, low, high, observed) arrays with one entry per row;
+    rows without any value give NaN.
+    """
+    np = _numpy()
+    value, sse, df, n, spread = line_fits(matrix, years, target)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        own = df > 0
+        pooled_df = df[own].sum()
+        pooled = np.sqrt(sse[own].sum() / pooled_df) if pooled_df else np.nan
+        sigma = np.where(own, np.sqrt(sse / np.maximum(df, 1)), pooled)
+        t = np.asarray(T_QUANTILES)[np.clip(np.where(own, df, pooled_df), 1, len(T_QUANTILES)).astype(int) - 1]
+        half_width = t * sigma * spread
+
+    forecast = np.clip(value, SCORE_MIN, SCORE_MAX)
+    low = np.clip(forecast - half_width, SCORE_MIN, SCORE_MAX)
+    high = np.clip(forecast + half_width, SCORE_MIN, SCORE_MAX)
+    return forecast, low, high, n.astype(int)
+
+
+def forecast(rows, year=None):
+    """One row per specialty with FORECAST_COLUMNS for year (default: the year after the data)."""
+    np = _numpy()
+    rows = list(rows)
+    if year is None:
+        year = max(row['year'] for row in rows) + 1
+    result = {}
+    for field in FORECAST_FIELDS:
+        specialties, years, matrix = series_matrix(rows, field)
+        for specialty_id, *values in zip(specialties, *fit_lines(matrix, years, year)):
+            record = result.setdefault(specialty_id, {'specialty_id': specialty_id, 'year': year})
+            for suffix, value in zip(('', '_low', '_high'), values[:3]):
+                record[field + suffix] = None if np.isnan(value) else round(float(value), 2)
+            if field == FORECAST_FIELDS[0]:
+                record['observed_years'] = int(values[3])
+    return [result[specialty_id] for specialty_id in sorted(result)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forecast next year's passing scores per specialty")
+    add_input_arguments(parser, 'fit')
+    parser.add_argument('--year', type=int, help="year to forecast (default: the year after the data)")
+    add_output_argument(parser, 'admission_forecasts.json', 'forecasts')
+    parser.add_argument('--load', action='store_true', help=f"upsert the forecasts into {FORECASTS_TABLE}")
+    args = parser.parse_args()
+    if (args.from_db or args.load) and not args.dsn:
+        parser.error("no database: pass --dsn or set DATABASE_URL")
+
+    conn = connect(args.dsn) if args.from_db or args.load else None
+    try:
+        rows = rows_from_args(args, conn)
+        if not rows:
+            print("no admission_stats rows to fit", file=sys.stderr)
+            return 1
+        _numpy()
+        started = time.perf_counter()
+        result = forecast(rows, args.year)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"Fitted {len(result) * len(FORECAST_FIELDS)} series in {elapsed:.1f} ms", file=sys.stderr)
+
+        write_output(result, args.output)
+        print(f"{len(result)} specialties, {result[0]['year']} -> {args.output}")
+
+        if args.load:
+            written = load(conn, result, FORECASTS_TABLE, KEY, FORECAST_COLUMNS)
+            conn.commit()
+            print(f"Written to {FORECASTS_TABLE}: {written}")
+    finally:
+        if conn is not None:
+            conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Columnar post-processing of extracted admission tables (optional, needs pandas).
+
+    python -m admissions.frame [bsu_admission_all_data.json]
+
+prints the validation report for an output file. extract_all_bsu.py
+--validate parses each PDF through this stage instead of the row engine,
+drops duplicated rows and leaves rows that break a rule out of the output
+(checked_records).
+"""
+import argparse
+import re
+import sys
+
+from admissions.layouts import clean_text, parse_int, parse_leading_int
+from admissions.output import read_records
+
+SCORE_MIN = 0
+SCORE_MAX = 400
+SCORE_FIELDS = ('score_budget', 'score_paid', 'avg_budget')
+TEXT_FIELDS = ('type', 'faculty', 'name', 'code')
+CATEGORY_FIELDS = ('type', 'faculty')
+
+
+def _pandas():
+    try:
+        import pandas
+    except ImportError:
+        raise SystemExit("the columnar stage needs pandas: pip install pandas") from None
+    return pandas
+
+
+def _clean_text_column(column):
+    text = column.astype('string').str.replace('\n', ' ', regex=False).str.strip()
+    return text.fillna('')
+
+
+def _int_column(column):
+    pd = _pandas()
+    text = column.astype('string').str.replace('\n', '', regex=False).str.strip()
+    return pd.to_numeric(text.str.extract(r'^([0-9]+)$', expand=False), errors='coerce').astype('Int32')
+
+
+def _leading_int_column(column):
+    pd = _pandas()
+    digits = column.astype('string').str.extract(r'^\s*([0-9]+)(?:\s|$)', expand=False)
+    return pd.to_numeric(digits, errors='coerce').astype('Int32')
+
+
+# Vectorized equivalents of the row parsers in layouts.py. A layout using any
+# other parser still works; its column falls back to Series.map.
+VECTORIZED = {
+    clean_text: _clean_text_column,
+    parse_int: _int_column,
+    parse_leading_int: _leading_int_column,
+}
+
+
+def cells_frame(pages, width):
+    """All table rows of all pages as one frame of raw cells, padded to width."""
+    pd = _pandas()
+    rows = []
+    for page, tables in enumerate(pages):
+        for table in tables:
+            for row in table:
+                if row:
+                    rows.append([page, len(row)] + list(row[:width]) + [None] * (width - len(row)))
+    return pd.DataFrame(rows, columns=['page', 'row_length'] + list(range(width)), dtype=object)
+
+
+def frame_from_pages(pages, layout):
+    """Vectorized counterpart of layouts.parse_tables: same rows, as a typed frame."""
+    pd = _pandas()
+    columns = layout['columns']
+    width = max(index for _, index, _ in columns) + 1
+    cells = cells_frame(pages, width)
+    cells = cells[cells['row_length'] >= layout.get('min_columns', 0)]
+
+    frame = pd.DataFrame(index=cells.index)
+    frame['year'] = layout['year']
+    frame['type'] = layout['type']
+    for field, index, parser in columns:
+        vectorized = VECTORIZED.get(parser)
+        frame[field] = vectorized(cells[index]) if vectorized else cells[index].map(parser)
+
+    keywords = layout.get('faculty_keywords')
+    if keywords:
+        pattern = '|'.join(map(re.escape, keywords))
+        starts = frame['faculty'].str.contains(pattern, regex=True)
+        frame['faculty'] = frame['faculty'].where(starts).ffill().fillna('')
+
+    keep = pd.Series(True, index=frame.index)
+    for field in layout.get('required', ()):
+        keep &= frame[field].notna() & (frame[field].astype('string') != '')
+    if 'name' in frame:
+        keep &= ~frame['name'].isin(layout.get('header_blacklist', ()))
+    return typed(frame[keep].reset_index(drop=True))
+
+
+def frame_from_records(records):
+    pd = _pandas()
+    return typed(pd.DataFrame.from_records(list(records)))
+
+
+def typed(frame):
+    """Cast to the dtypes downstream steps rely on."""
+    frame = frame.copy()
+    for field in frame.columns:
+        if field == 'year':
+            frame[field] = frame[field].astype('int16')
+        elif field in CATEGORY_FIELDS:
+            frame[field] = frame[field].astype('string').astype('category')
+        elif field in TEXT_FIELDS:
+            frame[field] = frame[field].astype('string')
+        else:
+            frame[field] = frame[field].astype('Int32')
+    return frame
+
+
+def to_records(frame):
+    """Plain dicts with None for missing values, as the row engine produces."""
+    frame = frame.astype(object).where(frame.notna(), None)
+    records = frame.to_dict('records')
+    for record in records:
+        for field, value in record.items():
+            if hasattr(value, 'item'):
+                record[field] = value.item()
+    return records
+
+
+def deduplicate(frame):
+    """Drop rows repeated across pages or tables; 'num' is ignored."""
+    subset = [field for field in frame.columns if field != 'num']
+    return frame.drop_duplicates(subset=subset).reset_index(drop=True)
+
+
+def validate(frame):
+    """Frame of rule violations: rule, row, year, name, field and value."""
+    pd = _pandas()
+    found = []
+    for field in SCORE_FIELDS:
+        if field not in frame:
+            continue
+        score = frame[field]
+        bad = score.notna() & ((score < SCORE_MIN) | (score > SCORE_MAX))
+        found.append(_violations(frame, bad, 'score_range', field))
+    if 'score_budget' in frame and 'score_paid' in frame:
+        # 0 means no competition took place, not a passing score.
+        both = (frame['score_budget'] > 0) & (frame['score_paid'] > 0)
+        bad = (both & (frame['score_budget'] < frame['score_paid'])).fillna(False)
+        found.append(_violations(frame, bad, 'budget_below_paid', 'score_budget'))
+    if 'name' in frame:
+        names = frame['name'].astype('string').fillna('')
+        found.append(_violations(frame, names == '', 'missing_name', 'name'))
+    found = [violations for violations in found if len(violations)]
+    if not found:
+        return pd.DataFrame(columns=['rule', 'row', 'year', 'name', 'field', 'value'])
+    return pd.concat(found, ignore_index=True)
+
+
+def _violations(frame, mask, rule, field):
+    pd = _pandas()
+    rows = frame[mask.fillna(False).astype(bool)]
+    return pd.DataFrame({
+        'rule': rule,
+        'row': rows.index,
+        'year': rows['year'].to_numpy() if 'year' in rows else None,
+        'name': rows['name'].astype(object).to_numpy() if 'name' in rows else None,
+        'field': field,
+        'value': rows[field].astype(object).to_numpy(),
+    })
+
+
+def checked_records(pages, layout, out=sys.stdout):
+    """(records, violations) of all pages of a PDF parsed as one frame.
+
+    The frame goes through report(): duplicates are dropped, then rows
+    breaking a validate() rule are printed and left out of the records.
+    """
+    frame, violations = report(frame_from_pages(pages, layout), out)
+    return to_records(frame.drop(index=violations['row'].unique())), violations
+
+
+def report(frame, out=sys.stdout):
+    """Deduplicate and validate frame, print a summary; returns (frame, violations)."""
+    deduplicated = deduplicate(frame)
+    violations = validate(deduplicated)
+    print(f"Rows: {len(frame)}, duplicates dropped: {len(frame) - len(deduplicated)}", file=out)
+    print_violations(violations, out)
+    return deduplicated, violations
+
+
+def print_violations(violations, out=sys.stdout):
+    if violations.empty:
+        print("No violations", file=out)
+    else:
+        print(f"Violations: {len(violations)}", file=out)
+        for rule, count in violations['rule'].value_counts().items():
+            print(f"  {rule:20} {count}", file=out)
+        for violation in violations.itertuples(index=False):
+            print(f"  {violation.rule:20} | {violation.year} | {violation.field:12} | "
+                  f"{violation.value!s:>5} | {str(violation.name)[:50]}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate extracted admission records")
+    parser.add_argument('path', nargs='?', default='bsu_admission_all_data.json')
+    args = parser.parse_args()
+    _, violations = report(frame_from_records(read_records(args.path)))
+    return 1 if len(violations) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,208 @@
+import hashlib
+import re
+
+HEADER_BLACKLIST = ('Название специальности', 'объединенный конкурс:')
+FACULTY_KEYWORDS = ('Факультет', 'Институт', 'Совместный', 'Международный')
+
+
+def clean_text(cell):
+    return str(cell).replace('\n', ' ').strip() if cell else ''
+
+
+def parse_int(cell):
+    if not cell:
+        return None
+    s = str(cell).replace('\n', '').strip()
+    return int(s) if s.isdigit() else None
+
+
+def parse_leading_int(cell):
+    """'312 (к)' -> 312: score cells that carry a note after the number."""
+    if not cell:
+        return None
+    parts = str(cell).split()
+    return int(parts[0]) if parts and parts[0].isdigit() else None
+
+
+# pdfplumber table_settings. The 2022-2024 tables are fully ruled, so the
+# explicit 'lines' strategies match pdfplumber's defaults. The 2025 PDF lacks
+# most vertical rules, and pdfplumber's text strategy (TEXT_COLUMN_TABLES)
+# splits its columns unreliably; it is read by the word engine instead, which
+# rebuilds rows and columns from word positions (words.py; inspect with
+# analyze_2025.py when tuning).
+RULED_TABLES = {'vertical_strategy': 'lines', 'horizontal_strategy': 'lines'}
+TEXT_COLUMN_TABLES = {
+    'vertical_strategy': 'text',
+    'horizontal_strategy': 'lines',
+    'text_x_tolerance': 2,
+    'min_words_vertical': 2,
+}
+WORD_COLUMNS = {'engine': 'words', 'row_tolerance': 3, 'column_gap': 6}
+
+# A layout describes one table format: which column holds which field and
+# how it is parsed. Records keep the field order of 'columns'.
+#   required        fields that must parse to a non-empty value
+#   header_blacklist  'name' values that are repeated table headers
+#   faculty_keywords  when set, 'faculty' is carried down from the last row
+#                     whose faculty cell contains one of the keywords
+#   min_columns     shorter rows are skipped
+#   table_settings  passed to page.extract_tables(), or {'engine': 'words', ...}
+#                   for the word engine (words.py)
+#   region          'auto' crops pages to the table region detected once per
+#                   document (see regions.py), a bbox crops to that box,
+#                   None keeps the full page; the word engine takes no 'auto'
+BSU_2022_BUDGET = {
+    'university': 'bsu',
+    'year': 2022,
+    'type': 'budget',
+    'columns': [
+        ('num', 0, parse_int),
+        ('name', 1, clean_text),
+        ('code', 2, clean_text),
+        ('score_budget', 3, parse_int),
+        ('avg_budget', 5, parse_int),
+    ],
+    'required': ('num', 'name', 'code'),
+    'table_settings': RULED_TABLES,
+    'region': 'auto',
+}
+
+BSU_2023_BUDGET = {
+    'university': 'bsu',
+    'year': 2023,
+    'type': 'budget',
+    'columns': [
+        ('num', 0, parse_int),
+        ('faculty', 1, clean_text),
+        ('name', 2, clean_text),
+        ('places_budget', 3, parse_int),
+        ('score_budget', 4, parse_int),
+    ],
+    'required': ('num', 'name'),
+    'header_blacklist': HEADER_BLACKLIST,
+    'table_settings': RULED_TABLES,
+    'region': 'auto',
+}
+
+BSU_2023_PAID = {
+    'university': 'bsu',
+    'year': 2023,
+    'type': 'paid',
+    'columns': [
+        ('num', 0, parse_int),
+        ('faculty', 1, clean_text),
+        ('name', 2, clean_text),
+        ('score_budget', 3, parse_leading_int),
+        ('score_paid', 4, parse_leading_int),
+    ],
+    'required': ('num', 'name'),
+    'header_blacklist': HEADER_BLACKLIST,
+    'table_settings': RULED_TABLES,
+    'region': 'auto',
+}
+
+BSU_2024 = {
+    'university': 'bsu',
+    'year': 2024,
+    'type': 'both',
+    'columns': [
+        ('faculty', 0, clean_text),
+        ('name', 1, clean_text),
+        ('score_budget', 2, parse_int),
+        ('score_paid', 3, parse_int),
+    ],
+    'required': ('name',),
+    'header_blacklist': HEADER_BLACKLIST,
+    'faculty_keywords': FACULTY_KEYWORDS,
+    'min_columns': 4,
+    'table_settings': RULED_TABLES,
+    'region': 'auto',
+}
+
+BSU_2025 = dict(BSU_2024, year=2025, table_settings=WORD_COLUMNS, region=None)
+
+LAYOUTS = {
+    'bsu-2022-budget': BSU_2022_BUDGET,
+    'bsu-2023-budget': BSU_2023_BUDGET,
+    'bsu-2023-paid': BSU_2023_PAID,
+    'bsu-2024': BSU_2024,
+    'bsu-2025': BSU_2025,
+}
+
+
+def layout_fingerprint(layout):
+    """Stable hash of a layout spec, used to tell whether old output still applies."""
+    spec = {key: value for key, value in layout.items()}
+    spec['columns'] = [(field, index, parser.__name__) for field, index, parser in layout['columns']]
+    return hashlib.sha256(repr(sorted(spec.items())).encode('utf-8')).hexdigest()[:16]
+
+
+def compile_layout(layout, state=None, drops=None):
+    """Build the per-row function for a layout once, outside the row loop.
+
+    state holds what carries over between rows (the current faculty); pass a
+    dict to inspect or restore it between pages. drops, a Counter, counts the
+    rows rejected per rule: empty_row, short_row, missing_<field>, header_row.
+    """
+    columns = tuple(layout['columns'])
+    required = tuple(layout.get('required', ()))
+    blacklist = frozenset(layout.get('header_blacklist', ()))
+    min_columns = layout.get('min_columns', 0)
+    keywords = layout.get('faculty_keywords')
+    faculty_pattern = re.compile('|'.join(map(re.escape, keywords))) if keywords else None
+    head = {'year': layout['year'], 'type': layout['type']}
+    state = state if state is not None else {}
+    state.setdefault('faculty', '')
+
+    def drop(rule):
+        if drops is not None:
+            drops[rule] += 1
+        return None
+
+    def parse_row(row):
+        if not row:
+            return drop('empty_row')
+        if len(row) < min_columns:
+            return drop('short_row')
+        record = dict(head)
+        for field, index, parser in columns:
+            record[field] = parser(row[index]) if index < len(row) else parser(None)
+        if faculty_pattern is not None:
+            if faculty_pattern.search(record['faculty']):
+                state['faculty'] = record['faculty']
+            record['faculty'] = state['faculty']
+        for field in required:
+            if record[field] is None or record[field] == '':
+                return drop(f'missing_{field}')
+        if record.get('name') in blacklist:
+            return drop('header_row')
+        return record
+
+    return parse_row
+
+
+def parse_page(parse_row, tables):
+    records = []
+    for table in tables:
+        for row in table:
+            record = parse_row(row)
+            if record is not None:
+                records.append(record)
+    return records
+
+
+def iter_page_records(pages, layout):
+    """Yield the records of each page as one list, page by page."""
+    parse_row = compile_layout(layout)
+    for tables in pages:
+        yield parse_page(parse_row, tables)
+
+
+def iter_records(pages, layout):
+    for records in iter_page_records(pages, layout):
+        yield from records
+
+
+def parse_tables(pages, layout):
+    """Turn per-page extract_tables() output into records for one layout."""
+    return list(iter_records(pages, layout))
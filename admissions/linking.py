@@ -0,0 +1,187 @@
+"""Link the rows of all years to one stable key per specialty.
+
+    python -m admissions.linking [--input bsu_admission_all_data.json ...] [--output linked_admission_data.json]
+    python -m admissions.linking --input bsu_admission_all_data.json --input bntu_admission_2022_data.json=bntu
+
+The years describe a specialty differently: 2022 rows carry the official code,
+2023 rows the name and sometimes the faculty, 2024/2025 rows the name. Every
+row gets the join keys it has, all within its university:
+
+  code      the digits of the code ('1-100 01 01' -> '11000101'), unless the
+            code covers programs of different names in one year (language
+            tracks, shortened programs)
+  faculty   canonical faculty and name
+  name      canonical name, unless specialties of different faculties or codes
+            share it in one year
+  catalog   the catalog id of the name, exact matches only: catalog names plus
+            the specialtyMap aliases of scripts/generate_bsu_sql.js, where
+            renamed specialties are mapped. An ambiguous name counts only when
+            its faculty tells it apart. Catalog codes are not used; several are
+            copied from a neighbouring entry.
+
+One pass over the rows files every key in a dict and joins the row to the row
+first filed under the same key (union-find), so linking takes linear time over
+any number of universities and years. Two specialties with different catalog
+ids are never joined; such keys are reported as conflicts. A specialty's key
+is its catalog id, or <university>-link-<hash> of its first row's code or
+name when none of its rows is in the catalog.
+"""
+import argparse
+import hashlib
+import re
+import sys
+from collections import Counter
+
+from admissions.loader import DEFAULT_INPUT, add_input_arguments, parse_inputs
+from admissions.output import add_output_argument, read_records, write_output
+from admissions.specialties import ALIASES_JS, CATALOG_SQL, SpecialtyIndex, canonical
+
+LINK_KEYS = ('code', 'faculty', 'name', 'catalog')
+
+
+def code_key(code):
+    """Digits of an official code, or None."""
+    return re.sub(r'\D', '', code or '') or None
+
+
+def ambiguous_keys(rows):
+    """{(university, name)} used with different faculties or codes in one year, and
+    {(university, code)} used with different names in one year."""
+    seen = {}
+    names = set()
+    codes = set()
+    for university, year, name, faculty, code in rows:
+        for field, value in (('faculty', faculty), ('code', code)):
+            if value and seen.setdefault((university, name, year, field), value) != value:
+                names.add((university, name))
+        if code and seen.setdefault((university, code, year, 'name'), name) != name:
+            codes.add((university, code))
+    return names, codes
+
+
+def link(records, university='bsu', catalog_path=CATALOG_SQL, aliases_path=ALIASES_JS):
+    """(specialty key per record in order, report).
+
+    Records without a university field belong to university. The report has
+    joins (Counter by key kind), conflicts ({(id, id): key}) and the ambiguous
+    names and codes.
+    """
+    records = list(records)
+    indexes = {}
+    # Names and faculties repeat every year; canonical() is the costly part.
+    canonical_names = {}
+    exact = {}
+    rows = []
+    matches = []
+    for record in records:
+        record_university = record.get('university') or university
+        if record_university not in indexes:
+            indexes[record_university] = SpecialtyIndex.for_university(record_university, catalog_path,
+                                                                        aliases_path)
+        name, faculty = record['name'], record.get('faculty') or None
+        for text in (name, faculty):
+            if text and text not in canonical_names:
+                canonical_names[text] = canonical(text)
+        match_key = (record_university, name, faculty)
+        if match_key not in exact:
+            exact[match_key] = indexes[record_university].exact_match(name, faculty)
+        rows.append((record_university, record['year'], canonical_names[name],
+                     canonical_names[faculty] if faculty else None, code_key(record.get('code'))))
+        matches.append(exact[match_key])
+    ambiguous_names, ambiguous_codes = ambiguous_keys(rows)
+    ids = [None if (row[0], row[2]) in ambiguous_names and method != 'faculty' else specialty_id
+           for row, (specialty_id, method) in zip(rows, matches)]
+
+    parent = list(range(len(rows)))
+    catalog = list(ids)
+    first = list(range(len(rows)))
+    joins = Counter()
+    conflicts = {}
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j, key):
+        root, other = find(i), find(j)
+        if root == other:
+            return
+        if catalog[root] and catalog[other] and catalog[root] != catalog[other]:
+            conflicts.setdefault(tuple(sorted((catalog[root], catalog[other]))), key)
+            return
+        parent[other] = root
+        catalog[root] = catalog[root] or catalog[other]
+        first[root] = min(first[root], first[other], key=lambda row: (rows[row][1], row))
+        joins[key[0]] += 1
+
+    filed = {}
+    for i, (row_university, _, name, faculty, code) in enumerate(rows):
+        keys = []
+        if code and (row_university, code) not in ambiguous_codes:
+            keys.append(('code', row_university, code))
+        if faculty:
+            keys.append(('faculty', row_university, faculty, name))
+        if (row_university, name) not in ambiguous_names:
+            keys.append(('name', row_university, name))
+        if ids[i]:
+            keys.append(('catalog', ids[i]))
+        for key in keys:
+            j = filed.setdefault(key, i)
+            if j != i:
+                union(j, i, key)
+
+    keys = {}
+    result = []
+    for i in range(len(rows)):
+        root = find(i)
+        if root not in keys:
+            keys[root] = catalog[root] or linked_key(rows[first[root]])
+        result.append(keys[root])
+    return result, {'joins': joins, 'conflicts': conflicts, 'ambiguous_names': ambiguous_names,
+                    'ambiguous_codes': ambiguous_codes}
+
+
+def linked_key(row):
+    university, _, name, faculty, code = row
+    identity = code or f'{faculty or ""}/{name}'
+    return f"{university}-link-{hashlib.sha1(identity.encode('utf-8')).hexdigest()[:8]}"
+
+
+def print_report(records, keys, report, out=sys.stdout):
+    years = {}
+    for record, key in zip(records, keys):
+        years.setdefault(key, set()).add(record['year'])
+    linked = [key for key in years if '-link-' in key]
+    print(f"Rows: {len(keys)}, specialties: {len(years)} ({len(years) - len(linked)} catalog ids, "
+          f"{len(linked)} linked without one), seen in one year only: "
+          f"{sum(1 for seen in years.values() if len(seen) == 1)}", file=out)
+    print("  joins: " + ', '.join(f"{kind} {report['joins'][kind]}" for kind in LINK_KEYS), file=out)
+    for university, name in sorted(report['ambiguous_names']):
+        print(f"  ambiguous name, not joined on: {university} {name}", file=out)
+    for university, code in sorted(report['ambiguous_codes']):
+        print(f"  ambiguous code, not joined on: {university} {code}", file=out)
+    for (first, second), key in sorted(report['conflicts'].items()):
+        print(f"  CONFLICT {first} / {second} share {key[0]} {' '.join(key[1:])}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Give every row a stable specialty key across years")
+    add_input_arguments(parser, 'link', from_db=False)
+    add_output_argument(parser, 'linked_admission_data.json', 'records with specialty_key')
+    args = parser.parse_args()
+
+    records = []
+    for path, university in parse_inputs(args.input or [DEFAULT_INPUT]):
+        records.extend(dict(record, university=record.get('university') or university)
+                       for record in read_records(path))
+    keys, report = link(records)
+    print_report(records, keys, report)
+    count = write_output([dict(record, specialty_key=key) for record, key in zip(records, keys)], args.output)
+    print(f"{count} records -> {args.output}")
+    return 1 if report['conflicts'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""Load extractor output straight into public.admission_stats (optional, needs psycopg).
+
+    python -m admissions.loader [--input bsu_admission_all_data.json ...] --dsn postgresql://...
+
+Rows are merged per (specialty_id, year) the same way scripts/generate_bsu_sql.js
+does, copied into a temporary table with COPY and upserted in one statement
+instead of a DELETE and a full re-insert. --diff compares with what is in the
+table first and sends only new and changed rows; --dry-run only prints that diff.
+Needs the unique index from 20260224_admission_stats_specialty_year_key.sql.
+"""
+import argparse
+import math
+import os
+import sys
+
+from admissions.output import read_records
+
+STATS_TABLE = 'public.admission_stats'
+KEY = ('specialty_id', 'year')
+VALUE_COLUMNS = ('budget_places', 'paid_places', 'min_score', 'avg_score', 'paid_min_score')
+COLUMNS = KEY + VALUE_COLUMNS
+PLAN_FIELDS = ('budget_plan', 'budget_score', 'paid_plan', 'paid_score')
+DEFAULT_INPUT = 'bsu_admission_all_data.json'
+DEFAULT_UNIVERSITY = 'bsu'
+
+
+def _psycopg():
+    try:
+        import psycopg
+    except ImportError:
+        raise SystemExit("the loader needs psycopg 3: pip install 'psycopg[binary]'") from None
+    return psycopg
+
+
+def connect(dsn):
+    return _psycopg().connect(dsn)
+
+
+def _estimated_avg(score):
+    # Math.round(score * 1.02) in the JS generator
+    return math.floor(score * 1.02 + 0.5)
+
+
+def plan_record(item):
+    """A BNTU plan record (budget_plan, budget_score, paid_plan, paid_score) as an extractor record.
+
+    Other records are returned as they are, also when read back from a
+    columnar file that gives them the plan fields as None.
+    """
+    if all(item.get(field) is None for field in PLAN_FIELDS):
+        return item
+    record = {key: value for key, value in item.items() if key not in PLAN_FIELDS}
+    record.update(type='both', places_budget=item.get('budget_plan'), score_budget=item['budget_score'],
+                  places_paid=item.get('paid_plan'), score_paid=item.get('paid_score'))
+    return record
+
+
+def stats_rows(records, index=None):
+    """Merge extractor records into admission_stats rows, keyed by (specialty_id, year).
+
+    Records without a specialty_id are resolved through index (a
+    specialties.SpecialtyIndex); returns (rows, unmatched names). BNTU plan
+    records are read the way scripts/generate_bntu_sql.js reads them.
+    """
+    merged = {}
+    unmatched = set()
+    for item in map(plan_record, records):
+        specialty_id = item.get('specialty_id')
+        if not specialty_id and index is not None:
+            specialty_id = index.match(item['name'], item.get('faculty'))[0]
+        score_budget = item.get('score_budget') or 0
+        score_paid = item.get('score_paid') or 0
+        if not specialty_id:
+            if score_budget > 0 or score_paid > 0:
+                unmatched.add(item['name'])
+            continue
+        places = item.get('places_budget') or 0
+        paid_places = item.get('places_paid') or 0
+        avg_budget = item.get('avg_budget') or 0
+
+        key = (specialty_id, item['year'])
+        existing = merged.get(key)
+        if existing is None:
+            row = {
+                'specialty_id': specialty_id,
+                'year': item['year'],
+                'budget_places': places or None,
+                'paid_places': paid_places or None,
+                'min_score': score_budget,
+                'avg_score': avg_budget if avg_budget > 0 else _estimated_avg(score_budget),
+                'paid_min_score': None,
+            }
+            if item['type'] == 'both':
+                row['paid_min_score'] = score_paid or None
+            elif item['type'] == 'paid':
+                row.update(budget_places=None, min_score=None, avg_score=None, paid_min_score=score_budget)
+            merged[key] = row
+        elif item['type'] == 'both':
+            if score_budget > 0 and not existing['min_score']:
+                existing['min_score'] = score_budget
+            if score_paid > 0:
+                existing['paid_min_score'] = score_paid
+            if paid_places > 0:
+                existing['paid_places'] = paid_places
+        elif item['type'] == 'budget':
+            # A repeated budget row is the paid competition: the lower score is paid.
+            if existing['min_score'] and 0 < score_budget < existing['min_score']:
+                existing['paid_min_score'] = score_budget
+            elif score_budget > (existing['min_score'] or 0):
+                existing['paid_min_score'] = existing['min_score']
+                existing['min_score'] = score_budget
+                existing['avg_score'] = avg_budget if avg_budget > 0 else _estimated_avg(score_budget)
+            if places > 0:
+                existing['budget_places'] = places
+        elif item['type'] == 'paid':
+            if score_budget > 0:
+                existing['paid_min_score'] = score_budget
+
+    rows = []
+    for row in merged.values():
+        if (row['min_score'] or 0) > 0 or (row['paid_min_score'] or 0) > 0:
+            # 0 is stored as NULL, like the generated migrations do
+            rows.append({column: row[column] if column in KEY else row[column] or None for column in COLUMNS})
+    return rows, unmatched
+
+
+def parse_inputs(items, university=DEFAULT_UNIVERSITY):
+    """[(path, university)] from PATH or PATH=UNIVERSITY items."""
+    inputs = []
+    for item in items:
+        path, _, input_university = item.partition('=')
+        inputs.append((path, input_university or university))
+    return inputs
+
+
+def input_stats(items):
+    """(admission_stats rows, unmatched names) of extractor outputs given as PATH[=UNIVERSITY].
+
+    The records of one university are merged together, whichever files they
+    come from, and matched against that university's catalog.
+    """
+    from admissions.specialties import SpecialtyIndex
+
+    records = {}
+    for path, university in parse_inputs(items):
+        records.setdefault(university, []).extend(read_records(path))
+    rows, unmatched = [], set()
+    for university, university_records in records.items():
+        found, missing = stats_rows(university_records, SpecialtyIndex.for_university(university))
+        rows.extend(found)
+        unmatched |= missing
+    return rows, unmatched
+
+
+def read_input_rows(items):
+    """The admission_stats rows of input_stats(items)."""
+    return input_stats(items)[0]
+
+
+def read_stats(conn):
+    """All rows of admission_stats."""
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT {', '.join(COLUMNS)} FROM {STATS_TABLE}")
+        return [dict(zip(COLUMNS, values)) for values in cur]
+
+
+def add_input_arguments(parser, verb, from_db=True):
+    """--input PATH[=UNIVERSITY] (repeatable), plus --dsn and --from-db unless from_db is False."""
+    parser.add_argument('--input', action='append', metavar='PATH[=UNIVERSITY]',
+                        help=f"extractor output to {verb}, repeatable (default: {DEFAULT_INPUT}"
+                             f"{'; ignored with --from-db' if from_db else ''}); =UNIVERSITY names the "
+                             f"university of records without one (default: {DEFAULT_UNIVERSITY})")
+    if from_db:
+        parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL'),
+                            help="PostgreSQL connection string (default: $DATABASE_URL)")
+        parser.add_argument('--from-db', action='store_true', help=f"{verb} all rows of {STATS_TABLE}")
+
+
+def rows_from_args(args, conn=None):
+    """admission_stats rows of the --input files, or of the table with --from-db.
+
+    The table is read through conn, or a connection to --dsn of its own.
+    """
+    if not args.from_db:
+        return read_input_rows(args.input or [DEFAULT_INPUT])
+    if conn is not None:
+        return read_stats(conn)
+    conn = connect(args.dsn)
+    try:
+        return read_stats(conn)
+    finally:
+        conn.close()
+
+
+def current_rows(conn, keys):
+    """{(specialty_id, year): row} of the rows already stored for keys."""
+    years = sorted({year for _, year in keys})
+    ids = sorted({specialty_id for specialty_id, _ in keys})
+    existing = {}
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT {', '.join(COLUMNS)} FROM {STATS_TABLE} "
+                    "WHERE year = ANY(%s) AND specialty_id = ANY(%s)", (years, ids))
+        for values in cur:
+            row = dict(zip(COLUMNS, values))
+            existing[(row['specialty_id'], row['year'])] = row
+    return existing
+
+
+def diff_rows(rows, existing):
+    """Split rows into (new, changed, unchanged) against the stored ones."""
+    new, changed, unchanged = [], [], []
+    for row in rows:
+        stored = existing.get((row['specialty_id'], row['year']))
+        if stored is None:
+            new.append(row)
+        elif any(row[column] != stored[column] for column in VALUE_COLUMNS):
+            changed.append(row)
+        else:
+            unchanged.append(row)
+    return new, changed, unchanged
+
+
+def load(conn, rows, table=STATS_TABLE, key=KEY, values=VALUE_COLUMNS):
+    """COPY rows into a temporary table and upsert them on key; returns rows written.
+
+    Rows whose values already match are left alone, so an unchanged reload
+    rewrites nothing. table needs a unique index on key.
+    """
+    if not rows:
+        return 0
+    columns = key + values
+    staging = f"{table.split('.')[-1]}_load"
+    updates = ', '.join(f'{column} = excluded.{column}' for column in values)
+    stored = ', '.join(f'{table}.{column}' for column in values)
+    incoming = ', '.join(f'excluded.{column}' for column in values)
+    with conn.transaction(), conn.cursor() as cur:
+        cur.execute(f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+        with cur.copy(f"COPY {staging} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row([row[column] for column in columns])
+        cur.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"SELECT {', '.join(columns)} FROM {staging} "
+            f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET {updates} "
+            f"WHERE ({stored}) IS DISTINCT FROM ({incoming})")
+        written = cur.rowcount
+        # ON COMMIT DROP only fires at the outermost commit; another load in
+        # the same transaction would find the table still there.
+        cur.execute(f"DROP TABLE {staging}")
+        return written
+
+
+def print_diff(new, changed, unchanged, existing, out=sys.stdout):
+    print(f"New: {len(new)}, changed: {len(changed)}, unchanged: {len(unchanged)}", file=out)
+    for row in changed:
+        stored = existing[(row['specialty_id'], row['year'])]
+        changes = ', '.join(f'{column} {stored[column]} -> {row[column]}'
+                            for column in VALUE_COLUMNS if row[column] != stored[column])
+        print(f"  {row['specialty_id']:10} | {row['year']} | {changes}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upsert extracted records into admission_stats")
+    add_input_arguments(parser, 'load', from_db=False)
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL'),
+                        help="PostgreSQL connection string (default: $DATABASE_URL)")
+    parser.add_argument('--diff', action='store_true', help="only send new and changed rows")
+    parser.add_argument('--dry-run', action='store_true', help="print the diff, write nothing")
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("no database: pass --dsn or set DATABASE_URL")
+
+    rows, unmatched = input_stats(args.input or [DEFAULT_INPUT])
+    print(f"Rows: {len(rows)}, unmatched names: {len(unmatched)}")
+    for name in sorted(unmatched):
+        print(f"  UNMATCHED | {name[:80]}")
+
+    with connect(args.dsn) as conn:
+        if args.diff or args.dry_run:
+            existing = current_rows(conn, [(row['specialty_id'], row['year']) for row in rows])
+            new, changed, unchanged = diff_rows(rows, existing)
+            print_diff(new, changed, unchanged, existing)
+            rows = new + changed
+        if args.dry_run:
+            return 0
+        print(f"Written: {load(conn, rows)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
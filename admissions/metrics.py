@@ -0,0 +1,169 @@
+import json
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # Windows: no getrusage, RSS is reported as null
+    resource = None
+
+
+def peak_rss_mb(children=False):
+    """Peak resident set size of this process (or its finished children), in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if children:
+        peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def current_rss_mb():
+    """Resident set size of this process right now, in MB; None without /proc (Linux only)."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+
+
+def _add(totals, stage, seconds):
+    entry = totals.setdefault(stage, {'seconds': 0.0, 'calls': 0})
+    entry['seconds'] += seconds
+    entry['calls'] += 1
+    return entry
+
+
+class RunMetrics:
+    """Seconds, calls and peak RSS per stage, by PDF and page, plus rows kept
+    and dropped per filter rule. Filled in by iter_page_tables(metrics=...) and
+    the extractor scripts, written as JSON by --profile.
+
+    Stages: count_pages, detect_region, open (pdfplumber.open of a page range),
+    extract_tables, cache_read, cache_write, parse (row parsers and filters)
+    and write. Extraction may run in worker processes; its peak RSS is the
+    worker's.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.documents = {}
+
+    def _document(self, pdf):
+        return self.documents.setdefault(pdf, {'stages': {}, 'rows': 0, 'dropped': Counter(), 'pages': {}})
+
+    def _page(self, pdf, page):
+        return self._document(pdf)['pages'].setdefault(page, {'seconds': {}, 'rows': 0, 'dropped': Counter()})
+
+    def add(self, stage, seconds, pdf=None, page=None, rss_mb=None):
+        entry = _add(self.stages, stage, seconds)
+        rss_mb = rss_mb if rss_mb is not None else peak_rss_mb()
+        if rss_mb is not None:
+            entry['peak_rss_mb'] = max(entry.get('peak_rss_mb', 0), rss_mb)
+        if pdf is not None:
+            _add(self._document(pdf)['stages'], stage, seconds)
+            if page is not None:
+                page_seconds = self._page(pdf, page)['seconds']
+                page_seconds[stage] = page_seconds.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name, pdf=None, page=None):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started, pdf, page)
+
+    def count_rows(self, pdf, page, rows, dropped=None):
+        """rows kept on a page; dropped is a Counter of filter rule -> rows."""
+        for entry in (self._document(pdf), self._page(pdf, page)):
+            entry['rows'] += rows
+            entry['dropped'].update(dropped or {})
+
+    def report(self):
+        documents = {}
+        for pdf, document in self.documents.items():
+            pages = []
+            for index, page in sorted(document['pages'].items()):
+                pages.append({
+                    'page': index,
+                    'seconds': round(sum(page['seconds'].values()), 4),
+                    'stages': {stage: round(seconds, 4) for stage, seconds in page['seconds'].items()},
+                    'rows': page['rows'],
+                    'dropped': dict(page['dropped']),
+                })
+            documents[pdf] = {
+                'stages': _rounded(document['stages']),
+                'rows': document['rows'],
+                'dropped': dict(document['dropped']),
+                'slowest_page': max(pages, key=lambda page: page['seconds'])['page'] if pages else None,
+                'pages': pages,
+            }
+        return {
+            'wall_seconds': round(time.perf_counter() - self.started, 4),
+            'peak_rss_mb': peak_rss_mb(children=True),
+            'stages': _rounded(self.stages),
+            'documents': documents,
+        }
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def print_summary(self, out=sys.stdout):
+        report = self.report()
+        print(f"Wall: {report['wall_seconds']:.2f}s, peak RSS: {report['peak_rss_mb']} MB", file=out)
+        for stage, entry in report['stages'].items():
+            print(f"  {stage:15} {entry['seconds']:>8.3f}s {entry['calls']:>6} calls "
+                  f"{entry.get('peak_rss_mb', '-'):>7} MB", file=out)
+        for pdf, document in report['documents'].items():
+            seconds = sum(entry['seconds'] for entry in document['stages'].values())
+            dropped = ', '.join(f'{rule} {count}' for rule, count in sorted(document['dropped'].items()))
+            print(f"  {pdf}: {seconds:.3f}s, {document['rows']} rows, slowest page {document['slowest_page']}"
+                  f"{', dropped: ' + dropped if dropped else ''}", file=out)
+
+
+def _rounded(stages):
+    return {stage: dict(entry, seconds=round(entry['seconds'], 4)) for stage, entry in stages.items()}
+
+
+@contextmanager
+def cpu_profile(path):
+    """Profile the block into path: pyinstrument HTML for *.html, else cProfile stats.
+
+    Only this process is profiled; run with --workers 1 to include extraction.
+    """
+    if path is None:
+        yield
+        return
+    if path.endswith('.html'):
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise SystemExit("HTML profiles need pyinstrument: pip install pyinstrument") from None
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+        return
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
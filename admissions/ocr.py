@@ -0,0 +1,295 @@
+"""Read screenshots and scanned result sheets with a local Tesseract (needs tesserocr).
+
+    python -m admissions.ocr graduates1/                  # every image in the directory, bsu-2025 layout
+    python -m admissions.ocr scan.pdf --layout bsu-2024 --workers 4
+    python -m admissions.ocr graduates1/ --tessdata /usr/share/tesseract-ocr/5/tessdata/
+
+For sources without a text layer, such as the 2025 screenshots in graduates1
+that manual.py was typed from, or scanned PDFs. Each image, or each PDF page
+rendered at OCR_DPI, is converted to grayscale, upscaled to MIN_DPI when it
+has screen resolution, and contrast-stretched. It is then OCRed on a process
+pool whose workers keep one Tesseract instance each, so the language model
+loads once per process. The recognized words, in PDF points, go through the
+word engine (words.py) and the layout's row parsers, so records come out as
+they do from the PDF extractors. Words are kept per page in the page cache
+(cache.py), keyed by file content, Tesseract version, language and
+preprocessing.
+"""
+import argparse
+import os
+import sys
+import time
+
+from admissions.cache import add_cache_arguments, cache_from_args, cache_key
+from admissions.cli import with_university
+from admissions.layouts import LAYOUTS, WORD_COLUMNS, compile_layout, parse_page
+from admissions.output import FORMATS, RecordWriter
+from admissions.words import is_word_engine, word_tables
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp', '.webp')
+DEFAULT_LANG = 'rus'
+DEFAULT_LAYOUT = 'bsu-2025'
+DEFAULT_OUTPUT = 'ocr_admission_data.json'
+# PDF pages are rendered at OCR_DPI; images that do not state a resolution
+# are taken as screenshots at SCREEN_DPI and, like any image below MIN_DPI,
+# upscaled to it: Tesseract misreads text much smaller than ~20 px.
+OCR_DPI = 300
+SCREEN_DPI = 96
+MIN_DPI = 200
+# White margin added around every image; Tesseract misses text touching the edge.
+BORDER = 10
+# Bump when preprocessing changes so cached words stop matching.
+OCR_VERSION = 1
+
+_api = None
+
+
+def _tesserocr():
+    try:
+        import tesserocr
+    except ImportError:
+        raise SystemExit("OCR needs tesserocr and Tesseract language data: pip install tesserocr") from None
+    return tesserocr
+
+
+def input_files(paths):
+    """Images and PDFs among paths, directories expanded (sorted, not recursive)."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.lower().endswith(IMAGE_EXTENSIONS + ('.pdf',)))
+        elif path.lower().endswith(IMAGE_EXTENSIONS + ('.pdf',)):
+            files.append(path)
+        else:
+            raise ValueError(f"{path}: not an image or a PDF")
+    return files
+
+
+def _is_pdf(path):
+    return path.lower().endswith('.pdf')
+
+
+def count_pages(path):
+    """Pages of a PDF, frames of a (TIFF) image."""
+    if _is_pdf(path):
+        from admissions.pages import count_pages as count_pdf_pages
+
+        return count_pdf_pages(path)
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return getattr(image, 'n_frames', 1)
+
+
+def load_page(path, index):
+    """(PIL image, its dpi) of page index of path."""
+    if _is_pdf(path):
+        import pdfplumber
+
+        with pdfplumber.open(path) as pdf:
+            page = pdf.pages[index]
+            image = page.to_image(resolution=OCR_DPI).original
+            page.close()
+        return image, OCR_DPI
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image.seek(index)
+        dpi = image.info.get('dpi', (SCREEN_DPI,))[0] or SCREEN_DPI
+        return image.convert('RGB'), float(dpi)
+
+
+def preprocess(image, dpi):
+    """(grayscale, upscaled, contrast-stretched image with a white border, its dpi)."""
+    from PIL import Image, ImageOps
+
+    image = ImageOps.grayscale(image)
+    if dpi < MIN_DPI:
+        scale = MIN_DPI / dpi
+        image = image.resize((round(image.width * scale), round(image.height * scale)), Image.LANCZOS)
+        dpi = MIN_DPI
+    image = ImageOps.autocontrast(image, cutoff=1)
+    return ImageOps.expand(image, BORDER, fill=255), dpi
+
+
+def check_languages(lang=DEFAULT_LANG, tessdata=None):
+    """Exit with a hint unless Tesseract finds data for every language of lang ('rus', 'rus+eng')."""
+    tesserocr = _tesserocr()
+    path, available = tesserocr.get_languages(os.path.join(tessdata, '')) if tessdata else tesserocr.get_languages()
+    missing = [name for name in lang.split('+') if name not in available]
+    if missing:
+        raise SystemExit(f"no Tesseract data for {', '.join(missing)} in {path}: install it "
+                         f"(tesseract-ocr-{missing[0]}) or pass --tessdata / set TESSDATA_PREFIX")
+
+
+def init_worker(lang=DEFAULT_LANG, tessdata=None, single_thread=False):
+    """Start this process's Tesseract; workers of a pool run one thread each."""
+    global _api
+    if single_thread:
+        os.environ['OMP_THREAD_LIMIT'] = '1'
+    tesserocr = _tesserocr()
+    kwargs = {'path': os.path.join(tessdata, '')} if tessdata else {}
+    _api = tesserocr.PyTessBaseAPI(lang=lang, psm=tesserocr.PSM.SPARSE_TEXT, **kwargs)
+
+
+def recognize(image, dpi):
+    """Words of a preprocessed image with boxes in PDF points, like words.page_words()."""
+    tesserocr = _tesserocr()
+    _api.SetImage(image)
+    _api.SetSourceResolution(int(dpi))
+    _api.Recognize()
+    iterator = _api.GetIterator()
+    if iterator is None:
+        return []
+    scale = 72 / dpi
+    level = tesserocr.RIL.WORD
+    words = []
+    for item in tesserocr.iterate_level(iterator, level):
+        text = (item.GetUTF8Text(level) or '').strip()
+        box = item.BoundingBox(level)
+        if not text or box is None:
+            continue
+        x0, top, x1, bottom = ((value - BORDER) * scale for value in box)
+        words.append({'text': text, 'x0': x0, 'x1': x1, 'top': top, 'bottom': bottom})
+    return words
+
+
+def ocr_page(path, index):
+    """(words, seconds) of one page, in a process set up by init_worker."""
+    started = time.perf_counter()
+    words = recognize(*preprocess(*load_page(path, index)))
+    return words, time.perf_counter() - started
+
+
+def ocr_key(path, lang):
+    """Page cache key of path's words: content, Tesseract version, language and preprocessing."""
+    tesserocr = _tesserocr()
+    version = tesserocr.tesseract_version().split()[1]
+    return cache_key(path, f'tesseract {version}', lang,
+                     f'dpi={OCR_DPI}/{SCREEN_DPI}/{MIN_DPI} border={BORDER} v{OCR_VERSION}')
+
+
+def iter_ocr_pages(paths, lang=DEFAULT_LANG, tessdata=None, workers=1, cache=None, invalidate=False):
+    """Yield (path, page index, words, seconds) for every page of paths in order.
+
+    Cached pages are not OCRed again and report 0 seconds. A page dropped
+    from the cache after it was counted as cached is OCRed in this process.
+    """
+    keys = {}
+    pages = []
+    check_languages(lang, tessdata)
+    for path in paths:
+        page_count = None
+        if cache is not None:
+            keys[path] = ocr_key(path, lang)
+            if invalidate:
+                cache.invalidate(keys[path])
+            page_count = cache.page_count(keys[path])
+        if page_count is None:
+            page_count = count_pages(path)
+            if cache is not None:
+                cache.set_page_count(keys[path], page_count)
+        pages.extend((path, index) for index in range(page_count))
+    missing = [(path, index) for path, index in pages
+               if cache is None or not cache.has_page(keys[path], index)]
+    queued = set(missing)
+
+    pool = None
+    local_api = False
+    if workers > 1 and len(missing) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                   initargs=(lang, tessdata, True))
+        results = pool.map(ocr_page, *zip(*missing))
+    else:
+        if missing:
+            init_worker(lang, tessdata)
+            local_api = True
+        results = (ocr_page(path, index) for path, index in missing)
+    try:
+        for path, index in pages:
+            if (path, index) in queued:
+                words, seconds = next(results)
+            else:
+                words, seconds = cache.get_page(keys[path], index), 0.0
+                if words is not None:
+                    yield path, index, words, seconds
+                    continue
+                # Evicted or unreadable since has_page(); the results belong to other pages.
+                if not local_api:
+                    init_worker(lang, tessdata)
+                    local_api = True
+                words, seconds = ocr_page(path, index)
+            if cache is not None:
+                cache.put_page(keys[path], index, words)
+            yield path, index, words, seconds
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if cache is not None:
+            cache.evict()
+
+
+def word_settings(layout):
+    """The layout's word engine settings, or WORD_COLUMNS for layouts read with the table finder."""
+    if is_word_engine(layout['table_settings']):
+        return layout['table_settings']
+    return WORD_COLUMNS
+
+
+def iter_records(paths, layout_name, lang=DEFAULT_LANG, tessdata=None, workers=1, cache=None, invalidate=False):
+    """Yield (path, page index, records, OCR seconds) for every page of paths in order."""
+    layout = LAYOUTS[layout_name]
+    settings = word_settings(layout)
+    parse_row = compile_layout(layout)
+    for path, index, words, seconds in iter_ocr_pages(paths, lang, tessdata, workers, cache, invalidate):
+        records = with_university(parse_page(parse_row, word_tables(words, settings)), layout['university'])
+        yield path, index, records, seconds
+
+
+def extract(paths, layout_name, writer, lang=DEFAULT_LANG, tessdata=None, workers=1, cache=None,
+            invalidate=False):
+    """Write the records of all pages of paths to writer; returns (pages, OCR seconds)."""
+    pages = 0
+    ocr_seconds = 0.0
+    for _, _, records, seconds in iter_records(paths, layout_name, lang, tessdata, workers, cache, invalidate):
+        writer.write(records)
+        pages += 1
+        ocr_seconds += seconds
+    return pages, ocr_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR screenshots and scanned result sheets into records")
+    parser.add_argument('paths', nargs='+', help="images, PDFs without a text layer, or directories of them")
+    parser.add_argument('--layout', choices=sorted(LAYOUTS), default=DEFAULT_LAYOUT,
+                        help=f"row rules of the sheets (default: {DEFAULT_LAYOUT})")
+    parser.add_argument('--lang', default=DEFAULT_LANG, help=f"Tesseract language(s) (default: {DEFAULT_LANG})")
+    parser.add_argument('--tessdata', default=os.environ.get('TESSDATA_PREFIX'),
+                        help="directory of the .traineddata files (default: $TESSDATA_PREFIX)")
+    parser.add_argument('--workers', type=int, default=1, help="OCR processes (default: 1)")
+    parser.add_argument('--format', choices=FORMATS, default='json')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        paths = input_files(args.paths)
+    except ValueError as e:
+        parser.error(str(e))
+    if not paths:
+        parser.error("no images or PDFs found")
+    started = time.perf_counter()
+    with RecordWriter(args.output, args.format) as writer:
+        pages, ocr_seconds = extract(paths, args.layout, writer, args.lang, args.tessdata, args.workers,
+                                     cache_from_args(args), args.invalidate)
+    elapsed = time.perf_counter() - started
+    print(f"{len(paths)} files, {pages} pages in {elapsed:.1f}s ({ocr_seconds:.1f}s of OCR): "
+          f"{writer.count} records -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import json
+
+FORMATS = ('json', 'json-compact', 'ndjson')
+
+
+class RecordWriter:
+    """Write records to disk as they arrive instead of dumping one big list.
+
+    'json' produces the same bytes as json.dump(records, f, indent=2),
+    'json-compact' a single-line array and 'ndjson' one record per line.
+    Every write() is flushed, so a crash keeps everything written so far;
+    for 'ndjson' that partial file is directly usable.
+    """
+
+    def __init__(self, path, format='json'):
+        if format not in FORMATS:
+            raise ValueError(f"unknown output format {format!r}, expected one of {', '.join(FORMATS)}")
+        self.path = path
+        self.format = format
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def _encode(self, record):
+        if self.format == 'json':
+            text = json.dumps(record, ensure_ascii=False, indent=2)
+            return '  ' + text.replace('\n', '\n  ')
+        if self.format == 'json-compact':
+            return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        return json.dumps(record, ensure_ascii=False)
+
+    def write(self, records):
+        parts = []
+        for record in records:
+            encoded = self._encode(record)
+            if self.format == 'ndjson':
+                parts.append(encoded + '\n')
+            elif self.count == 0:
+                parts.append(('[\n' if self.format == 'json' else '[') + encoded)
+            else:
+                parts.append((',\n' if self.format == 'json' else ',') + encoded)
+            self.count += 1
+        self._file.write(''.join(parts))
+        self._file.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self.format != 'ndjson':
+            if self.count == 0:
+                self._file.write('[]')
+            else:
+                self._file.write('\n]' if self.format == 'json' else ']')
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def add_output_argument(parser, default, what='results'):
+    parser.add_argument('--output', default=default,
+                        help=f"{what}: json, ndjson by extension, or .parquet/.arrow (see columnar.py)")
+
+
+def write_output(records, path):
+    """Write a finished list of records in the format path's extension names; returns the count.
+
+    .parquet/.arrow go through columnar.py, .ndjson is written as NDJSON and
+    anything else as indented JSON.
+    """
+    from admissions.columnar import columnar_format
+
+    if columnar_format(path):
+        from admissions.columnar import write_table
+
+        return write_table(records, path)
+    with RecordWriter(path, 'ndjson' if path.endswith('.ndjson') else 'json') as writer:
+        writer.write(records)
+    return writer.count
+
+
+def read_records(path, partial=False):
+    """Load records written by RecordWriter in any of its formats, or a
+    .parquet/.arrow export (see columnar.py).
+
+    With partial=True a file cut short by a crash yields the records that
+    were completely written instead of raising.
+    """
+    from admissions.columnar import columnar_format
+
+    if columnar_format(path):
+        from admissions.columnar import read_columnar
+
+        return read_columnar(path)
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    if not text.lstrip().startswith('['):
+        records = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                if not partial:
+                    raise
+                break
+        return records
+    if not partial:
+        return json.loads(text)
+
+    decoder = json.JSONDecoder()
+    records = []
+    pos = text.index('[') + 1
+    while True:
+        while pos < len(text) and text[pos] in ' \t\r\n,':
+            pos += 1
+        if pos >= len(text) or text[pos] == ']':
+            return records
+        try:
+            record, pos = decoder.raw_decode(text, pos)
+        except ValueError:
+            return records
+        records.append(record)
@@ -0,0 +1,254 @@
+import time
+from collections import deque
+
+from admissions.cache import TABLE_EXTRACTOR, document_key, file_digest
+from admissions.metrics import peak_rss_mb
+from admissions.regions import crop_to_region, extraction_profile, profile_name, region_key, resolve_region
+from admissions.words import WORDS_EXTRACTOR, extract_tables, is_word_engine
+
+# pdfplumber (with pdfminer and Pillow) is imported where a PDF is opened and
+# the process pool only when workers > 1, so commands that never open a PDF
+# start fast.
+
+# Pages handed to one worker at a time; small enough to balance uneven
+# documents, large enough that reopening the PDF per chunk stays cheap.
+DEFAULT_CHUNK_SIZE = 4
+# Chunks submitted to the pool per worker ahead of the consumer; bounds the
+# extracted pages waiting in memory however long the documents are.
+PREFETCH_CHUNKS = 2
+
+
+def count_pages(pdf_path):
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_page_range(pdf_path, start, stop, table_settings=None, bbox=None):
+    return timed_page_range(pdf_path, start, stop, table_settings, bbox)[0]
+
+
+def timed_page_range(pdf_path, start, stop, table_settings=None, bbox=None):
+    """extract_page_range plus (open seconds, [seconds per page], peak RSS MB) of the process doing it."""
+    pages = []
+    seconds = []
+    open_seconds = 0.0
+    for tables, opened, page_seconds, _ in iter_page_range(pdf_path, start, stop, table_settings, bbox):
+        pages.append(tables)
+        seconds.append(page_seconds)
+        open_seconds += opened
+    return pages, open_seconds, seconds, peak_rss_mb()
+
+
+def iter_page_range(pdf_path, start, stop, table_settings=None, bbox=None):
+    """Yield (tables, open seconds, seconds, peak RSS MB) per page of start..stop-1.
+
+    Open seconds are those of opening the PDF, on the first page only. Every
+    page's layout objects are released (Page.close) once its tables are taken;
+    pdfplumber would otherwise keep them for the whole document, and RSS
+    would grow with every page read.
+    """
+    import pdfplumber
+
+    started = time.perf_counter()
+    with pdfplumber.open(pdf_path) as pdf:
+        open_seconds = time.perf_counter() - started
+        for i in range(start, stop):
+            page_started = time.perf_counter()
+            page = pdf.pages[i]
+            cropped = crop_to_region(page, bbox)
+            tables = extract_tables(cropped, table_settings)
+            seconds = time.perf_counter() - page_started
+            cropped.close()
+            page.close()
+            yield tables, open_seconds, seconds, peak_rss_mb()
+            open_seconds = 0.0
+
+
+def page_ranges(page_count, chunk_size=DEFAULT_CHUNK_SIZE):
+    return [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+
+
+def missing_ranges(page_indexes, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Group sorted page indexes into contiguous ranges of at most chunk_size pages."""
+    ranges = []
+    for index in page_indexes:
+        if ranges and ranges[-1][1] == index and index - ranges[-1][0] < chunk_size:
+            ranges[-1][1] = index + 1
+        else:
+            ranges.append([index, index + 1])
+    return [tuple(r) for r in ranges]
+
+
+def iter_page_tables(pdf_paths, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None, invalidate=False,
+                     skip_pages=None, profiles=None, metrics=None, pool=None):
+    """Yield (pdf_path, page_index, tables) for every page, in file and page order.
+
+    With workers > 1 all files are split into page ranges and spread over one
+    process pool, PREFETCH_CHUNKS per worker ahead of the caller; pages are
+    still yielded in order, so the output is the same as a serial run. A
+    serial run extracts each page only when the previous one was consumed.
+    Pages found in cache (a TableCache) skip pdfplumber; freshly extracted
+    pages are written back to it. Pages listed in skip_pages ({pdf_path:
+    {page_index, ...}}) are not extracted at all and come out as (pdf_path,
+    page_index, None). profiles maps a pdf_path to the layout whose
+    table_settings and region apply to it (see regions.py). metrics (a
+    RunMetrics) receives the time spent per stage and page. pool is an
+    executor to use instead of starting one; it is left running.
+    """
+    skip_pages = skip_pages or {}
+    pdf_paths = list(dict.fromkeys(pdf_paths))
+    profiles = {path: extraction_profile((profiles or {}).get(path)) for path in pdf_paths}
+    keys = {}
+    page_counts = {}
+    regions = {}
+    bboxes = {}
+    if cache is not None:
+        regions = cache.load_regions()
+        known_regions = dict(regions)
+        for path in pdf_paths:
+            _, table_settings, region = profiles[path]
+            digest = file_digest(path)
+            if invalidate and region == 'auto':
+                regions.pop(region_key(digest, table_settings), None)
+            # The resolved bbox, not 'auto', goes into the key: pages cropped
+            # to another region are other pages.
+            started = time.perf_counter()
+            bboxes[path] = resolve_region(path, table_settings, region, regions, digest)
+            if metrics is not None and region == 'auto':
+                metrics.add('detect_region', time.perf_counter() - started, path)
+            extractor = WORDS_EXTRACTOR if is_word_engine(table_settings) else TABLE_EXTRACTOR
+            keys[path] = document_key(path, f'{extractor}:{profile_name(table_settings, bboxes[path])}', digest)
+            if invalidate:
+                cache.invalidate(keys[path])
+            page_count = cache.page_count(keys[path])
+            if page_count is not None:
+                page_counts[path] = page_count
+        if regions != known_regions:
+            cache.save_regions(regions)
+
+    own_pool = pool is None and workers > 1
+    if own_pool:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        uncounted = [path for path in pdf_paths if path not in page_counts]
+        counts = pool.map(count_pages, uncounted) if pool else map(count_pages, uncounted)
+        started = time.perf_counter()
+        for path, page_count in zip(uncounted, counts):
+            if metrics is not None:
+                metrics.add('count_pages', time.perf_counter() - started, path)
+            page_counts[path] = page_count
+            if cache is not None:
+                cache.set_page_count(keys[path], page_count)
+            started = time.perf_counter()
+
+        plans = []
+        queued = deque()
+        for path in pdf_paths:
+            skipped = set(skip_pages.get(path, ()))
+            cached = set()
+            if cache is not None:
+                cached = {index for index in range(page_counts[path])
+                          if index not in skipped and cache.has_page(keys[path], index)}
+            missing = [index for index in range(page_counts[path]) if index not in cached and index not in skipped]
+            _, table_settings, region = profiles[path]
+            if path not in bboxes and missing:
+                started = time.perf_counter()
+                bboxes[path] = resolve_region(path, table_settings, region, regions)
+                if metrics is not None and region == 'auto':
+                    metrics.add('detect_region', time.perf_counter() - started, path)
+            # A serial run opens each PDF once for all of its missing pages.
+            span = chunk_size if pool else max(len(missing), 1)
+            jobs = {}
+            for start, stop in missing_ranges(missing, span):
+                jobs[start] = (path, start, stop, table_settings, bboxes.get(path))
+                queued.append(jobs[start])
+            plans.append((path, skipped, cached, jobs))
+
+        futures = {}
+
+        def submit_ahead():
+            while pool and queued and len(futures) < workers * PREFETCH_CHUNKS:
+                args = queued.popleft()
+                futures[args[:2]] = pool.submit(timed_page_range, *args)
+
+        submit_ahead()
+
+        for path, skipped, cached, jobs in plans:
+            index = 0
+            while index < page_counts[path]:
+                if index in skipped:
+                    yield path, index, None
+                    index += 1
+                    continue
+                if index in cached:
+                    started = time.perf_counter()
+                    tables = cache.get_page(keys[path], index)
+                    if metrics is not None:
+                        metrics.add('cache_read', time.perf_counter() - started, path, index)
+                    if tables is None:
+                        table_settings = profiles[path][1]
+                        tables = extract_page_range(path, index, index + 1, table_settings, bboxes[path])[0]
+                    yield path, index, tables
+                    index += 1
+                    continue
+                args = jobs.pop(index)
+                stop = args[2]
+                if pool:
+                    future = futures.pop(args[:2])
+                    submit_ahead()
+                    extracted, open_seconds, page_seconds, rss_mb = future.result()
+                    pages = ((tables, open_seconds if offset == 0 else 0.0, page_seconds[offset], rss_mb)
+                             for offset, tables in enumerate(extracted))
+                else:
+                    pages = iter_page_range(*args)
+                for offset, (tables, open_seconds, seconds, rss_mb) in enumerate(pages):
+                    if metrics is not None:
+                        if offset == 0:
+                            metrics.add('open', open_seconds, path, index, rss_mb)
+                        metrics.add('extract_tables', seconds, path, index + offset, rss_mb)
+                    if cache is not None:
+                        started = time.perf_counter()
+                        cache.put_page(keys[path], index + offset, tables)
+                        if metrics is not None:
+                            metrics.add('cache_write', time.perf_counter() - started, path, index + offset)
+                    yield path, index + offset, tables
+                index = stop
+
+        if cache is not None:
+            cache.evict()
+    finally:
+        if own_pool:
+            pool.shutdown(cancel_futures=True)
+
+
+def split_by_pdf(page_stream, pdf_paths):
+    """Yield (pdf_path, tables iterator) per path, in order, from iter_page_tables output.
+
+    Unlike itertools.groupby this also yields paths that produced no pages.
+    """
+    stream = iter(page_stream)
+    pending = next(stream, None)
+
+    def pages_of(path):
+        nonlocal pending
+        while pending is not None and pending[0] == path:
+            yield pending[2]
+            pending = next(stream, None)
+
+    for path in pdf_paths:
+        pages = pages_of(path)
+        yield path, pages
+        for _ in pages:
+            pass
+
+
+def read_page_tables(pdf_paths, **kwargs):
+    """Return {pdf_path: [page_0_tables, page_1_tables, ...]}; see iter_page_tables."""
+    pages = {path: [] for path in dict.fromkeys(pdf_paths)}
+    for path, _, tables in iter_page_tables(pdf_paths, **kwargs):
+        pages[path].append(tables)
+    return pages
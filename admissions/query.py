@@ -0,0 +1,178 @@
+"""Which specialties a score gets into, from sorted passing scores (needs numpy).
+
+    python -m admissions.query 345                      # budget and paid, latest year, all universities
+    python -m admissions.query 345 --year 2024 --funding paid --faculty bsu-1
+    python -m admissions.query --between 330 350 --university bsu
+    python -m admissions.query --profiles applicants.ndjson --output reachable.ndjson
+    python -m admissions.query 300 --input bntu_admission_2022_data.json=bntu
+
+Passing scores are the admission_stats min_score (budget) and paid_min_score
+(paid) of every specialty. ScoreIndex keeps them sorted per year and funding,
+once for all universities and once per university and per faculty, so a
+threshold or range query is a binary search and a batch of applicant scores is
+one searchsorted call per partition. Profiles are records with a score and
+optionally year, funding, university and faculty.
+"""
+import argparse
+import sys
+import time
+
+from admissions.loader import add_input_arguments, rows_from_args
+from admissions.output import add_output_argument, read_records, write_output
+
+FUNDINGS = {'budget': 'min_score', 'paid': 'paid_min_score'}
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise SystemExit("score queries need numpy: pip install numpy") from None
+    return numpy
+
+
+def _scope(university=None, faculty=None):
+    if faculty:
+        return 'faculty', faculty
+    if university:
+        return 'university', university
+    return None
+
+
+class ScoreIndex:
+    """Passing scores of admission_stats rows, sorted per (year, funding, scope).
+
+    faculties maps specialty ids to faculty ids (specialties.load_faculties);
+    the university is the prefix of the specialty id. Specialties come back
+    easiest first.
+    """
+
+    def __init__(self, rows, faculties=None):
+        np = _numpy()
+        faculties = faculties or {}
+        groups = {}
+        for row in rows:
+            specialty_id = row['specialty_id']
+            scopes = [None, _scope(university=specialty_id.split('-')[0])]
+            if faculties.get(specialty_id):
+                scopes.append(_scope(faculty=faculties[specialty_id]))
+            for funding, field in FUNDINGS.items():
+                if row[field]:
+                    for scope in scopes:
+                        groups.setdefault((row['year'], funding, scope), []).append((row[field], specialty_id))
+
+        self.partitions = {}
+        for key, entries in groups.items():
+            entries.sort()
+            scores = np.array([score for score, _ in entries], dtype='float64')
+            ids = np.array([specialty_id for _, specialty_id in entries], dtype=object)
+            self.partitions[key] = (scores, ids)
+        self.years = sorted({year for year, _, _ in groups})
+        self._empty = (np.empty(0, dtype='float64'), np.empty(0, dtype=object))
+
+    def partition(self, year=None, funding='budget', university=None, faculty=None):
+        """(sorted passing scores, specialty ids) of one partition; empty when nothing matches."""
+        if funding not in FUNDINGS:
+            raise ValueError(f"unknown funding {funding!r}, expected one of {', '.join(FUNDINGS)}")
+        if year is None:
+            year = self.years[-1] if self.years else None
+        return self.partitions.get((year, funding, _scope(university, faculty)), self._empty)
+
+    def count(self, score, year=None, funding='budget', university=None, faculty=None):
+        scores, _ = self.partition(year, funding, university, faculty)
+        return int(scores.searchsorted(score, side='right'))
+
+    def eligible(self, score, year=None, funding='budget', university=None, faculty=None):
+        """Specialty ids whose passing score is at most score."""
+        scores, ids = self.partition(year, funding, university, faculty)
+        return ids[:scores.searchsorted(score, side='right')].tolist()
+
+    def between(self, low, high, year=None, funding='budget', university=None, faculty=None):
+        """[(passing score, specialty id)] with low <= passing score <= high."""
+        scores, ids = self.partition(year, funding, university, faculty)
+        start, end = scores.searchsorted(low, side='left'), scores.searchsorted(high, side='right')
+        return [(float(score), specialty_id) for score, specialty_id in zip(scores[start:end], ids[start:end])]
+
+    def count_many(self, scores, year=None, funding='budget', university=None, faculty=None):
+        """Eligible specialty counts for an array of scores, in one call."""
+        np = _numpy()
+        passing, _ = self.partition(year, funding, university, faculty)
+        return passing.searchsorted(np.asarray(scores, dtype='float64'), side='right')
+
+    def eligible_many(self, profiles):
+        """[{funding: specialty ids}] per profile; profiles sharing a partition share one search.
+
+        A profile without a funding gets both.
+        """
+        np = _numpy()
+        profiles = list(profiles)
+        groups = {}
+        for i, profile in enumerate(profiles):
+            for funding in [profile['funding']] if profile.get('funding') else FUNDINGS:
+                key = (profile.get('year'), funding, profile.get('university'), profile.get('faculty'))
+                groups.setdefault(key, []).append(i)
+
+        result = [{} for _ in profiles]
+        for key, positions in groups.items():
+            _, ids = self.partition(*key)
+            counts = self.count_many(np.array([profiles[i]['score'] for i in positions]), *key)
+            for i, count in zip(positions, counts.tolist()):
+                result[i][key[1]] = ids[:count].tolist()
+        return result
+
+
+def main():
+    from admissions.specialties import load_catalog, load_faculties
+
+    parser = argparse.ArgumentParser(description="List the specialties a score is enough for")
+    parser.add_argument('score', nargs='?', type=float, help="applicant's total score")
+    parser.add_argument('--between', nargs=2, type=float, metavar=('LOW', 'HIGH'),
+                        help="specialties whose passing score is within LOW..HIGH instead")
+    parser.add_argument('--profiles', metavar='PATH',
+                        help="score every record of PATH (score, optional year/funding/university/faculty)")
+    add_output_argument(parser, 'reachable_specialties.ndjson', '--profiles results')
+    parser.add_argument('--year', type=int, help="admission year (default: the latest in the data)")
+    parser.add_argument('--funding', choices=('budget', 'paid', 'both'), default='both')
+    parser.add_argument('--university', help="only this university (bsu, bntu, ...)")
+    parser.add_argument('--faculty', help="only this faculty id (bsu-1, ...)")
+    add_input_arguments(parser, 'index')
+    args = parser.parse_args()
+    if sum(option is not None for option in (args.score, args.between, args.profiles)) != 1:
+        parser.error("pass exactly one of SCORE, --between or --profiles")
+    if args.from_db and not args.dsn:
+        parser.error("no database: pass --dsn or set DATABASE_URL")
+
+    index = ScoreIndex(rows_from_args(args), load_faculties())
+    if not index.years:
+        print("no passing scores to index", file=sys.stderr)
+        return 1
+
+    if args.profiles:
+        profiles = read_records(args.profiles)
+        started = time.perf_counter()
+        reachable = index.eligible_many(profiles)
+        elapsed = (time.perf_counter() - started) * 1000
+        write_output([dict(profile, **found) for profile, found in zip(profiles, reachable)], args.output)
+        print(f"{len(profiles)} profiles scored in {elapsed:.1f} ms -> {args.output}", file=sys.stderr)
+        return 0
+
+    names = {specialty_id: name for specialty_id, _, name, _ in load_catalog()}
+    year = args.year or index.years[-1]
+    fundings = FUNDINGS if args.funding == 'both' else [args.funding]
+    for funding in fundings:
+        started = time.perf_counter()
+        if args.between:
+            found = index.between(*args.between, year, funding, args.university, args.faculty)
+        else:
+            scores, ids = index.partition(year, funding, args.university, args.faculty)
+            count = index.count(args.score, year, funding, args.university, args.faculty)
+            found = [(float(score), specialty_id) for score, specialty_id in zip(scores[:count], ids[:count])]
+        elapsed = (time.perf_counter() - started) * 1e6
+        print(f"{funding} {year}: {len(found)} specialties ({elapsed:.0f} µs)")
+        for score, specialty_id in reversed(found):
+            print(f"  {score:5.0f}  {specialty_id:10} {names.get(specialty_id, '')}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import json
+
+from admissions.cache import file_digest
+from admissions.words import is_word_engine
+
+# Points added around the detected region so ruling lines that sit exactly
+# on the table border survive the crop.
+REGION_PADDING = 2
+
+
+def extraction_profile(layout):
+    """(template, table_settings, region) a layout asks pdfplumber to use.
+
+    table_settings go to extract_tables() unchanged (None = pdfplumber
+    defaults). region is None for full pages, 'auto' to detect the table
+    region of each document, or an explicit (x0, top, x1, bottom) bbox.
+    """
+    if layout is None:
+        return None, None, None
+    template = f"{layout['university']}-{layout['year']}-{layout['type']}"
+    table_settings, region = layout.get('table_settings'), layout.get('region')
+    if region == 'auto' and is_word_engine(table_settings):
+        raise ValueError(f"{template}: the word engine finds no tables to detect a region from; "
+                         f"use region None or a bbox")
+    return template, table_settings, region
+
+
+def profile_name(table_settings, region):
+    """Text identifying a profile, folded into the page cache key; region is the resolved bbox."""
+    return f'settings={json.dumps(table_settings, sort_keys=True)};region={region}'
+
+
+def region_key(digest, table_settings):
+    """regions.json key: a detected region belongs to one document read with one table_settings."""
+    return f'{digest}:{json.dumps(table_settings, sort_keys=True)}'
+
+
+def detect_region(pages, table_settings=None):
+    """Union of the table bboxes found on every page, padded; None if no table.
+
+    Each page is closed once searched, so a long document is scanned without
+    keeping the layout of every page.
+    """
+    boxes = []
+    for page in pages:
+        boxes.extend(table.bbox for table in page.find_tables(table_settings))
+        page.close()
+    if not boxes:
+        return None
+    x0 = min(box[0] for box in boxes) - REGION_PADDING
+    top = min(box[1] for box in boxes) - REGION_PADDING
+    x1 = max(box[2] for box in boxes) + REGION_PADDING
+    bottom = max(box[3] for box in boxes) + REGION_PADDING
+    return [x0, top, x1, bottom]
+
+
+def resolve_region(pdf_path, table_settings, region, regions, digest=None):
+    """Turn a layout's region setting into a bbox for pdf_path.
+
+    regions maps region_key()s to bboxes found earlier (TableCache.regions
+    or a plain dict) and is updated with newly detected ones. Every page is
+    searched: a later page may hold a wider or lower table than the first.
+    digest is pdf_path's file_digest, when the caller already has it.
+    """
+    if region != 'auto':
+        return region
+    key = region_key(digest or file_digest(pdf_path), table_settings)
+    if key not in regions:
+        import pdfplumber
+
+        with pdfplumber.open(pdf_path) as pdf:
+            regions[key] = detect_region(pdf.pages, table_settings)
+    return regions[key]
+
+
+def crop_to_region(page, bbox):
+    if bbox is None:
+        return page
+    x0, top, x1, bottom = page.bbox
+    clamped = (max(bbox[0], x0), max(bbox[1], top), min(bbox[2], x1), min(bbox[3], bottom))
+    return page.crop(clamped)
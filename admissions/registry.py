@@ -0,0 +1,101 @@
+import glob
+import os
+
+from admissions.layouts import LAYOUTS
+from admissions.loader import plan_record
+from admissions.manual import get_2025_manual_data
+from admissions.output import read_records
+
+# Extractors by name. A PDF extractor names a layout (layouts.py) and a glob
+# of input files relative to the input directory; the newest matching file is
+# parsed with that layout. A records extractor returns records instead: called
+# with no argument when it has no inputs (hand-kept data), else with the newest
+# file matching its glob. Extractors with default=False only run when asked for by
+# name. A url names where the single input file is published (see fetch.py).
+EXTRACTORS = {}
+
+
+def register(name, layout=None, inputs=None, records=None, university=None, year=None, default=True, url=None):
+    if (layout is None) == (records is None):
+        raise ValueError(f"extractor {name!r} needs either a layout or records")
+    if url is not None and (layout is None or inputs is None or glob.has_magic(inputs)):
+        raise ValueError(f"extractor {name!r}: a url needs a single input file")
+    if layout is not None:
+        university = university or LAYOUTS[layout]['university']
+        year = year or LAYOUTS[layout]['year']
+    EXTRACTORS[name] = {
+        'name': name,
+        'university': university,
+        'year': year,
+        'layout': layout,
+        'inputs': inputs,
+        'records': records,
+        'default': default,
+        'url': url,
+    }
+    return EXTRACTORS[name]
+
+
+def read_plan_records(path):
+    """Records of a JSON list of plan records (budget_plan, budget_score, ...), see loader.plan_record."""
+    return [plan_record(record) for record in read_records(path)]
+
+
+# Globs take re-published copies ('БГУ2024 (1).pdf'), which replace the file
+# they were downloaded next to; the 2023 budget list is an exact name because
+# БГУ2023*.pdf would also match the paid one.
+register('bsu-2022-budget', layout='bsu-2022-budget', inputs='graduates/БГУ2022*.pdf')
+register('bsu-2023-budget', layout='bsu-2023-budget', inputs='graduates/БГУ2023.pdf')
+register('bsu-2023-paid', layout='bsu-2023-paid', inputs='graduates/БГУ2023платн*.pdf')
+register('bsu-2024', layout='bsu-2024', inputs='graduates/БГУ2024*.pdf')
+register('bsu-2025-manual', records=get_2025_manual_data, university='bsu', year=2025)
+# The 2025 PDF lacks most column rules; the manual list stays the default.
+register('bsu-2025', layout='bsu-2025', inputs='graduates/БГУ2025*.pdf', default=False)
+register('bntu-2022', records=read_plan_records, inputs='bntu_admission_2022*.json', university='bntu', year=2022)
+
+
+def select(names=None, universities=None, years=None):
+    """Extractors in registry order: the named ones, or all defaults, filtered."""
+    if names:
+        unknown = [name for name in names if name not in EXTRACTORS]
+        if unknown:
+            raise ValueError(f"unknown extractor(s): {', '.join(unknown)}")
+        chosen = [extractor for name, extractor in EXTRACTORS.items() if name in names]
+    else:
+        chosen = [extractor for extractor in EXTRACTORS.values() if extractor['default']]
+    return [extractor for extractor in chosen
+            if (not universities or extractor['university'] in universities)
+            and (not years or extractor['year'] in years)]
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        # Deleted since the glob; any other match wins.
+        return float('-inf')
+
+
+def discover(extractors, root='.'):
+    """[(extractor, input path or None)]: one job per extractor, in registry order.
+
+    An extractor with inputs gets the newest file matching them (by mtime,
+    then name), so a re-published copy next to the original is read instead
+    of it, not as well; none when nothing matches. A records extractor
+    without inputs gets None. Raises ValueError when a file matches more
+    than one extractor.
+    """
+    jobs = []
+    owners = {}
+    for extractor in extractors:
+        if extractor['inputs'] is None:
+            jobs.append((extractor, None))
+            continue
+        paths = [os.path.normpath(path) for path in glob.glob(os.path.join(root, extractor['inputs']))]
+        for path in paths:
+            if path in owners:
+                raise ValueError(f"{path} matches both {owners[path]} and {extractor['name']}")
+            owners[path] = extractor['name']
+        if paths:
+            jobs.append((extractor, max(paths, key=lambda path: (_mtime(path), path))))
+    return jobs
@@ -0,0 +1,379 @@
+"""Read-only HTTP API over extracted admission data (needs aiohttp).
+
+    python -m admissions.service                        # bsu_admission_all_data.json on 127.0.0.1:8080
+    python -m admissions.service --input bsu_admission_all_data.json --input bntu_admission_2022_data.json=bntu
+    python -m admissions.service --load-test 5000 --concurrency 50
+
+    GET /stats?year=2024&university=bsu&faculty=bsu-1&q=матем&sort=-min_score&limit=50&offset=0
+        admission_stats rows with their specialty's name, code, faculty and
+        university; every filter is optional, q matches part of the name, sort
+        is a field of SORT_FIELDS (- for descending, default -year). Returns
+        {"total": matching rows, "items": [one page of rows]}.
+    GET /specialties/<specialty_id>/history
+        the rows of one specialty, oldest year first.
+    GET /health
+        dataset hash, row count and response cache counters.
+
+A local stand-in for the Supabase path of the frontend. Records are merged into
+admission_stats rows (loader.stats_rows) and indexed in memory by year,
+university, faculty and specialty. Response bodies go into an LRU cache keyed by
+request and dataset content hash. Every --reload-interval seconds the input
+files are checked; when their content changes they are reloaded and the cache
+starts over. --load-test serves in-process on a free port and fires requests
+at it.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+
+from admissions.cache import file_digest
+from admissions.loader import DEFAULT_INPUT, add_input_arguments, parse_inputs, stats_rows
+from admissions.output import read_records
+
+DEFAULT_PORT = 8080
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_RELOAD_INTERVAL = 5.0
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+FILTERS = ('year', 'university', 'faculty_id', 'specialty_id')
+# /stats parameters and the row fields they filter on.
+FILTER_PARAMS = {'year': 'year', 'university': 'university', 'faculty': 'faculty_id', 'specialty': 'specialty_id'}
+SORT_FIELDS = ('year', 'min_score', 'paid_min_score', 'avg_score', 'budget_places', 'paid_places', 'name')
+
+
+def _aiohttp():
+    try:
+        import aiohttp
+        from aiohttp import web
+    except ImportError:
+        raise SystemExit("the service needs aiohttp: pip install aiohttp") from None
+    return aiohttp, web
+
+
+
+def dataset_digest(sources):
+    digest = hashlib.sha256()
+    for path, university in sources:
+        digest.update(f'{path}\0{university}\0{file_digest(path)}\0'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class Dataset:
+    """admission_stats rows of the sources, joined with the catalog, plus posting lists per filter."""
+
+    def __init__(self, rows, catalog, faculties, digest):
+        self.digest = digest
+        self.rows = []
+        for row in sorted(rows, key=lambda row: (row['specialty_id'], row['year'])):
+            specialty_id = row['specialty_id']
+            _, university, name, code = catalog.get(specialty_id, (None, specialty_id.split('-')[0], None, None))
+            self.rows.append(dict(row, name=name, code=code, faculty_id=faculties.get(specialty_id),
+                                  university=university))
+        self.index = {field: {} for field in FILTERS}
+        for position, row in enumerate(self.rows):
+            for field in FILTERS:
+                self.index[field].setdefault(row[field], []).append(position)
+        self.names = [(row['name'] or '').lower() for row in self.rows]
+
+    @classmethod
+    def load(cls, sources):
+        from admissions.specialties import SpecialtyIndex, load_catalog, load_faculties
+
+        digest = dataset_digest(sources)
+        rows = {}
+        indexes = {}
+        for path, university in sources:
+            if university not in indexes:
+                indexes[university] = SpecialtyIndex.for_university(university)
+            for row in stats_rows(read_records(path), indexes[university])[0]:
+                rows[row['specialty_id'], row['year']] = row
+        catalog = {entry[0]: entry for entry in load_catalog()}
+        return cls(rows.values(), catalog, load_faculties(), digest)
+
+    def query(self, filters=None, q=None, sort='-year', limit=DEFAULT_LIMIT, offset=0):
+        """(total, one page of rows) matching every filter ({field: value}) and q."""
+        postings = [self.index[field].get(value, []) for field, value in (filters or {}).items()]
+        positions = min(postings, key=len) if postings else range(len(self.rows))
+        needle = q.lower() if q else None
+        matched = [position for position in positions
+                   if all(self.rows[position][field] == value for field, value in (filters or {}).items())
+                   and (needle is None or needle in self.names[position])]
+
+        field = sort.lstrip('-')
+        present = [position for position in matched if self.rows[position][field] is not None]
+        present.sort(key=lambda position: self.rows[position][field], reverse=sort.startswith('-'))
+        ordered = present + [position for position in matched if self.rows[position][field] is None]
+        return len(ordered), [self.rows[position] for position in ordered[offset:offset + limit]]
+
+    def history(self, specialty_id):
+        return [self.rows[position] for position in self.index['specialty_id'].get(specialty_id, [])]
+
+
+class ResponseCache:
+    """Least recently used response bodies, at most size of them."""
+
+    def __init__(self, size=DEFAULT_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        body = self.entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return body
+
+    def put(self, key, body):
+        if self.size <= 0:
+            return
+        self.entries[key] = body
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+def _int_param(query, name, default, minimum=0, maximum=None):
+    value = query.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
+    if number < minimum or (maximum is not None and number > maximum):
+        raise ValueError(f"{name} must be within {minimum}..{maximum if maximum is not None else ''}")
+    return number
+
+
+class Service:
+    """The aiohttp application around a Dataset, its response cache and the reload task."""
+
+    def __init__(self, sources, cache_size=DEFAULT_CACHE_SIZE, reload_interval=DEFAULT_RELOAD_INTERVAL):
+        self.sources = sources
+        self.reload_interval = reload_interval
+        self.cache = ResponseCache(cache_size)
+        self.signature = self._signature()
+        self.dataset = Dataset.load(sources)
+
+    def _signature(self):
+        signature = []
+        for path, _ in self.sources:
+            stat = os.stat(path)
+            signature.append((stat.st_size, stat.st_mtime_ns))
+        return signature
+
+    async def reload_if_changed(self):
+        """Reload the sources when their content hash changed; returns True when it did."""
+        try:
+            signature = self._signature()
+        except OSError:
+            return False
+        if signature == self.signature:
+            return False
+        self.signature = signature
+        loop = asyncio.get_running_loop()
+        try:
+            digest = await loop.run_in_executor(None, dataset_digest, self.sources)
+            if digest == self.dataset.digest:
+                return False
+            dataset = await loop.run_in_executor(None, Dataset.load, self.sources)
+        except (OSError, ValueError) as e:
+            # A file being rewritten; the next check sees it complete.
+            self.signature = None
+            print(f"reload failed: {e}", file=sys.stderr)
+            return False
+        self.dataset = dataset
+        self.cache.clear()
+        print(f"reloaded: {len(dataset.rows)} rows, dataset {dataset.digest[:12]}", file=sys.stderr)
+        return True
+
+    async def _watch(self, app):
+        async def loop():
+            while True:
+                await asyncio.sleep(self.reload_interval)
+                await self.reload_if_changed()
+
+        task = asyncio.create_task(loop())
+        yield
+        task.cancel()
+
+    def respond(self, request, build):
+        """JSON response of build(dataset), from the cache when this dataset already answered the request."""
+        _, web = _aiohttp()
+        dataset = self.dataset
+        key = (dataset.digest, request.path, tuple(sorted(request.query.items())))
+        body = self.cache.get(key)
+        if body is None:
+            try:
+                result = build(dataset)
+            except ValueError as e:
+                return web.json_response({'error': str(e)}, status=400)
+            except LookupError as e:
+                return web.json_response({'error': str(e)}, status=404)
+            body = json.dumps(result, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            self.cache.put(key, body)
+        etag = f'"{dataset.digest[:16]}-{hashlib.sha1(repr(key[1:]).encode("utf-8")).hexdigest()[:16]}"'
+        headers = {'ETag': etag, 'Access-Control-Allow-Origin': '*'}
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type='application/json', charset='utf-8', headers=headers)
+
+    async def stats(self, request):
+        def build(dataset):
+            query = request.query
+            filters = {field: query[param] for param, field in FILTER_PARAMS.items() if param in query}
+            if 'year' in filters:
+                filters['year'] = _int_param(query, 'year', None, minimum=1)
+            sort = query.get('sort', '-year')
+            if sort.lstrip('-') not in SORT_FIELDS:
+                raise ValueError(f"sort must be one of {', '.join(SORT_FIELDS)}, optionally with -")
+            limit = _int_param(query, 'limit', DEFAULT_LIMIT, maximum=MAX_LIMIT)
+            offset = _int_param(query, 'offset', 0)
+            total, items = dataset.query(filters, query.get('q'), sort, limit, offset)
+            return {'total': total, 'items': items}
+
+        return self.respond(request, build)
+
+    async def history(self, request):
+        def build(dataset):
+            specialty_id = request.match_info['specialty_id']
+            rows = dataset.history(specialty_id)
+            if not rows:
+                raise LookupError(f"no rows for specialty {specialty_id}")
+            return rows
+
+        return self.respond(request, build)
+
+    async def health(self, request):
+        _, web = _aiohttp()
+        return web.json_response({
+            'dataset': self.dataset.digest,
+            'rows': len(self.dataset.rows),
+            'cache': {'entries': len(self.cache.entries), 'hits': self.cache.hits, 'misses': self.cache.misses},
+        })
+
+    def app(self):
+        _, web = _aiohttp()
+        app = web.Application()
+        app.router.add_get('/stats', self.stats)
+        app.router.add_get('/specialties/{specialty_id}/history', self.history)
+        app.router.add_get('/health', self.health)
+        if self.reload_interval > 0:
+            app.cleanup_ctx.append(self._watch)
+        return app
+
+
+def sample_paths(dataset, count, seed=0):
+    """count request paths of the kinds the frontend sends, drawn from the dataset's values."""
+    rng = random.Random(seed)
+    years = sorted(dataset.index['year'])
+    universities = sorted(dataset.index['university'])
+    faculties = sorted(value for value in dataset.index['faculty_id'] if value)
+    specialties = sorted(dataset.index['specialty_id'])
+    paths = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.2:
+            paths.append(f'/specialties/{rng.choice(specialties)}/history')
+            continue
+        params = {'year': rng.choice(years + ['all']), 'sort': rng.choice(['-year', '-min_score', 'name'])}
+        if kind < 0.6:
+            params['university'] = rng.choice(universities)
+        elif faculties:
+            params['faculty'] = rng.choice(faculties)
+        params['offset'] = rng.choice([0, 0, 0, DEFAULT_LIMIT])
+        paths.append('/stats?' + '&'.join(f'{name}={value}' for name, value in params.items() if value != 'all'))
+    return paths
+
+
+async def load_test(service, requests, concurrency):
+    """Serve service on a free local port and send it requests; returns a summary dict."""
+    aiohttp, web = _aiohttp()
+    runner = web.AppRunner(service.app())
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    paths = sample_paths(service.dataset, requests)
+    latencies = []
+    errors = 0
+
+    async def worker(session, queue):
+        nonlocal errors
+        while queue:
+            path = queue.pop()
+            started = time.perf_counter()
+            async with session.get(f'http://{host}:{port}{path}') as response:
+                await response.read()
+                if response.status != 200:
+                    errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    queue = list(reversed(paths))
+    started = time.perf_counter()
+    try:
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency)) as session:
+            await asyncio.gather(*(worker(session, queue) for _ in range(concurrency)))
+    finally:
+        elapsed = time.perf_counter() - started
+        await runner.cleanup()
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'distinct': len(set(paths)),
+        'errors': errors,
+        'seconds': round(elapsed, 2),
+        'requests_per_sec': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2),
+        'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2),
+        'cache_hits': service.cache.hits,
+        'cache_misses': service.cache.misses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve extracted admission data over HTTP")
+    add_input_arguments(parser, 'serve', from_db=False)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"responses kept in the LRU cache, 0 to disable (default: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument('--reload-interval', type=float, default=DEFAULT_RELOAD_INTERVAL,
+                        help=f"seconds between input file checks, 0 to never reload "
+                             f"(default: {DEFAULT_RELOAD_INTERVAL})")
+    parser.add_argument('--load-test', type=int, metavar='REQUESTS',
+                        help="serve on a free port, send REQUESTS requests, print throughput and exit")
+    parser.add_argument('--concurrency', type=int, default=20, help="parallel requests of --load-test")
+    args = parser.parse_args()
+
+    _, web = _aiohttp()
+    sources = parse_inputs(args.input or [DEFAULT_INPUT])
+    for path, _ in sources:
+        if not os.path.exists(path):
+            parser.error(f"{path}: no such file")
+    service = Service(sources, args.cache_size, args.reload_interval)
+    print(f"{len(service.dataset.rows)} rows from {len(sources)} file(s), dataset {service.dataset.digest[:12]}")
+
+    if args.load_test:
+        result = asyncio.run(load_test(service, args.load_test, args.concurrency))
+        print(json.dumps(result, indent=2))
+        return 1 if result['errors'] else 0
+    web.run_app(service.app(), host=args.host, port=args.port, print=lambda message: print(message, flush=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
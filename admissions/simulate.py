@@ -0,0 +1,208 @@
+"""Admission chances of an applicant score per specialty, by simulation (needs numpy).
+
+    python -m admissions.simulate 345                           # bsu_admission_all_data.json, next year
+    python -m admissions.simulate 320 345 370 --draws 200000 --output chances.ndjson
+    python -m admissions.simulate 345 --input bsu_admission_all_data.json --input bntu_admission_2022_data.json=bntu
+    python -m admissions.simulate 345 --from-db --workers 8     # every university in admission_stats
+
+Every score series (min_score for budget, paid_min_score for paid places, see
+loader.stats_rows) gets the least-squares line of forecast.py. Next year's
+passing score is drawn around the line as a Student t with the series'
+prediction spread, rounded to a whole score. How much a passing score moves
+depends on the size of the intake: with a handful of places a few strong
+applicants shift it. So the residual spread of a series is shrunk towards the
+pooled spread of its size class (SMALL_PROGRAM places, latest year known)
+with PRIOR_DF degrees of freedom, which also gives series of one or two years
+a spread. A score equal to the simulated passing score counts as half a
+chance: some of the applicants with exactly that score get in.
+
+The draws of all specialties are one matrix, BLOCK_ROWS specialties by
+DRAW_CHUNK draws at a time, and are counted per whole score, so any number of
+applicant scores is read off the same simulation. Every block has its own
+seed, so --workers splits the blocks over processes without changing the
+result.
+"""
+import argparse
+import sys
+import time
+
+from admissions.forecast import line_fits, series_matrix
+from admissions.frame import SCORE_MAX, SCORE_MIN
+from admissions.loader import add_input_arguments, rows_from_args
+from admissions.output import add_output_argument, write_output
+
+FUNDINGS = {
+    'budget': ('min_score', 'budget_places'),
+    'paid': ('paid_min_score', 'paid_places'),
+}
+DEFAULT_DRAWS = 100_000
+DRAW_CHUNK = 10_000
+BLOCK_ROWS = 256
+# Intakes below SMALL_PROGRAM places move more from year to year: on the BSU
+# data the residual spread is ~19.5 points below 30 places and ~12 above.
+SMALL_PROGRAM = 30
+PRIOR_DF = 2
+SIZE_CLASSES = ('small', 'large', 'unknown')
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise SystemExit("simulations need numpy: pip install numpy") from None
+    return numpy
+
+
+def latest_places(rows, field):
+    """{specialty id: places of the latest year that has them}."""
+    places = {}
+    for row in sorted(rows, key=lambda row: row['year']):
+        if row[field]:
+            places[row['specialty_id']] = row[field]
+    return places
+
+
+def score_models(rows, year=None):
+    """{funding: model} of the passing score in year (default: the year after the data).
+
+    A model holds specialty ids, the line's value (centre), the scale and the
+    degrees of freedom of the t draws, places and the size class index.
+    Fundings without a series are left out.
+    """
+    np = _numpy()
+    rows = list(rows)
+    if year is None:
+        year = max(row['year'] for row in rows) + 1
+    models = {}
+    for funding, (field, places_field) in FUNDINGS.items():
+        series = [row for row in rows if row[field]]
+        if not series:
+            continue
+        specialties, years, matrix = series_matrix(series, field)
+        value, sse, df, n, spread = line_fits(matrix, years, year)
+        known = latest_places(rows, places_field)
+        places = np.array([known.get(specialty_id, np.nan) for specialty_id in specialties], dtype='float64')
+        size = np.where(np.isnan(places), 2, np.where(places < SMALL_PROGRAM, 0, 1))
+        own_df = np.maximum(df, 0)
+        if not own_df.sum():
+            raise ValueError(f"no {funding} series with three or more years to measure the spread")
+        overall = sse.sum() / own_df.sum()
+        prior = np.array([sse[size == i].sum() / own_df[size == i].sum() if own_df[size == i].sum() else overall
+                          for i in range(len(SIZE_CLASSES))])
+        variance = (sse + PRIOR_DF * prior[size]) / (own_df + PRIOR_DF)
+        models[funding] = {
+            'specialties': specialties,
+            'year': year,
+            'centre': value,
+            'scale': np.sqrt(variance) * spread,
+            'df': own_df + PRIOR_DF,
+            'places': places,
+            'size': size,
+        }
+    return models
+
+
+def simulate_block(centre, scale, df, draws, seed):
+    """specialty x score counts of draws simulated passing scores (SCORE_MIN..SCORE_MAX)."""
+    np = _numpy()
+    rng = np.random.default_rng(seed)
+    width = SCORE_MAX - SCORE_MIN + 1
+    offsets = np.arange(len(centre))[:, None] * width - SCORE_MIN
+    counts = np.zeros(len(centre) * width, dtype='int64')
+    for start in range(0, draws, DRAW_CHUNK):
+        size = (len(centre), min(DRAW_CHUNK, draws - start))
+        scores = np.rint(centre[:, None] + scale[:, None] * rng.standard_t(df[:, None], size))
+        np.clip(scores, SCORE_MIN, SCORE_MAX, out=scores)
+        counts += np.bincount((scores.astype('intp') + offsets).ravel(), minlength=counts.size)
+    return counts.reshape(len(centre), width)
+
+
+def simulate(model, draws=DEFAULT_DRAWS, seed=0, workers=1):
+    """Counts of simulated passing scores per specialty of model and whole score."""
+    np = _numpy()
+    blocks = [slice(start, start + BLOCK_ROWS) for start in range(0, len(model['specialties']), BLOCK_ROWS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(blocks))
+    jobs = [(model['centre'][block], model['scale'][block], model['df'][block], draws, block_seed)
+            for block, block_seed in zip(blocks, seeds)]
+    if workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(simulate_block, *zip(*jobs)))
+    else:
+        counts = [simulate_block(*job) for job in jobs]
+    return np.concatenate(counts)
+
+
+def chances(counts, scores):
+    """specialty x applicant score array: P(passing score < score) + P(passing score == score) / 2."""
+    np = _numpy()
+    positions = np.clip(np.asarray(scores, dtype='intp') - SCORE_MIN, 0, counts.shape[1] - 1)
+    below = np.cumsum(counts, axis=1) - counts
+    return (below[:, positions] + counts[:, positions] / 2) / counts.sum(axis=1, keepdims=True)
+
+
+def admission_chances(rows, scores, year=None, draws=DEFAULT_DRAWS, seed=0, workers=1):
+    """One row per specialty and applicant score with budget_chance and paid_chance.
+
+    A chance is None when the specialty has no passing score for that funding.
+    """
+    np = _numpy()
+    result = {}
+    for index, (funding, model) in enumerate(score_models(rows, year).items()):
+        probabilities = chances(simulate(model, draws, [seed, index], workers), scores)
+        for specialty_id, places, row in zip(model['specialties'], model['places'], probabilities):
+            for score, chance in zip(scores, row.tolist()):
+                record = result.setdefault((specialty_id, score), {
+                    'specialty_id': specialty_id, 'year': model['year'], 'score': score,
+                    'budget_chance': None, 'paid_chance': None,
+                    'budget_places': None, 'paid_places': None,
+                })
+                record[f'{funding}_chance'] = round(chance, 4)
+                record[f'{funding}_places'] = None if np.isnan(places) else int(places)
+    return [result[key] for key in sorted(result)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate an applicant's admission chances per specialty")
+    parser.add_argument('scores', nargs='+', type=int, metavar='SCORE', help="applicant's total score(s)")
+    add_input_arguments(parser, 'simulate')
+    parser.add_argument('--year', type=int, help="admission year (default: the year after the data)")
+    parser.add_argument('--draws', type=int, default=DEFAULT_DRAWS,
+                        help=f"simulated years per specialty (default: {DEFAULT_DRAWS})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1, help="simulation processes (default: 1)")
+    add_output_argument(parser, 'admission_chances.json', 'chances')
+    args = parser.parse_args()
+    if args.from_db and not args.dsn:
+        parser.error("no database: pass --dsn or set DATABASE_URL")
+    if args.draws < 1:
+        parser.error("--draws must be positive")
+
+    rows = rows_from_args(args)
+    if not rows:
+        print("no admission_stats rows to simulate", file=sys.stderr)
+        return 1
+    _numpy()
+    started = time.perf_counter()
+    try:
+        result = admission_chances(rows, args.scores, args.year, args.draws, args.seed, args.workers)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    series = sum(record[f'{funding}_chance'] is not None for record in result for funding in FUNDINGS)
+    print(f"Simulated {series // len(args.scores)} series x {args.draws} draws in {elapsed:.2f} s", file=sys.stderr)
+
+    write_output(result, args.output)
+    for score in args.scores:
+        likely = {funding: sum((record[f'{funding}_chance'] or 0) >= 0.5 for record in result
+                               if record['score'] == score) for funding in FUNDINGS}
+        counts = ', '.join(f'{funding} {count}' for funding, count in likely.items())
+        print(f"{score}: an even chance or better at {counts} specialties")
+    print(f"{len(result)} rows, {result[0]['year']} -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
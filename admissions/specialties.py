@@ -0,0 +1,241 @@
+"""Resolve specialty names from the PDFs to catalog IDs (bsu-s1, bntu-s12, ...).
+
+    python -m admissions.specialties [bsu_admission_all_data.json]
+
+prints a confidence report for every distinct name in an output file.
+"""
+import argparse
+import os
+import re
+import sys
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG_SQL = os.path.join(ROOT, 'supabase-all-data.sql')
+ALIASES_JS = os.path.join(ROOT, 'scripts', 'generate_bsu_sql.js')
+
+# Candidates below this similarity are reported as unmatched.
+MIN_CONFIDENCE = 0.75
+# Confidence of a name that only matches once its qualifiers are dropped.
+QUALIFIED_CONFIDENCE = 0.9
+# Trigram candidates re-ranked by edit distance.
+CANDIDATES = 8
+
+SPECIALTY_ROW = re.compile(
+    r"^\('(?P<id>[a-z]+-s\d+)', '(?P<university>[a-z]+)', (?:NULL|'(?P<faculty>[^']*)'), "
+    r"(?:NULL|'(?P<institute>[^']*)'), "
+    r"'(?P<name>(?:[^']|'')*)', (?:NULL|'(?P<code>[^']*)')")
+ALIAS_ENTRY = re.compile(r"^\s*'(?P<name>(?:[^'\\]|\\.)*)':\s*'(?P<id>[a-z]+-s\d+)'")
+
+# Same-named specialties told apart by faculty: (name, faculty keyword, id).
+FACULTY_OVERRIDES = [
+    ('экология', 'сахаров', 'bsu-s89'),
+]
+
+# Latin letters that PDFs sometimes put into Cyrillic words.
+LOOKALIKES = str.maketrans('aceopxyk', 'асеорхук')
+
+
+def canonical(name):
+    """Lowercase, unify ё/dashes/lookalikes, drop hyphen line-break spaces."""
+    text = name.lower().replace('ё', 'е').replace('\n', ' ')
+    text = re.sub(r'^объединенный конкурс:\s*', '', text)
+    text = re.sub(r'[–—−]', '-', text)
+    text = ''.join(ch.translate(LOOKALIKES) if _next_to_cyrillic(text, i) else ch for i, ch in enumerate(text))
+    text = re.sub(r'(\w)- (\w)', r'\1-\2', text)
+    text = re.sub(r'\s*\(\s*', ' (', text)
+    text = re.sub(r'\s*\)', ')', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _next_to_cyrillic(text, i):
+    neighbours = text[max(i - 1, 0):i] + text[i + 1:i + 2]
+    return any('а' <= ch <= 'я' for ch in neighbours)
+
+
+def without_qualifiers(key):
+    """Yield key with qualifiers dropped one at a time: 'на сокращенный срок ...'
+    first, then trailing parentheses such as '(по направлениям)' or '(ФМО)'."""
+    text = re.sub(r'\s*\(?\s*\bна сокращенный срок.*$', '', key)
+    if text != key:
+        yield text
+    while True:
+        shorter = re.sub(r'\s*\([^()]*\)\s*$', '', text)
+        if shorter == text or not shorter:
+            return
+        text = shorter
+        yield text
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit=None):
+    """Levenshtein distance; stops early and returns limit + 1 once it is exceeded."""
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def load_catalog(path=CATALOG_SQL, university=None):
+    """[(id, university, name, code)] from the specialties INSERTs."""
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            match = SPECIALTY_ROW.match(line)
+            if match and (university is None or match['university'] == university):
+                entries.append((match['id'], match['university'], match['name'].replace("''", "'"), match['code']))
+    return entries
+
+
+def load_faculties(path=CATALOG_SQL, university=None):
+    """{specialty id: faculty id, or institute id for specialties of an institute}."""
+    faculties = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            match = SPECIALTY_ROW.match(line)
+            if match and (university is None or match['university'] == university):
+                faculties[match['id']] = match['faculty'] or match['institute']
+    return faculties
+
+
+def load_aliases(path=ALIASES_JS):
+    """{name: id} from the hand-kept specialtyMap; later keys win, as in JS."""
+    aliases = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            match = ALIAS_ENTRY.match(line)
+            if match:
+                aliases[match['name']] = match['id']
+    return aliases
+
+
+class SpecialtyIndex:
+    """Exact lookup on canonical names, then trigram candidates re-ranked by edit distance."""
+
+    def __init__(self, names):
+        """names: iterable of (name, specialty_id); several names may share an id."""
+        self.exact = {}
+        for name, specialty_id in names:
+            self.exact[canonical(name)] = specialty_id
+        self.keys = list(self.exact)
+        self.sizes = []
+        self.postings = {}
+        for position, key in enumerate(self.keys):
+            grams = trigrams(key)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+
+    @classmethod
+    def for_university(cls, university, catalog_path=CATALOG_SQL, aliases_path=ALIASES_JS):
+        names = [(name, specialty_id) for specialty_id, _, name, _ in load_catalog(catalog_path, university)]
+        prefix = f'{university}-'
+        if os.path.exists(aliases_path):
+            names += [(name, specialty_id) for name, specialty_id in load_aliases(aliases_path).items()
+                      if specialty_id.startswith(prefix)]
+        return cls(names)
+
+    def exact_match(self, name, faculty=None):
+        """(specialty_id, 'faculty' or 'exact') for a name known as it is, else (None, 'none')."""
+        key = canonical(name)
+        if faculty:
+            lowered = faculty.lower()
+            for override_name, keyword, specialty_id in FACULTY_OVERRIDES:
+                if key == override_name and keyword in lowered:
+                    return specialty_id, 'faculty'
+        if key in self.exact:
+            return self.exact[key], 'exact'
+        return None, 'none'
+
+    def match(self, name, faculty=None):
+        """(specialty_id or None, confidence 0..1, method)."""
+        specialty_id, method = self.exact_match(name, faculty)
+        if specialty_id:
+            return specialty_id, 1.0, method
+        key = canonical(name)
+        shorter = list(without_qualifiers(key))
+        for variant in shorter:
+            if variant in self.exact:
+                return self.exact[variant], QUALIFIED_CONFIDENCE, 'qualified'
+
+        best = self._fuzzy(key)
+        if best[1] < MIN_CONFIDENCE and shorter:
+            best = max(best, self._fuzzy(shorter[-1]), key=lambda result: result[1])
+        if best[1] < MIN_CONFIDENCE:
+            return None, best[1], 'none'
+        return best
+
+    def _fuzzy(self, key):
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        if not shared:
+            return None, 0.0, 'none'
+        # Dice coefficient on trigrams picks the few keys worth an edit distance.
+        ranked = sorted(shared.items(), key=lambda item: -2 * item[1] / (len(grams) + self.sizes[item[0]]))
+        best = (None, 0.0, 'none')
+        for position, _ in ranked[:CANDIDATES]:
+            candidate = self.keys[position]
+            longest = max(len(key), len(candidate))
+            limit = int(longest * (1 - MIN_CONFIDENCE))
+            distance = edit_distance(key, candidate, limit)
+            similarity = max(1 - distance / longest, 0.0)
+            if similarity > best[1]:
+                best = (self.exact[candidate], similarity, 'fuzzy')
+        return best
+
+
+def annotate(records, index):
+    """Add specialty_id to records in place; returns them."""
+    for record in records:
+        record['specialty_id'] = index.match(record['name'], record.get('faculty'))[0]
+    return records
+
+
+def confidence_report(records, index, out=sys.stdout):
+    """Print fuzzy and failed matches per distinct name; returns record counts per method."""
+    counts = Counter((record['name'], record.get('faculty') or '') for record in records)
+    methods = Counter()
+    lines = {}
+    for (name, faculty), count in counts.items():
+        specialty_id, confidence, method = index.match(name, faculty)
+        methods[method] += count
+        if method == 'fuzzy':
+            lines[name] = f"  fuzzy     {confidence:.2f} | {specialty_id:10} | {name[:70]}"
+        elif method == 'none':
+            lines[name] = f"  UNMATCHED {confidence:.2f} | {'-':10} | {name[:70]}"
+    for line in sorted(lines.values()):
+        print(line, file=out)
+    print(f"Records: {sum(methods.values())}, distinct names: {len({name for name, _ in counts})}", file=out)
+    for method in ('exact', 'faculty', 'qualified', 'fuzzy', 'none'):
+        print(f"  {method:9} {methods[method]}", file=out)
+    return methods
+
+
+def main():
+    from admissions.output import read_records
+
+    parser = argparse.ArgumentParser(description="Report how extracted specialty names resolve to catalog IDs")
+    parser.add_argument('path', nargs='?', default='bsu_admission_all_data.json')
+    parser.add_argument('--university', default='bsu')
+    args = parser.parse_args()
+    methods = confidence_report(read_records(args.path), SpecialtyIndex.for_university(args.university))
+    return 1 if methods['none'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Per-specialty trends across years, precomputed for dashboards (needs pandas).
+
+    python -m admissions.trends [--input bsu_admission_all_data.json] [--output admission_trends.json]
+    python -m admissions.trends --input bsu_admission_all_data.json --input bntu_admission_2022_data.json=bntu
+    python -m admissions.trends --from-db --load --dsn postgresql://...
+
+Works on admission_stats rows (see loader.stats_rows), which already map every
+year's columns onto min_score / paid_min_score. Rows are laid out on a full
+specialty x year grid, so deltas and moving averages compare calendar years and
+a missing year shows up as a gap instead of comparing 2022 with 2024. One row
+per specialty and year comes out, ready for public.admission_trends.
+"""
+import argparse
+import sys
+
+from admissions.loader import COLUMNS, KEY, add_input_arguments, connect, load, rows_from_args
+from admissions.output import add_output_argument, write_output
+
+TRENDS_TABLE = 'public.admission_trends'
+TREND_COLUMNS = (
+    'faculty_id',
+    'min_score',
+    'paid_min_score',
+    'min_score_delta',
+    'paid_min_score_delta',
+    'min_score_avg3',
+    'faculty_percentile',
+    'budget_paid_spread',
+)
+# Years averaged by min_score_avg3, the current one included.
+MOVING_WINDOW = 3
+
+
+def _pandas():
+    try:
+        import pandas
+    except ImportError:
+        raise SystemExit("trends need pandas: pip install pandas") from None
+    return pandas
+
+
+def trends(rows, faculties):
+    """Frame of TREND_COLUMNS per (specialty_id, year) present in rows.
+
+    faculties maps specialty ids to faculty ids (specialties.load_faculties);
+    percentiles rank min_score among the faculty's specialties of that year.
+    """
+    pd = _pandas()
+    stats = pd.DataFrame(rows, columns=COLUMNS)
+    for field in ('min_score', 'paid_min_score'):
+        stats[field] = stats[field].astype('float64')
+    years = range(int(stats['year'].min()), int(stats['year'].max()) + 1)
+    grid = pd.MultiIndex.from_product([sorted(stats['specialty_id'].unique()), years], names=KEY)
+    full = stats.set_index(list(KEY))[['min_score', 'paid_min_score']].reindex(grid)
+
+    by_specialty = full.groupby(level='specialty_id')
+    full['min_score_delta'] = by_specialty['min_score'].diff()
+    full['paid_min_score_delta'] = by_specialty['paid_min_score'].diff()
+    full['min_score_avg3'] = (by_specialty['min_score'].rolling(MOVING_WINDOW, min_periods=1).mean()
+                              .droplevel(0))
+    full['budget_paid_spread'] = full['min_score'] - full['paid_min_score']
+
+    result = full.loc[pd.MultiIndex.from_frame(stats[list(KEY)])].reset_index()
+    result['faculty_id'] = result['specialty_id'].map(faculties)
+    result['faculty_percentile'] = result.groupby(['faculty_id', 'year'])['min_score'].rank(pct=True)
+    return result[list(KEY + TREND_COLUMNS)].sort_values(list(KEY)).reset_index(drop=True)
+
+
+def to_rows(frame):
+    """Plain dicts with None for gaps; percentiles keep 4 decimals, scores 2."""
+    rows = []
+    for record in frame.astype(object).where(frame.notna(), None).to_dict('records'):
+        for field, value in record.items():
+            if isinstance(value, float):
+                record[field] = round(value, 4 if field == 'faculty_percentile' else 2)
+        record['year'] = int(record['year'])
+        rows.append(record)
+    return rows
+
+
+def main():
+    from admissions.specialties import load_faculties
+
+    parser = argparse.ArgumentParser(description="Precompute per-specialty admission trends")
+    add_input_arguments(parser, 'aggregate')
+    add_output_argument(parser, 'admission_trends.json', 'specialty-year trends')
+    parser.add_argument('--load', action='store_true', help=f"upsert the result into {TRENDS_TABLE}")
+    args = parser.parse_args()
+    if (args.from_db or args.load) and not args.dsn:
+        parser.error("no database: pass --dsn or set DATABASE_URL")
+
+    conn = connect(args.dsn) if args.from_db or args.load else None
+    try:
+        result = to_rows(trends(rows_from_args(args, conn), load_faculties()))
+        write_output(result, args.output)
+        print(f"{len(result)} specialty-years -> {args.output}")
+
+        if args.load:
+            written = load(conn, result, TRENDS_TABLE, KEY, TREND_COLUMNS)
+            conn.commit()
+            print(f"Written to {TRENDS_TABLE}: {written}")
+    finally:
+        if conn is not None:
+            conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
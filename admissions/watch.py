@@ -0,0 +1,199 @@
+"""Keep the merged dataset up to date while result PDFs land in graduates/.
+
+    python -m admissions.watch                          # all default extractors
+    python -m admissions.watch --workers 4 --output admission_data.json
+
+Every --interval seconds the input globs of the registry (registry.py) are
+polled; each extractor reads the newest file its glob matches. A new or
+modified PDF is extracted once its size and mtime have been stable for
+--debounce seconds, so a file still being copied is left alone. Only that
+file is extracted, with the extractor whose glob it matches, on a process
+pool that lives as long as the watcher. Its records replace the extractor's
+records from before, unless the extraction fails, and the output file is
+rewritten atomically, in the same order python -m admissions writes it. A
+re-published copy dropped next to the original thus replaces the original's
+records once it has settled. The page cache is on by default, so the startup
+pass over files extracted before only reads cached pages.
+"""
+import argparse
+import os
+import sys
+import time
+
+from admissions.cache import add_cache_arguments, cache_from_args
+from admissions.cli import DEFAULT_OUTPUT, extract, with_university
+from admissions.output import FORMATS, RecordWriter
+from admissions.registry import EXTRACTORS, discover, select
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_DEBOUNCE = 2.0
+
+
+class _Collected(list):
+    def write(self, records):
+        self.extend(records)
+
+
+def snapshot(jobs):
+    """{path: (size, mtime_ns)} of the input files among discovered jobs."""
+    signatures = {}
+    for _, path in jobs:
+        if path is None:
+            continue
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signatures[path] = (stat.st_size, stat.st_mtime_ns)
+    return signatures
+
+
+class Watcher:
+    """Records per extractor plus what is needed to tell which input files changed.
+
+    poll() extracts the files that settled since the last call and rewrites
+    output when anything changed. A file counts as stable since its mtime, so
+    files that were already in place at startup are extracted on the first poll.
+    """
+
+    def __init__(self, extractors, root='.', output=DEFAULT_OUTPUT, format='json', workers=1, cache=None,
+                 debounce=DEFAULT_DEBOUNCE, specialty_ids=False):
+        self.extractors = extractors
+        self.root = root
+        self.output = output
+        self.format = format
+        self.workers = workers
+        self.cache = cache
+        self.debounce = debounce
+        self.specialty_ids = specialty_ids
+        self.records = {}
+        self.extracted = {}
+        self.pending = {}
+        self.written = False
+        self.pool = None
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self.pool = ProcessPoolExecutor(max_workers=workers)
+        for extractor in extractors:
+            if extractor['inputs'] is None:
+                self.records[extractor['name']] = with_university(extractor['records'](), extractor['university'])
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    def settled(self, signatures, now):
+        """Changed paths whose signature has not moved for debounce seconds."""
+        ready = []
+        for path, signature in signatures.items():
+            if self.extracted.get(path) == signature:
+                self.pending.pop(path, None)
+                continue
+            seen = self.pending.get(path)
+            if seen is None or seen[0] != signature:
+                age = max(0.0, time.time() - signature[1] / 1e9)
+                seen = self.pending[path] = (signature, now - age)
+            if now - seen[1] >= self.debounce:
+                ready.append(path)
+        return ready
+
+    def extract(self, extractor, path):
+        records = _Collected()
+        extract([(extractor, path)], records, workers=self.workers, cache=self.cache,
+                specialty_ids=self.specialty_ids, pool=self.pool)
+        return records
+
+    def poll(self, now=None):
+        """Extract settled files and drop deleted ones; returns (extracted, removed) paths.
+
+        Removed paths are those no longer read: deleted, or passed over for a
+        newer copy.
+        """
+        now = time.monotonic() if now is None else now
+        jobs = discover(self.extractors, self.root)
+        owners = {path: extractor for extractor, path in jobs if path is not None}
+        signatures = snapshot(jobs)
+        ready = self.settled(signatures, now)
+        removed = [path for path in self.extracted if path not in signatures]
+        for path in removed:
+            del self.extracted[path]
+        matched = {extractor['name'] for extractor, _ in jobs}
+        for name in [name for name in self.records if name not in matched]:
+            del self.records[name]
+
+        for path in ready:
+            name = owners[path]['name']
+            started = time.perf_counter()
+            try:
+                self.records[name] = self.extract(owners[path], path)
+            except Exception as e:
+                # Not retried until the file changes again; a half-copied or
+                # broken PDF leaves the records of the last good file.
+                kept = len(self.records.get(name, []))
+                print(f"error: {path}: {e} (keeping {kept} records from before)", file=sys.stderr)
+            else:
+                elapsed = time.perf_counter() - started
+                print(f"{path}: {len(self.records[name])} records ({name}, {elapsed:.1f}s)")
+            self.extracted[path] = self.pending.pop(path)[0]
+
+        if ready or removed or not self.written:
+            self.write(jobs)
+        return ready, removed
+
+    def write(self, jobs):
+        tmp_path = f'{self.output}.{os.getpid()}.tmp'
+        with RecordWriter(tmp_path, self.format) as writer:
+            for extractor, _ in jobs:
+                writer.write(self.records.get(extractor['name'], []))
+        os.replace(tmp_path, self.output)
+        self.written = True
+        print(f"{writer.count} records -> {self.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extract result PDFs as they are added or changed")
+    parser.add_argument('--extractor', action='append', choices=sorted(EXTRACTORS), metavar='NAME',
+                        help="watch only these extractors, opt-in ones included (repeatable)")
+    parser.add_argument('--university', action='append', help="only these universities (repeatable)")
+    parser.add_argument('--year', action='append', type=int, help="only these years (repeatable)")
+    parser.add_argument('--input-dir', default='.', help="directory the input globs are relative to")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes kept for table detection (default: 1, serial)")
+    parser.add_argument('--format', choices=FORMATS, default='json')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--specialty-ids', action='store_true', help="add specialty_id to every record")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help=f"seconds between polls (default: {DEFAULT_INTERVAL})")
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help=f"seconds a file must stay unchanged before it is extracted "
+                             f"(default: {DEFAULT_DEBOUNCE})")
+    parser.add_argument('--once', action='store_true', help="extract what has settled, write, and exit")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    # Progress lines show up in a redirected log as they happen.
+    sys.stdout.reconfigure(line_buffering=True)
+
+    extractors = select(args.extractor, args.university, args.year)
+    if not extractors:
+        parser.error("no extractor matches the given filters")
+    watcher = Watcher(extractors, args.input_dir, args.output, args.format, args.workers,
+                      cache_from_args(args), args.debounce, args.specialty_ids)
+    print(f"Watching {', '.join(extractor['name'] for extractor in extractors)} under {args.input_dir}")
+    try:
+        while True:
+            try:
+                watcher.poll()
+            except ValueError as e:
+                print(f"error: {e}", file=sys.stderr)
+            if args.once:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
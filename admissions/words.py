@@ -0,0 +1,199 @@
+"""Text-layer table engine: table rows rebuilt from positioned words.
+
+pdfplumber's table finder needs ruling lines (or many aligned text edges) and
+spends most of its time on them and on turning every layout object into a
+dict. This engine reads only the characters pdfminer lays out (page_words)
+and groups them by geometry:
+
+  words    characters of a line closer than x_tolerance, spaces excluded
+  lines    words sorted by top; a new line once top moves past row_tolerance
+  phrases  words of a line closer than column_gap form one cell candidate
+  columns  x ranges covered by the phrases of lines with two or more of them,
+           found by bucketing phrase extents per point; uncovered runs
+           separate columns. Single-phrase lines (titles, wrapped text) are
+           placed into these columns but do not shape them
+  rows     a line without numeric cells starting within continuation x its
+           height of the line above continues that row (a wrapped cell) and
+           is merged into it. Every record row has a number or a score, so
+           single-spaced tables, whose gaps are always that small, keep their
+           rows apart
+
+The result has the shape of extract_tables() output (one table per page, cells
+joined with '\\n' like pdfplumber's multi-line cells), so layouts, the page
+cache and everything after them work unchanged. A layout selects the engine
+with table_settings={'engine': 'words', ...} (see layouts.WORD_COLUMNS). Columns
+are found per page, so a column that is empty on a whole page disappears from
+it; 'column_edges' (x positions between columns) pins them instead.
+"""
+from bisect import bisect_right
+
+ENGINE = 'words'
+# Page cache extractor id of word-engine tables; bump the version whenever
+# page_words, the grouping or word_tables change what a page comes out as.
+WORDS_EXTRACTOR = 'admissions.words:2'
+DEFAULT_SETTINGS = {
+    'row_tolerance': 3,
+    'column_gap': 6,
+    'continuation': 0.5,
+    'column_edges': None,
+    'x_tolerance': 3,
+}
+
+
+def is_word_engine(table_settings):
+    return bool(table_settings) and table_settings.get('engine') == ENGINE
+
+
+def extract_tables(page, table_settings=None):
+    """page.extract_tables(table_settings), or the word engine when the settings ask for it."""
+    if is_word_engine(table_settings):
+        settings = dict(DEFAULT_SETTINGS, **table_settings)
+        return word_tables(page_words(page, settings['x_tolerance'], settings['row_tolerance']), settings)
+    return page.extract_tables(table_settings)
+
+
+def page_words(page, x_tolerance=3, y_tolerance=3):
+    """Words of page (or of its crop) as extract_words() would give them: text, x0, x1, top, bottom.
+
+    Built from pdfminer's LTChar objects directly; page.extract_words() first
+    converts every object on the page into a dict, which takes longer than
+    the whole grouping here.
+    """
+    from pdfminer.layout import LTChar, LTContainer
+
+    root = page.root_page
+    height, mediabox_top = root.height, root.mediabox[1]
+    left, top, right, bottom = page.bbox
+    chars = []
+    stack = [page.layout]
+    while stack:
+        for obj in stack.pop():
+            if isinstance(obj, LTChar):
+                char_top = height - obj.y1 + mediabox_top
+                char_bottom = height - obj.y0 + mediabox_top
+                if left <= (obj.x0 + obj.x1) / 2 <= right and top <= (char_top + char_bottom) / 2 <= bottom:
+                    chars.append((char_top, obj.x0, obj.x1, char_bottom, obj.get_text()))
+            elif isinstance(obj, LTContainer):
+                stack.append(obj)
+
+    words = []
+    lines = []
+    for char in sorted(chars):
+        if lines and char[0] - lines[-1][0][0] <= y_tolerance:
+            lines[-1].append(char)
+        else:
+            lines.append([char])
+    for line in lines:
+        word = None
+        for char_top, x0, x1, char_bottom, text in sorted(line, key=lambda char: char[1]):
+            if text.isspace():
+                word = None
+            elif word is not None and x0 - word['x1'] <= x_tolerance:
+                word['text'] += text
+                word['x1'] = x1
+                word['top'] = min(word['top'], char_top)
+                word['bottom'] = max(word['bottom'], char_bottom)
+            else:
+                word = {'text': text, 'x0': x0, 'x1': x1, 'top': char_top, 'bottom': char_bottom}
+                words.append(word)
+    return words
+
+
+def group_lines(words, row_tolerance):
+    """[{'top', 'bottom', 'words'}] in reading order, words sorted by x0."""
+    lines = []
+    for word in sorted(words, key=lambda word: (word['top'], word['x0'])):
+        if lines and word['top'] - lines[-1]['top'] <= row_tolerance:
+            line = lines[-1]
+            line['bottom'] = max(line['bottom'], word['bottom'])
+        else:
+            line = {'top': word['top'], 'bottom': word['bottom'], 'words': []}
+            lines.append(line)
+        line['words'].append(word)
+    for line in lines:
+        line['words'].sort(key=lambda word: word['x0'])
+    return lines
+
+
+def phrases(line, column_gap):
+    """[(x0, x1, text)] of a line's words, neighbours closer than column_gap merged."""
+    merged = []
+    for word in line['words']:
+        if merged and word['x0'] - merged[-1][1] < column_gap:
+            x0, _, text = merged[-1]
+            merged[-1] = (x0, word['x1'], f"{text} {word['text']}")
+        else:
+            merged.append((word['x0'], word['x1'], word['text']))
+    return merged
+
+
+def column_spans(line_phrases, column_edges=None):
+    """[(x0, x1)] of the columns: runs of 1-point buckets covered by a multi-phrase line."""
+    if column_edges:
+        edges = [float('-inf')] + sorted(column_edges) + [float('inf')]
+        return list(zip(edges, edges[1:]))
+    rows = [cells for cells in line_phrases if len(cells) > 1] or line_phrases
+    if not rows:
+        return []
+    width = int(max(x1 for cells in rows for _, x1, _ in cells)) + 2
+    coverage = [0] * (width + 1)
+    for cells in rows:
+        for x0, x1, _ in cells:
+            coverage[max(int(x0), 0)] += 1
+            coverage[int(x1) + 1] -= 1
+    spans = []
+    covered = 0
+    start = None
+    for x in range(width + 1):
+        covered += coverage[x]
+        if covered and start is None:
+            start = x
+        elif not covered and start is not None:
+            spans.append((start, x))
+            start = None
+    return spans
+
+
+def _column(starts, spans, x0, x1):
+    """Index of the span holding the phrase centre, else the one it overlaps most."""
+    centre = (x0 + x1) / 2
+    index = bisect_right(starts, centre) - 1
+    if index >= 0 and centre < spans[index][1]:
+        return index
+    overlaps = [min(x1, end) - max(x0, start) for start, end in spans]
+    return max(range(len(spans)), key=overlaps.__getitem__)
+
+
+def _numeric(cell):
+    """'312', '312 (к)': cells holding a number or a score, not wrapped text."""
+    parts = cell.split()
+    return bool(parts) and parts[0].isdigit()
+
+
+def word_tables(words, table_settings=None):
+    """extract_tables()-shaped output ([rows]) for the words of one page."""
+    settings = dict(DEFAULT_SETTINGS, **{key: value for key, value in (table_settings or {}).items()
+                                         if key != 'engine'})
+    lines = group_lines(words, settings['row_tolerance'])
+    if not lines:
+        return []
+    line_phrases = [phrases(line, settings['column_gap']) for line in lines]
+    spans = column_spans(line_phrases, settings['column_edges'])
+    starts = [start for start, _ in spans]
+
+    rows = []
+    previous = None
+    for line, cells in zip(lines, line_phrases):
+        row = [''] * len(spans)
+        for x0, x1, text in cells:
+            index = _column(starts, spans, x0, x1)
+            row[index] = f'{row[index]} {text}' if row[index] else text
+        height = line['bottom'] - line['top']
+        wrapped = line['top'] - previous['bottom'] < settings['continuation'] * height if previous else False
+        if wrapped and not any(map(_numeric, row)):
+            rows[-1] = [f'{above}\n{below}' if above and below else above or below
+                        for above, below in zip(rows[-1], row)]
+        else:
+            rows.append(row)
+        previous = line
+    return [rows]
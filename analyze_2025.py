@@ -1,15 +1,31 @@
-import pdfplumber
-
-print("Analyzing БГУ2025.pdf structure...")
-with pdfplumber.open("graduates/БГУ2025.pdf") as pdf:
-    for page_num, page in enumerate(pdf.pages):
-        print(f"\n{'='*80}")
-        print(f"PAGE {page_num + 1}")
-        print('='*80)
-        tables = page.extract_tables()
-        for i, table in enumerate(tables):
-            print(f"\nTable {i+1}:")
-            for row in table[:10]:
-                print(f"  {row}")
-            if len(table) > 10:
-                print(f"  ... ({len(table)} total rows)")
+from admissions.layouts import LAYOUTS
+from admissions.regions import crop_to_region, detect_region, extraction_profile
+from admissions.words import extract_tables
+
+PDF_2025 = "graduates/БГУ2025.pdf"
+
+def main():
+    import pdfplumber
+
+    _, table_settings, region = extraction_profile(LAYOUTS['bsu-2025'])
+
+    print("Analyzing БГУ2025.pdf structure...")
+    print(f"table_settings: {table_settings}")
+    with pdfplumber.open(PDF_2025) as pdf:
+        if region == 'auto':
+            region = detect_region(pdf.pages, table_settings)
+        print(f"table region: {region}")
+        for page_num, page in enumerate(pdf.pages):
+            print(f"\n{'='*80}")
+            print(f"PAGE {page_num + 1}")
+            print('='*80)
+            tables = extract_tables(crop_to_region(page, region), table_settings)
+            for i, table in enumerate(tables):
+                print(f"\nTable {i+1}:")
+                for row in table[:10]:
+                    print(f"  {row}")
+                if len(table) > 10:
+                    print(f"  ... ({len(table)} total rows)")
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,11 @@
-import pdfplumber
-import json
-
 def extract_2025(pdf_path):
+    import pdfplumber
+
     results = []
     with pdfplumber.open(pdf_path) as pdf:
         for page in pdf.pages:
             tables = page.extract_tables()
+            page.close()
             for table in tables:
                 for row in table:
                     if not row:
@@ -159,14 +159,18 @@ def clean_2025_data():
     ]
     return manual_data
 
-print("БГУ 2025 (бюджет | платно)")
-print("=" * 100)
-print(f"{'Бюдж':>5} | {'Плат':>5} | Специальность")
-print("-" * 100)
+def main():
+    print("БГУ 2025 (бюджет | платно)")
+    print("=" * 100)
+    print(f"{'Бюдж':>5} | {'Плат':>5} | Специальность")
+    print("-" * 100)
+
+    data_2025 = clean_2025_data()
+    for item in data_2025:
+        budget = f"{item['score_budget']}" if item['score_budget'] else "-"
+        paid = f"{item['score_paid']}" if item['score_paid'] else "-"
+        print(f"{budget:>5} | {paid:>5} | {item['name']}")
+    print(f"\nИтого: {len(data_2025)} специальностей")
 
-data_2025 = clean_2025_data()
-for item in data_2025:
-    budget = f"{item['score_budget']}" if item['score_budget'] else "-"
-    paid = f"{item['score_paid']}" if item['score_paid'] else "-"
-    print(f"{budget:>5} | {paid:>5} | {item['name']}")
-print(f"\nИтого: {len(data_2025)} специальностей")
+if __name__ == '__main__':
+    main()
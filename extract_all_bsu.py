@@ -1,283 +1,198 @@
-import pdfplumber
-import json
-import re
-
-def extract_2022_budget(pdf_path):
-    results = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            tables = page.extract_tables()
-            for table in tables:
-                for row in table:
-                    if row and row[0] and str(row[0]).strip().isdigit():
-                        num = int(row[0])
-                        name = row[1].replace('\n', ' ').strip() if row[1] else ''
-                        code = row[2].strip() if row[2] else ''
-                        score_budget = int(row[3]) if row[3] and str(row[3]).strip().isdigit() else None
-                        avg_budget = int(row[5]) if len(row) > 5 and row[5] and str(row[5]).strip().isdigit() else None
-                        
-                        if name and code:
-                            results.append({
-                                'year': 2022,
-                                'type': 'budget',
-                                'num': num,
-                                'name': name,
-                                'code': code,
-                                'score_budget': score_budget,
-                                'avg_budget': avg_budget
-                            })
-    return results
-
-def extract_2023_budget(pdf_path):
-    results = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            tables = page.extract_tables()
-            for table in tables:
-                for row in table:
-                    if row and row[0] and str(row[0]).replace('\n', '').strip().isdigit():
-                        num_str = str(row[0]).replace('\n', '').strip()
-                        num = int(num_str.split()[0]) if num_str else 0
-                        faculty = row[1].replace('\n', ' ').strip() if row[1] else ''
-                        specialty = row[2].replace('\n', ' ').strip() if row[2] else ''
-                        places = row[3] if row[3] else ''
-                        score = row[4] if row[4] else ''
-                        
-                        if specialty and specialty not in ['Название специальности', 'объединенный конкурс:']:
-                            results.append({
-                                'year': 2023,
-                                'type': 'budget',
-                                'num': num,
-                                'faculty': faculty,
-                                'name': specialty,
-                                'places_budget': int(places) if places and str(places).isdigit() else None,
-                                'score_budget': int(score) if score and str(score).isdigit() else None
-                            })
-    return results
-
-def extract_2023_paid(pdf_path):
-    results = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            tables = page.extract_tables()
-            for table in tables:
-                for row in table:
-                    if row and row[0] and str(row[0]).replace('\n', '').strip().isdigit():
-                        num_str = str(row[0]).replace('\n', '').strip()
-                        num = int(num_str.split()[0]) if num_str else 0
-                        faculty = row[1].replace('\n', ' ').strip() if row[1] else ''
-                        specialty = row[2].replace('\n', ' ').strip() if row[2] else ''
-                        score_budget = row[3] if row[3] else ''
-                        score_paid = row[4] if row[4] else ''
-                        
-                        if specialty and specialty not in ['Название специальности', 'объединенный конкурс:']:
-                            def parse_score(s):
-                                if not s:
-                                    return None
-                                s = str(s).strip()
-                                if s.isdigit():
-                                    return int(s)
-                                parts = s.split()
-                                if parts and parts[0].isdigit():
-                                    return int(parts[0])
-                                return None
-                            
-                            results.append({
-                                'year': 2023,
-                                'type': 'paid',
-                                'num': num,
-                                'faculty': faculty,
-                                'name': specialty,
-                                'score_budget': parse_score(score_budget),
-                                'score_paid': parse_score(score_paid)
-                            })
-    return results
-
-def extract_2024_2025(pdf_path, year):
-    results = []
-    current_faculty = ''
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            tables = page.extract_tables()
-            for table in tables:
-                for row in table:
-                    if not row or len(row) < 4:
-                        continue
-                    
-                    faculty = row[0].replace('\n', ' ').strip() if row[0] else ''
-                    specialty = row[1].replace('\n', ' ').strip() if len(row) > 1 and row[1] else ''
-                    score_budget = row[2] if len(row) > 2 else ''
-                    score_paid = row[3] if len(row) > 3 else ''
-                    
-                    if 'Факультет' in faculty or 'Институт' in faculty or 'Совместный' in faculty or 'Международный' in faculty:
-                        current_faculty = faculty
-                    
-                    if specialty and specialty not in ['Название специальности', 'объединенный конкурс:']:
-                        def parse_score(s):
-                            if not s:
-                                return None
-                            s = str(s).strip()
-                            if s.isdigit():
-                                return int(s)
-                            return None
-                        
-                        results.append({
-                            'year': year,
-                            'type': 'both',
-                            'faculty': current_faculty,
-                            'name': specialty,
-                            'score_budget': parse_score(score_budget),
-                            'score_paid': parse_score(score_paid)
-                        })
-    return results
-
-def get_2025_manual_data():
-    return [
-        {'year': 2025, 'type': 'both', 'name': 'математика и компьютерные науки', 'score_budget': 360, 'score_paid': 319},
-        {'year': 2025, 'type': 'both', 'name': 'математика', 'score_budget': 262, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'компьютерная математика и системный анализ', 'score_budget': 364, 'score_paid': 333},
-        {'year': 2025, 'type': 'both', 'name': 'механика и математическое моделирование', 'score_budget': 354, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'информатика', 'score_budget': 387, 'score_paid': 358},
-        {'year': 2025, 'type': 'both', 'name': 'кибербезопасность', 'score_budget': 378, 'score_paid': 341},
-        {'year': 2025, 'type': 'both', 'name': 'прикладная математика', 'score_budget': 371, 'score_paid': 358},
-        {'year': 2025, 'type': 'both', 'name': 'прикладная информатика', 'score_budget': 391, 'score_paid': 359},
-        {'year': 2025, 'type': 'both', 'name': 'механика и математическое моделирование (совместный институт БГУ и ДПУ)', 'score_budget': 367, 'score_paid': 317},
-        {'year': 2025, 'type': 'both', 'name': 'интеллектуальная электроника', 'score_budget': 351, 'score_paid': 313},
-        {'year': 2025, 'type': 'both', 'name': 'прикладная информатика (ФРКТ)', 'score_budget': 360, 'score_paid': 309},
-        {'year': 2025, 'type': 'both', 'name': 'радиофизика и информационные технологии', 'score_budget': 353, 'score_paid': 322},
-        {'year': 2025, 'type': 'both', 'name': 'прикладная физика', 'score_budget': 346, 'score_paid': 308},
-        {'year': 2025, 'type': 'both', 'name': 'компьютерная физика', 'score_budget': 341, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'фундаментальная физика', 'score_budget': 351, 'score_paid': 322},
-        {'year': 2025, 'type': 'both', 'name': 'физика', 'score_budget': 329, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'ядерные физика и технологии', 'score_budget': 337, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'прикладная физика (совместный институт БГУ-ДПУ)', 'score_budget': 371, 'score_paid': 302},
-        {'year': 2025, 'type': 'both', 'name': 'медицинская физика', 'score_budget': 271, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'ядерная и радиационная безопасность', 'score_budget': 272, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'биология', 'score_budget': 326, 'score_paid': 290},
-        {'year': 2025, 'type': 'both', 'name': 'микробиология', 'score_budget': 335, 'score_paid': 304},
-        {'year': 2025, 'type': 'both', 'name': 'биохимия', 'score_budget': 355, 'score_paid': 313},
-        {'year': 2025, 'type': 'both', 'name': 'биоинженерия и биоинформатика', 'score_budget': 352, 'score_paid': 325},
-        {'year': 2025, 'type': 'both', 'name': 'биотехнология', 'score_budget': 354, 'score_paid': 320},
-        {'year': 2025, 'type': 'both', 'name': 'фундаментальная и прикладная биотехнология', 'score_budget': 332, 'score_paid': 314},
-        {'year': 2025, 'type': 'both', 'name': 'экология', 'score_budget': 314, 'score_paid': 304},
-        {'year': 2025, 'type': 'both', 'name': 'география', 'score_budget': 347, 'score_paid': 295},
-        {'year': 2025, 'type': 'both', 'name': 'гидрометеорология', 'score_budget': 327, 'score_paid': 291},
-        {'year': 2025, 'type': 'both', 'name': 'космоаэрокартография и геодезия', 'score_budget': 316, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'геоэкология', 'score_budget': 351, 'score_paid': 293},
-        {'year': 2025, 'type': 'both', 'name': 'геоинформационные системы', 'score_budget': 309, 'score_paid': 292},
-        {'year': 2025, 'type': 'both', 'name': 'геотехнологии туризма и экскурсионная деятельность', 'score_budget': 313, 'score_paid': 293},
-        {'year': 2025, 'type': 'both', 'name': 'страноведение и переводческая деятельность', 'score_budget': 331, 'score_paid': 296},
-        {'year': 2025, 'type': 'both', 'name': 'геология', 'score_budget': 229, 'score_paid': 209},
-        {'year': 2025, 'type': 'both', 'name': 'дизайн предметно-пространственной среды', 'score_budget': 234, 'score_paid': 215},
-        {'year': 2025, 'type': 'both', 'name': 'дизайн костюма и текстиля', 'score_budget': 254, 'score_paid': 220},
-        {'year': 2025, 'type': 'both', 'name': 'графический дизайн и мультимедиадизайн (сокращенный срок обучения)', 'score_budget': 251, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'компьютерное моделирование и разработка веб-приложений', 'score_budget': 342, 'score_paid': 301},
-        {'year': 2025, 'type': 'both', 'name': 'социально-культурный менеджмент и коммуникации', 'score_budget': 366, 'score_paid': 342},
-        {'year': 2025, 'type': 'both', 'name': 'современные иностранные языки', 'score_budget': 350, 'score_paid': 293},
-        {'year': 2025, 'type': 'both', 'name': 'переводческое дело', 'score_budget': 377, 'score_paid': 297},
-        {'year': 2025, 'type': 'both', 'name': 'теология', 'score_budget': 288, 'score_paid': 313},
-        {'year': 2025, 'type': 'both', 'name': 'архивное дело', 'score_budget': 315, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'мировая экономика (совместный институт БГУ и ДПУ)', 'score_budget': 322, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'история', 'score_budget': 347, 'score_paid': 296},
-        {'year': 2025, 'type': 'both', 'name': 'регионоведение', 'score_budget': 374, 'score_paid': 301},
-        {'year': 2025, 'type': 'both', 'name': 'музейное дело и охрана историко-культурного наследия', 'score_budget': 324, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'журналистика', 'score_budget': 341, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'информация и коммуникация', 'score_budget': 362, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'востоковедение', 'score_budget': 388, 'score_paid': 340},
-        {'year': 2025, 'type': 'both', 'name': 'международное право', 'score_budget': 398, 'score_paid': 353},
-        {'year': 2025, 'type': 'both', 'name': 'международные отношения', 'score_budget': 395, 'score_paid': 358},
-        {'year': 2025, 'type': 'both', 'name': 'менеджмент (ФМО)', 'score_budget': 396, 'score_paid': 329},
-        {'year': 2025, 'type': 'both', 'name': 'мировая экономика', 'score_budget': 398, 'score_paid': 348},
-        {'year': 2025, 'type': 'both', 'name': 'международная конфликтология', 'score_budget': 394, 'score_paid': 344},
-        {'year': 2025, 'type': 'both', 'name': 'международная логистика', 'score_budget': 393, 'score_paid': 316},
-        {'year': 2025, 'type': 'both', 'name': 'таможенное дело', 'score_budget': 387, 'score_paid': 342},
-        {'year': 2025, 'type': 'both', 'name': 'экономическая безопасность (ФМО)', 'score_budget': 377, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'менеджмент (ЭФ)', 'score_budget': 373, 'score_paid': 344},
-        {'year': 2025, 'type': 'both', 'name': 'финансы и кредит', 'score_budget': 382, 'score_paid': 357},
-        {'year': 2025, 'type': 'both', 'name': 'экономика', 'score_budget': 368, 'score_paid': 347},
-        {'year': 2025, 'type': 'both', 'name': 'экономическая информатика', 'score_budget': 368, 'score_paid': 332},
-        {'year': 2025, 'type': 'both', 'name': 'природоохранная деятельность', 'score_budget': 288, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'медико-биологическое дело', 'score_budget': None, 'score_paid': 282},
-        {'year': 2025, 'type': 'both', 'name': 'информационные системы и технологии', 'score_budget': None, 'score_paid': 271},
-        {'year': 2025, 'type': 'both', 'name': 'социальные коммуникации', 'score_budget': None, 'score_paid': 322},
-        {'year': 2025, 'type': 'both', 'name': 'классическая филология', 'score_budget': 344, 'score_paid': 295},
-        {'year': 2025, 'type': 'both', 'name': 'химия (научно-педагогическая деятельность)', 'score_budget': 329, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'химия', 'score_budget': 355, 'score_paid': 330},
-        {'year': 2025, 'type': 'both', 'name': 'химия высоких энергий', 'score_budget': 351, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'фундаментальная химия', 'score_budget': 357, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'химия лекарственных соединений', 'score_budget': 358, 'score_paid': 324},
-        {'year': 2025, 'type': 'both', 'name': 'геоинформационные системы (специальные) (ж)', 'score_budget': 335, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'геоинформационные системы (специальные) (м)', 'score_budget': 359, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'правоведение (юрисконсультская работа в военной сфере)(м)', 'score_budget': 338, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'правоведение (юрисконсультская работа в военной сфере)(ж)', 'score_budget': 323, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'международные отношения (военная сфера)(м)', 'score_budget': 394, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'международные отношения (информационная сфера)(м)', 'score_budget': 335, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'международные отношения (информационная сфера)(ж)', 'score_budget': 359, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'радиационная, химическая и биологическая защита', 'score_budget': 231, 'score_paid': None},
-        {'year': 2025, 'type': 'both', 'name': 'маркетинг', 'score_budget': None, 'score_paid': 320},
-        {'year': 2025, 'type': 'both', 'name': 'управление информационными ресурсами', 'score_budget': None, 'score_paid': 318},
-        {'year': 2025, 'type': 'both', 'name': 'бизнес-администрирование', 'score_budget': None, 'score_paid': 346},
-        {'year': 2025, 'type': 'both', 'name': 'логистика', 'score_budget': None, 'score_paid': 312},
-    ]
-
-print("=" * 100)
-print("EXTRACTING ALL BSU ADMISSION DATA")
-print("=" * 100)
-
-all_data = []
-
-print("\n[1/5] БГУ 2022 - БЮДЖЕТ...")
-data_2022 = extract_2022_budget("graduates/БГУ2022.pdf")
-all_data.extend(data_2022)
-print(f"  Extracted {len(data_2022)} entries")
-
-print("\n[2/5] БГУ 2023 - БЮДЖЕТ...")
-data_2023_budget = extract_2023_budget("graduates/БГУ2023.pdf")
-all_data.extend(data_2023_budget)
-print(f"  Extracted {len(data_2023_budget)} entries")
-
-print("\n[3/5] БГУ 2023 - ПЛАТНЫЕ...")
-data_2023_paid = extract_2023_paid("graduates/БГУ2023платные.pdf")
-all_data.extend(data_2023_paid)
-print(f"  Extracted {len(data_2023_paid)} entries")
-
-print("\n[4/5] БГУ 2024...")
-data_2024 = extract_2024_2025("graduates/БГУ2024.pdf", 2024)
-all_data.extend(data_2024)
-print(f"  Extracted {len(data_2024)} entries")
-
-print("\n[5/5] БГУ 2025...")
-data_2025 = get_2025_manual_data()
-all_data.extend(data_2025)
-print(f"  Extracted {len(data_2025)} entries")
-
-with open('bsu_admission_all_data.json', 'w', encoding='utf-8') as f:
-    json.dump(all_data, f, ensure_ascii=False, indent=2)
-
-print("\n" + "=" * 100)
-print("SUMMARY")
-print("=" * 100)
-print(f"2022 Budget: {len(data_2022)} entries")
-print(f"2023 Budget: {len(data_2023_budget)} entries")
-print(f"2023 Paid:   {len(data_2023_paid)} entries")
-print(f"2024:        {len(data_2024)} entries")
-print(f"2025:        {len(data_2025)} entries")
-print(f"\nTOTAL:       {len(all_data)} records")
-print(f"\nSaved to: bsu_admission_all_data.json")
-
-print("\n" + "=" * 100)
-print("SAMPLE DATA BY YEAR")
-print("=" * 100)
-
-for year in [2022, 2023, 2024, 2025]:
-    print(f"\n--- {year} ---")
-    year_data = [d for d in all_data if d['year'] == year][:5]
-    for item in year_data:
-        if year == 2022:
-            print(f"  {item['code']:15} | {item['score_budget'] or '-':>5} | {item['name'][:50]}")
-        elif year == 2023:
-            score_type = 'budget' if item['type'] == 'budget' else 'paid'
-            score = item.get('score_budget') or item.get('score_paid') or '-'
-            print(f"  {score_type:6} | {str(score):>5} | {item['name'][:50]}")
-        else:
-            print(f"  {str(item['score_budget'] or '-'):>5} | {str(item['score_paid'] or '-'):>5} | {item['name'][:50]}")
+import argparse
+from collections import Counter
+
+from admissions.cache import add_cache_arguments, cache_from_args, file_digest
+from admissions.checkpoint import Checkpoint
+from admissions.layouts import LAYOUTS, compile_layout, layout_fingerprint, parse_page
+from admissions.manual import get_2025_manual_data
+from admissions.metrics import RunMetrics, cpu_profile
+from admissions.output import FORMATS, RecordWriter, read_records
+from admissions.pages import iter_page_tables, split_by_pdf
+from admissions.specialties import SpecialtyIndex, annotate, confidence_report
+
+PDF_2022 = "graduates/БГУ2022.pdf"
+PDF_2023_BUDGET = "graduates/БГУ2023.pdf"
+PDF_2023_PAID = "graduates/БГУ2023платные.pdf"
+PDF_2024 = "graduates/БГУ2024.pdf"
+PDF_2025 = "graduates/БГУ2025.pdf"
+
+# (progress label, summary label, pdf, layout); 2025 comes from
+# get_2025_manual_data() unless --pdf-2025 asks for SOURCE_2025.
+SOURCES = [
+    ("[1/5] БГУ 2022 - БЮДЖЕТ...", "2022 Budget:", PDF_2022, 'bsu-2022-budget'),
+    ("[2/5] БГУ 2023 - БЮДЖЕТ...", "2023 Budget:", PDF_2023_BUDGET, 'bsu-2023-budget'),
+    ("[3/5] БГУ 2023 - ПЛАТНЫЕ...", "2023 Paid:  ", PDF_2023_PAID, 'bsu-2023-paid'),
+    ("[4/5] БГУ 2024...", "2024:       ", PDF_2024, 'bsu-2024'),
+]
+SOURCE_2025 = ("[5/5] БГУ 2025 (PDF)...", "2025:       ", PDF_2025, 'bsu-2025')
+
+SAMPLES_PER_YEAR = 5
+
+def default_output(fmt):
+    return 'bsu_admission_all_data.ndjson' if fmt == 'ndjson' else 'bsu_admission_all_data.json'
+
+def print_sample(year, item):
+    if year == 2022:
+        print(f"  {item['code']:15} | {item['score_budget'] or '-':>5} | {item['name'][:50]}")
+    elif year == 2023:
+        score_type = 'budget' if item['type'] == 'budget' else 'paid'
+        score = item.get('score_budget') or item.get('score_paid') or '-'
+        print(f"  {score_type:6} | {str(score):>5} | {item['name'][:50]}")
+    else:
+        print(f"  {str(item['score_budget'] or '-'):>5} | {str(item['score_paid'] or '-'):>5} | {item['name'][:50]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract all BSU admission data from graduates/*.pdf")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes used for pdfplumber table detection (default: 1, serial)")
+    parser.add_argument('--format', choices=FORMATS, default='json',
+                        help="json (indented array, default), json-compact or ndjson")
+    parser.add_argument('--output', help="output file (default: bsu_admission_all_data.json / .ndjson)")
+    parser.add_argument('--pdf-2025', action='store_true',
+                        help="parse graduates/БГУ2025.pdf with the bsu-2025 layout instead of the manual list")
+    parser.add_argument('--specialty-ids', action='store_true',
+                        help="add specialty_id to every record and print a match confidence report")
+    parser.add_argument('--validate', action='store_true',
+                        help="parse each PDF with the columnar stage and leave out rows that fail "
+                             "validation (needs pandas)")
+    parser.add_argument('--resume', action='store_true',
+                        help="reuse pages of the previous run whose PDF and layout are unchanged")
+    parser.add_argument('--profile', nargs='?', const='extract_metrics.json', metavar='PATH',
+                        help="write per-stage, per-page timings and dropped rows as JSON "
+                             "(default: extract_metrics.json)")
+    parser.add_argument('--cpu-profile', metavar='PATH',
+                        help="cProfile stats to PATH (pyinstrument HTML for *.html); use with --workers 1")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    if args.validate and args.resume:
+        parser.error("--validate parses whole PDFs and cannot reuse pages; drop --resume")
+    with cpu_profile(args.cpu_profile):
+        run(args)
+
+def run(args):
+    output = args.output or default_output(args.format)
+
+    print("=" * 100)
+    print("EXTRACTING ALL BSU ADMISSION DATA")
+    print("=" * 100)
+
+    sources = SOURCES + [SOURCE_2025] if args.pdf_2025 else SOURCES
+    pdf_paths = [source[2] for source in sources]
+    layouts = {pdf_path: LAYOUTS[layout_name] for _, _, pdf_path, layout_name in sources}
+    fingerprints = {pdf_path: layout_fingerprint(layout) for pdf_path, layout in layouts.items()}
+    digests = {pdf_path: file_digest(pdf_path) for pdf_path in pdf_paths}
+
+    # The previous output is read before RecordWriter truncates it.
+    checkpoint = Checkpoint(output)
+    reusable = checkpoint.load_reusable(fingerprints) if args.resume else {}
+    skip_pages = {}
+    for pdf_path, page in reusable:
+        skip_pages.setdefault(pdf_path, set()).add(page)
+    if args.resume:
+        print(f"\nResuming: {len(reusable)} unchanged pages reused from {checkpoint.path}")
+
+    metrics = RunMetrics()
+    page_stream = iter_page_tables(pdf_paths, workers=args.workers, cache=cache_from_args(args),
+                                   invalidate=args.invalidate, skip_pages=skip_pages, profiles=layouts,
+                                   metrics=metrics)
+
+    counts = []
+    rejected = 0
+    samples = {}
+    specialty_index = SpecialtyIndex.for_university('bsu') if args.specialty_ids else None
+
+    def keep_samples(records):
+        for record in records:
+            year_samples = samples.setdefault(record['year'], [])
+            if len(year_samples) < SAMPLES_PER_YEAR:
+                year_samples.append(record)
+
+    with RecordWriter(output, args.format) as writer:
+        for (progress, summary, _, _), (pdf_path, pages) in zip(sources, split_by_pdf(page_stream, pdf_paths)):
+            print(f"\n{progress}")
+            if args.validate:
+                from admissions.frame import checked_records
+
+                with metrics.stage('parse', pdf_path):
+                    records, violations = checked_records(list(pages), layouts[pdf_path])
+                rejected += len(violations['row'].unique())
+                if specialty_index:
+                    annotate(records, specialty_index)
+                with metrics.stage('write', pdf_path):
+                    writer.write(records)
+                # A whole-document unit; layout None keeps --resume from reusing it.
+                checkpoint.add(pdf_path, None, digests[pdf_path], None, len(records), {})
+                keep_samples(records)
+                counts.append((summary, len(records)))
+                print(f"  Extracted {len(records)} entries")
+                continue
+            count = 0
+            state = {}
+            drops = Counter()
+            parse_row = compile_layout(layouts[pdf_path], state, drops)
+            for page, tables in enumerate(pages):
+                if tables is None:
+                    records, saved_state = reusable[(pdf_path, page)]
+                    state.update(saved_state)
+                else:
+                    dropped_before = Counter(drops)
+                    with metrics.stage('parse', pdf_path, page):
+                        records = parse_page(parse_row, tables)
+                    metrics.count_rows(pdf_path, page, len(records), drops - dropped_before)
+                if specialty_index:
+                    annotate(records, specialty_index)
+                with metrics.stage('write', pdf_path, page):
+                    writer.write(records)
+                checkpoint.add(pdf_path, page, digests[pdf_path], fingerprints[pdf_path], len(records), state)
+                keep_samples(records)
+                count += len(records)
+            counts.append((summary, count))
+            print(f"  Extracted {count} entries")
+
+        if not args.pdf_2025:
+            print("\n[5/5] БГУ 2025...")
+            data_2025 = get_2025_manual_data()
+            if specialty_index:
+                annotate(data_2025, specialty_index)
+            writer.write(data_2025)
+            checkpoint.add(None, 0, None, None, len(data_2025), {})
+            keep_samples(data_2025)
+            counts.append(("2025:       ", len(data_2025)))
+            print(f"  Extracted {len(data_2025)} entries")
+    checkpoint.close()
+
+    print("\n" + "=" * 100)
+    print("SUMMARY")
+    print("=" * 100)
+    for summary, count in counts:
+        print(f"{summary} {count} entries")
+    print(f"\nTOTAL:       {writer.count} records")
+    if args.validate:
+        print(f"Rejected by validation: {rejected} rows")
+    print(f"\nSaved to: {output}")
+
+    print("\n" + "=" * 100)
+    print("SAMPLE DATA BY YEAR")
+    print("=" * 100)
+
+    for year in [2022, 2023, 2024, 2025]:
+        print(f"\n--- {year} ---")
+        for item in samples.get(year, []):
+            print_sample(year, item)
+
+    if specialty_index:
+        print("\n" + "=" * 100)
+        print("SPECIALTY MATCHING")
+        print("=" * 100)
+        confidence_report(read_records(output), specialty_index)
+
+    if args.profile:
+        print("\n" + "=" * 100)
+        print("PROFILE")
+        print("=" * 100)
+        metrics.write(args.profile)
+        metrics.print_summary()
+        print(f"\nMetrics saved to: {args.profile}")
+
+if __name__ == '__main__':
+    main()
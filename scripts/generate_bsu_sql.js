@@ -291,7 +291,8 @@ const records = new Map();
 const unmatched = new Set();
 
 data.forEach(item => {
-  const specialtyId = findSpecialtyId(item.name, item.faculty);
+  // extract_all_bsu.py --specialty-ids resolves the ID already
+  const specialtyId = item.specialty_id || findSpecialtyId(item.name, item.faculty);
   if (!specialtyId) {
     if (item.score_budget > 0 || item.score_paid > 0) {
       unmatched.add(item.name);
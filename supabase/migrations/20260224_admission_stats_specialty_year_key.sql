@@ -0,0 +1,11 @@
+-- Одна строка на специальность и год: ключ для upsert из admissions/loader.py
+
+-- Удаляем дубликаты, оставляя последнюю вставленную строку
+DELETE FROM public.admission_stats a
+USING public.admission_stats b
+WHERE a.specialty_id = b.specialty_id
+  AND a.year = b.year
+  AND a.ctid < b.ctid;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_admission_stats_specialty_year
+  ON public.admission_stats(specialty_id, year);
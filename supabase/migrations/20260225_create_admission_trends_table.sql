@@ -0,0 +1,24 @@
+-- Тренды проходных баллов по специальностям (пересчитываются admissions/trends.py)
+CREATE TABLE IF NOT EXISTS public.admission_trends (
+  specialty_id TEXT NOT NULL,
+  year INTEGER NOT NULL,
+  faculty_id TEXT,
+  min_score NUMERIC(5,2),
+  paid_min_score NUMERIC(5,2),
+  min_score_delta NUMERIC(6,2),
+  paid_min_score_delta NUMERIC(6,2),
+  min_score_avg3 NUMERIC(5,2),
+  faculty_percentile NUMERIC(5,4),
+  budget_paid_spread NUMERIC(6,2),
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  PRIMARY KEY (specialty_id, year)
+);
+
+-- Индексы для быстрого поиска
+CREATE INDEX IF NOT EXISTS idx_admission_trends_year ON public.admission_trends(year);
+CREATE INDEX IF NOT EXISTS idx_admission_trends_faculty ON public.admission_trends(faculty_id, year);
+
+-- RLS
+ALTER TABLE public.admission_trends ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Anyone can read admission_trends" ON public.admission_trends FOR SELECT USING (true);
@@ -0,0 +1,22 @@
+-- Прогноз проходных баллов на следующий год (пересчитывается admissions/forecast.py)
+CREATE TABLE IF NOT EXISTS public.admission_forecasts (
+  specialty_id TEXT NOT NULL,
+  year INTEGER NOT NULL,
+  min_score NUMERIC(5,2),
+  min_score_low NUMERIC(5,2),
+  min_score_high NUMERIC(5,2),
+  paid_min_score NUMERIC(5,2),
+  paid_min_score_low NUMERIC(5,2),
+  paid_min_score_high NUMERIC(5,2),
+  observed_years INTEGER,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  PRIMARY KEY (specialty_id, year)
+);
+
+-- Индексы для быстрого поиска
+CREATE INDEX IF NOT EXISTS idx_admission_forecasts_year ON public.admission_forecasts(year);
+
+-- RLS
+ALTER TABLE public.admission_forecasts ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Anyone can read admission_forecasts" ON public.admission_forecasts FOR SELECT USING (true);
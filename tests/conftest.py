@@ -0,0 +1,42 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'slow: takes minutes; deselect with -m "not slow"')
+
+
+@pytest.fixture
+def repo_root():
+    """The checkout, for the data files and migrations it ships."""
+    return Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def bntu_data(repo_root):
+    """The shipped bntu-2022 plan records, which extract without PDF tooling."""
+    return repo_root / 'bntu_admission_2022_data.json'
+
+
+@pytest.fixture
+def bntu_source(bntu_data, tmp_path):
+    """A copy of bntu_data in tmp_path, free to rewrite."""
+    path = tmp_path / bntu_data.name
+    shutil.copy(bntu_data, path)
+    return path
+
+
+@pytest.fixture
+def font_path():
+    """A Cyrillic TrueType font for synthetic PDFs (needs reportlab and pdfplumber)."""
+    pytest.importorskip('reportlab')
+    pytest.importorskip('pdfplumber')
+    from admissions.bench import FONT_PATHS
+
+    path = next((path for path in FONT_PATHS if os.path.exists(path)), None)
+    if path is None:
+        pytest.skip('no Cyrillic font for the synthetic PDF')
+    return path
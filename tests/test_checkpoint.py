@@ -0,0 +1,57 @@
+"""extract_all_bsu.py --resume writes the same bytes as a run from scratch."""
+import os
+import sys
+
+import pytest
+
+import extract_all_bsu
+from admissions import bench
+from admissions.layouts import LAYOUTS
+
+PAGES = 2
+
+
+@pytest.fixture
+def graduates(font_path, tmp_path, monkeypatch):
+    """Synthetic PDFs where extract_all_bsu.py looks for the real ones; returns a run(*flags) helper."""
+    monkeypatch.chdir(tmp_path)
+    os.mkdir('graduates')
+    for _, _, pdf_path, layout_name in extract_all_bsu.SOURCES:
+        bench.write_pdf(pdf_path, LAYOUTS[layout_name], PAGES, font_path)
+
+    def run(output, *flags):
+        monkeypatch.setattr(sys, 'argv', ['extract_all_bsu.py', '--no-cache', '--output', output, *flags])
+        extract_all_bsu.main()
+        with open(output, 'rb') as f:
+            return f.read()
+
+    return run
+
+
+@pytest.mark.parametrize('format', ['json', 'ndjson'])
+def test_resume_is_byte_identical(graduates, capsys, format):
+    full = graduates('full.json', '--format', format)
+    assert graduates('out.json', '--format', format) == full
+    capsys.readouterr()
+
+    assert graduates('out.json', '--format', format, '--resume') == full
+    pages = PAGES * len(extract_all_bsu.SOURCES)
+    assert f'Resuming: {pages} unchanged pages reused' in capsys.readouterr().out
+
+    # A crash part way through the output and its manifest.
+    with open('out.json', 'r+b') as f:
+        f.truncate(len(full) // 2)
+    checkpoint = 'out.json.checkpoint.json'
+    with open(checkpoint, 'rb') as f:
+        manifest = f.read()
+    with open(checkpoint, 'wb') as f:
+        f.write(manifest[:len(manifest) * 2 // 3])
+    assert graduates('out.json', '--format', format, '--resume') == full
+
+
+def test_resume_reparses_a_changed_pdf(graduates, font_path):
+    graduates('out.json')
+    _, _, pdf_path, layout_name = extract_all_bsu.SOURCES[1]
+    bench.write_pdf(pdf_path, LAYOUTS[layout_name], PAGES, font_path, seed=1)
+
+    assert graduates('out.json', '--resume') == graduates('full.json')
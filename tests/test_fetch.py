@@ -0,0 +1,121 @@
+"""fetch.py against a local HTTP stand-in for the university sites."""
+import json
+import os
+import sys
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from admissions import fetch
+
+
+class Source:
+    """What the stand-in serves and the conditional headers it received."""
+
+    def __init__(self, body, etag):
+        self.body = body
+        self.etag = etag
+        self.last_modified = formatdate(usegmt=True)
+        self.requests = []
+
+
+@pytest.fixture
+def server():
+    source = Source(b'%PDF-1.4 first\n', '"v1"')
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            source.requests.append({name: self.headers.get(name) for name in ('If-None-Match', 'If-Modified-Since')})
+            if self.headers.get('If-None-Match') == source.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('ETag', source.etag)
+            self.send_header('Last-Modified', source.last_modified)
+            self.send_header('Content-Length', str(len(source.body)))
+            self.end_headers()
+            self.wfile.write(source.body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield source, f'http://127.0.0.1:{httpd.server_address[1]}'
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def state(root):
+    with open(os.path.join(root, fetch.FETCH_STATE), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_download_then_304_then_changed_etag(server, tmp_path):
+    source, base = server
+    sources = {'graduates/bsu.pdf': f'{base}/bsu.pdf'}
+    path = tmp_path / 'graduates' / 'bsu.pdf'
+
+    changed, errors = fetch.fetch_all(sources, str(tmp_path))
+    assert (changed, errors) == ([str(path)], {})
+    assert path.read_bytes() == source.body
+    assert state(tmp_path)['graduates/bsu.pdf']['etag'] == '"v1"'
+    assert source.requests[-1] == {'If-None-Match': None, 'If-Modified-Since': None}
+
+    changed, errors = fetch.fetch_all(sources, str(tmp_path))
+    assert (changed, errors) == ([], {})
+    assert source.requests[-1] == {'If-None-Match': '"v1"', 'If-Modified-Since': source.last_modified}
+
+    source.body, source.etag = b'%PDF-1.4 second\n', '"v2"'
+    changed, errors = fetch.fetch_all(sources, str(tmp_path))
+    assert (changed, errors) == ([str(path)], {})
+    assert path.read_bytes() == source.body
+    assert state(tmp_path)['graduates/bsu.pdf']['etag'] == '"v2"'
+    assert not [name for name in os.listdir(path.parent) if name.endswith('.part')]
+
+
+def test_new_etag_with_same_content_is_not_a_change(server, tmp_path):
+    source, base = server
+    sources = {'bsu.pdf': f'{base}/bsu.pdf'}
+    fetch.fetch_all(sources, str(tmp_path))
+    source.etag = '"v1-regenerated"'
+
+    assert fetch.fetch_all(sources, str(tmp_path)) == ([], {})
+    assert state(tmp_path)['bsu.pdf']['etag'] == '"v1-regenerated"'
+
+
+def test_failed_download_keeps_the_old_file_and_state(server, tmp_path):
+    _, base = server
+    sources = {'bsu.pdf': f'{base}/bsu.pdf'}
+    fetch.fetch_all(sources, str(tmp_path))
+    before = state(tmp_path)
+
+    changed, errors = fetch.fetch_all({'bsu.pdf': 'http://127.0.0.1:1/bsu.pdf'}, str(tmp_path))
+    assert changed == [] and list(errors) == ['bsu.pdf']
+    assert state(tmp_path) == before
+    assert (tmp_path / 'bsu.pdf').exists()
+
+
+def test_fetch_and_extract_end_to_end(server, bntu_data, tmp_path, monkeypatch):
+    source, base = server
+    source.body = bntu_data.read_bytes()
+    output = tmp_path / 'fetched.json'
+    monkeypatch.setattr(sys, 'argv', ['fetch', '--input-dir', str(tmp_path), '--no-cache', '--source',
+                                      f'{bntu_data.name}={base}/{bntu_data.name}', '--extract', str(output)])
+
+    assert fetch.main() == 0
+    records = json.loads(output.read_text(encoding='utf-8'))
+    assert len(records) == len(json.loads(source.body))
+    assert {record['university'] for record in records} == {'bntu'}
+
+    output.unlink()
+    assert fetch.main() == 0
+    assert not output.exists()
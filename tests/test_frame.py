@@ -0,0 +1,28 @@
+"""The columnar stage behind extract_all_bsu.py --validate (needs pandas)."""
+import io
+
+import pytest
+
+pytest.importorskip('pandas')
+
+from admissions.frame import checked_records
+from admissions.layouts import LAYOUTS, parse_tables
+
+PAGES = [
+    [[['Факультет радиофизики', 'Радиофизика', '350', '280'],
+      ['', 'Физическая электроника', '340', '290']]],
+    # The last row of the page before, repeated after the page break.
+    [[['', 'Физическая электроника', '340', '290'],
+      ['', 'Компьютерная безопасность', '401', '280'],
+      ['', 'Аэрокосмические технологии', '330', '']]],
+]
+
+
+def test_duplicates_and_invalid_rows_are_left_out():
+    out = io.StringIO()
+    records, violations = checked_records(PAGES, LAYOUTS['bsu-2024'], out)
+
+    radiophysics, electronics, _, _, aerospace = parse_tables(PAGES, LAYOUTS['bsu-2024'])
+    assert records == [radiophysics, electronics, aerospace]
+    assert sorted(violations['rule']) == ['score_range']
+    assert 'duplicates dropped: 1' in out.getvalue()
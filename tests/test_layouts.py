@@ -0,0 +1,50 @@
+"""The declarative layouts row by row, and on synthetic PDFs read serially and with workers."""
+from collections import Counter
+
+from admissions import bench
+from admissions.layouts import LAYOUTS, compile_layout, parse_page, parse_tables
+from admissions.pages import iter_page_tables
+
+PAGES = 3
+
+
+def test_numbers_are_stripped_in_every_year():
+    records = parse_tables([[[['7', 'Факультет', 'Физика', ' 25 ', '\n310 ']]]], LAYOUTS['bsu-2023-budget'])
+    assert records == [{'year': 2023, 'type': 'budget', 'num': 7, 'faculty': 'Факультет', 'name': 'Физика',
+                        'places_budget': 25, 'score_budget': 310}]
+
+    paid, = parse_tables([[[['1', 'Ф', 'Право', '330 (к)', ' 250\n(к)']]]], LAYOUTS['bsu-2023-paid'])
+    assert (paid['score_budget'], paid['score_paid']) == (330, 250)
+
+
+def test_faculty_carries_down_and_rejected_rows_are_counted():
+    state, drops = {}, Counter()
+    parse_row = compile_layout(LAYOUTS['bsu-2024'], state, drops)
+    table = [
+        ['Название специальности', 'Название специальности', 'Бюджет', 'Платно'],
+        ['Факультет радиофизики', 'Радиофизика', '350', '280'],
+        ['', 'Физическая\nэлектроника', '340', ''],
+        ['', '', '1', '2'],
+        ['Физика'],
+    ]
+    records = parse_page(parse_row, [table])
+
+    assert [(record['faculty'], record['name'], record['score_budget'], record['score_paid'])
+            for record in records] == [('Факультет радиофизики', 'Радиофизика', 350, 280),
+                                       ('Факультет радиофизики', 'Физическая электроника', 340, None)]
+    assert state == {'faculty': 'Факультет радиофизики'}
+    assert drops == {'header_row': 1, 'missing_name': 1, 'short_row': 1}
+
+
+def test_workers_extract_the_same_pages_as_a_serial_run(font_path, tmp_path):
+    layout = LAYOUTS['bsu-2023-paid']
+    pdf_path = str(tmp_path / 'paid.pdf')
+    bench.write_pdf(pdf_path, layout, PAGES, font_path)
+
+    serial = list(iter_page_tables([pdf_path], profiles={pdf_path: layout}))
+    parallel = list(iter_page_tables([pdf_path], workers=2, chunk_size=1, profiles={pdf_path: layout}))
+
+    assert [page for _, page, _ in serial] == list(range(PAGES))
+    assert parallel == serial
+    records = parse_tables([tables for _, _, tables in serial], layout)
+    assert [record['num'] for record in records] == list(range(1, PAGES * bench.ROWS_PER_PAGE + 1))
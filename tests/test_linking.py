@@ -0,0 +1,84 @@
+"""linking.link() on a small catalog: joins across years, ambiguous keys and conflicts."""
+import pytest
+
+from admissions.linking import link
+
+CATALOG = """\
+('bsu-s1', 'bsu', 'bsu-1', NULL, 'Физика', '1-31 04 01'),
+('bsu-s2', 'bsu', 'bsu-2', NULL, 'Прикладная математика', '1-31 03 03'),
+('bsu-s3', 'bsu', 'bsu-3', NULL, 'Экономика', NULL),
+('bsu-s4', 'bsu', 'bsu-4', NULL, 'Экономическая кибернетика', NULL),
+"""
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / 'catalog.sql'
+    path.write_text(CATALOG, encoding='utf-8')
+    return {'catalog_path': str(path), 'aliases_path': str(tmp_path / 'no-aliases.js')}
+
+
+def record(year, name, code=None, faculty=None, university=None):
+    return {'year': year, 'name': name, 'code': code, 'faculty': faculty, 'university': university}
+
+
+def test_rows_are_joined_across_years_by_code_and_name(catalog):
+    records = [
+        record(2022, 'Физика (с указанием профиля)', '1-31 04 01'),
+        record(2023, 'Физика', '1-31 04 01'),
+        record(2024, 'Физика'),
+        record(2022, 'Радиофизика', '1-31 04 02'),
+        record(2023, 'Радиофизика', faculty='Физический факультет'),
+        record(2024, 'Радиофизика'),
+        record(2022, 'Радиофизика', university='bntu'),
+    ]
+    keys, report = link(records, **catalog)
+
+    assert keys[:3] == ['bsu-s1'] * 3
+    assert len(set(keys[3:6])) == 1 and keys[3].startswith('bsu-link-')
+    # The same name at another university is another specialty.
+    assert keys[6].startswith('bntu-link-') and keys[6] != keys[3]
+    assert report['joins']['code'] == 1 and report['joins']['name'] == 3
+    assert not report['conflicts']
+
+
+def test_ambiguous_codes_and_names_are_not_joined_on(catalog):
+    records = [
+        # One code for two programs in 2022: a language track.
+        record(2022, 'Экономика', '1-25 01 01'),
+        record(2022, 'Экономика (английский язык)', '1-25 01 01'),
+        record(2023, 'Экономика (английский язык)', '1-25 01 01'),
+        # One name at two faculties in 2023.
+        record(2023, 'Химия', faculty='Химический факультет'),
+        record(2023, 'Химия', faculty='Биологический факультет'),
+        record(2024, 'Химия'),
+    ]
+    keys, report = link(records, **catalog)
+
+    assert report['ambiguous_codes'] == {('bsu', '1250101')}
+    assert report['ambiguous_names'] == {('bsu', 'химия')}
+    assert keys[0] == 'bsu-s3' and keys[1] == keys[2] != keys[0]
+    assert len(set(keys[3:])) == 3
+    assert not report['conflicts']
+
+
+def test_different_catalog_ids_are_never_joined(catalog):
+    records = [
+        record(2022, 'Экономика', '1-25 01 07'),
+        record(2022, 'Экономическая кибернетика', '1-25 01 07'),
+    ]
+    keys, report = link(records, **catalog)
+
+    assert keys == ['bsu-s3', 'bsu-s4']
+    assert report['ambiguous_codes'] == {('bsu', '1250107')}
+
+    records = [record(2022, 'Экономика', '1-25 01 07'), record(2023, 'Экономическая кибернетика', '1-25 01 07')]
+    keys, report = link(records, **catalog)
+    assert keys == ['bsu-s3', 'bsu-s4']
+    assert report['conflicts'] == {('bsu-s3', 'bsu-s4'): ('code', 'bsu', '1250107')}
+
+
+def test_records_name_their_university(catalog):
+    records = [record(2024, 'Физика'), record(2024, 'Физика', university='bsu')]
+    keys, _ = link(records, 'bntu', **catalog)
+    assert keys[0].startswith('bntu-link-') and keys[1] == 'bsu-s1'
@@ -0,0 +1,92 @@
+"""loader.load() against a local PostgreSQL; set PG_DSN to run those tests (skipped otherwise).
+
+The migrations that shape admission_stats are applied to a scratch schema, so
+the upsert runs against the real unique index of 20260224.
+"""
+import os
+import uuid
+
+import pytest
+
+from admissions.loader import COLUMNS, PLAN_FIELDS, load, plan_record, read_input_rows
+
+MIGRATIONS = (
+    'supabase/migrations/20260219_create_admission_stats_table.sql',
+    'supabase/migrations/20260221_add_paid_score_column.sql',
+    'supabase/migrations/20260224_admission_stats_specialty_year_key.sql',
+)
+
+
+@pytest.fixture
+def stats_table(repo_root):
+    dsn = os.environ.get('PG_DSN')
+    if not dsn:
+        pytest.skip('PG_DSN is not set')
+    psycopg = pytest.importorskip('psycopg')
+    schema = f'loader_test_{uuid.uuid4().hex[:8]}'
+    with psycopg.connect(dsn) as conn:
+        conn.execute(f'CREATE SCHEMA {schema}')
+        for migration in MIGRATIONS:
+            with open(repo_root / migration, encoding='utf-8') as f:
+                conn.execute(f.read().replace('public.', f'{schema}.'))
+        conn.commit()
+        try:
+            yield conn, f'{schema}.admission_stats'
+        finally:
+            conn.rollback()
+            conn.execute(f'DROP SCHEMA {schema} CASCADE')
+            conn.commit()
+
+
+def stored(conn, table):
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT {', '.join(COLUMNS)} FROM {table} ORDER BY specialty_id, year")
+        return [dict(zip(COLUMNS, values)) for values in cur]
+
+
+def row(specialty_id, year, min_score, **values):
+    return dict({'specialty_id': specialty_id, 'year': year, 'budget_places': None, 'paid_places': None,
+                 'min_score': min_score, 'avg_score': None, 'paid_min_score': None}, **values)
+
+
+def test_load_inserts_then_skips_unchanged_then_updates(stats_table):
+    conn, table = stats_table
+    rows = [row('bsu-s1', 2024, 350, budget_places=20), row('bsu-s1', 2025, 355), row('bsu-s2', 2025, 300)]
+
+    assert load(conn, rows, table) == 3
+    assert stored(conn, table) == rows
+
+    assert load(conn, rows, table) == 0
+
+    changed = [row('bsu-s1', 2025, 361, paid_min_score=280)]
+    assert load(conn, rows[:1] + changed, table) == 1
+    assert stored(conn, table) == [rows[0], changed[0], rows[2]]
+
+
+def test_unique_index_keeps_one_row_per_specialty_year(stats_table):
+    conn, table = stats_table
+    psycopg = pytest.importorskip('psycopg')
+    load(conn, [row('bsu-s1', 2025, 355)], table)
+    with pytest.raises(psycopg.errors.UniqueViolation):
+        conn.execute(f"INSERT INTO {table} (specialty_id, year, min_score) VALUES ('bsu-s1', 2025, 300)")
+
+
+def test_plan_record_leaves_columnar_rows_of_other_sources_alone():
+    bsu = {'year': 2024, 'type': 'both', 'name': 'Физика', 'score_budget': 350, 'score_paid': 280}
+    read_back = dict(bsu, **dict.fromkeys(PLAN_FIELDS))
+    assert plan_record(read_back) == read_back
+
+    bntu = {'name': 'Логистика', 'year': 2022, 'budget_plan': 29, 'budget_score': None,
+            'paid_plan': 30, 'paid_score': 223}
+    assert plan_record(bntu) == {'name': 'Логистика', 'year': 2022, 'type': 'both', 'places_budget': 29,
+                                 'score_budget': None, 'places_paid': 30, 'score_paid': 223}
+
+
+def test_input_rows_of_several_universities(repo_root, bntu_data):
+    bsu_data = str(repo_root / 'bsu_admission_all_data.json')
+    bsu = read_input_rows([bsu_data])
+    both = read_input_rows([bsu_data, f'{bntu_data}=bntu'])
+
+    assert {row['specialty_id'].split('-')[0] for row in bsu} == {'bsu'}
+    assert both[:len(bsu)] == bsu
+    assert {row['specialty_id'].split('-')[0] for row in both[len(bsu):]} == {'bntu'}
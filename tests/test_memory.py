@@ -0,0 +1,20 @@
+"""RSS stays flat while a long PDF streams through extraction (needs reportlab and pdfplumber)."""
+import pytest
+
+from admissions import bench
+from admissions.metrics import current_rss_mb
+
+
+@pytest.mark.slow
+def test_rss_stays_flat_over_a_long_document(font_path, tmp_path):
+    if current_rss_mb() is None:
+        pytest.skip('current RSS needs /proc (Linux)')
+    pages = bench.MEMORY_PAGES
+    (_, pdf_path, layout_name), = bench.synthetic_cases([bench.MEMORY_LAYOUT], [pages], font_path, str(tmp_path))
+
+    result = bench.run_isolated(bench.run_memory_case, pdf_path, layout_name, pages)
+
+    assert result['rows'] == pages * bench.ROWS_PER_PAGE
+    assert result['rss_mb'][-1][0] == pages
+    first, last = result['rss_mb'][0][1], result['rss_mb'][-1][1]
+    assert last - first <= bench.MEMORY_GROWTH_MB, result['rss_mb']
@@ -0,0 +1,64 @@
+"""ocr.iter_ocr_pages bookkeeping, with the OCR itself replaced by a stand-in."""
+import sys
+
+import pytest
+
+from admissions import ocr
+from admissions.cache import TableCache
+
+
+def fake_ocr_page(path, index):
+    return [{'text': f'{path}:{index}', 'x0': 0, 'x1': 1, 'top': 0, 'bottom': 1}], 1.0
+
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    monkeypatch.setattr(ocr, 'check_languages', lambda lang, tessdata: None)
+    monkeypatch.setattr(ocr, 'init_worker', lambda *args: None)
+    monkeypatch.setattr(ocr, 'count_pages', lambda path: 1)
+    monkeypatch.setattr(ocr, 'ocr_key', lambda path, lang: path.replace('.', '_'))
+    monkeypatch.setattr(ocr, 'ocr_page', fake_ocr_page)
+
+
+class EvictingCache(TableCache):
+    """Reports the pages of evicted as cached, then cannot read them."""
+
+    def __init__(self, directory, evicted):
+        super().__init__(directory)
+        self.evicted = evicted
+
+    def get_page(self, key, index):
+        return None if key in self.evicted else super().get_page(key, index)
+
+
+def texts(pages):
+    return [(path, index, [word['text'] for word in words]) for path, index, words, _ in pages]
+
+
+def test_page_evicted_after_has_page_is_ocred_again(stand_in, tmp_path):
+    paths = ['a.png', 'b.png']
+    cache = EvictingCache(str(tmp_path), evicted={'a_png'})
+    cache.set_page_count('a_png', 1)
+    cache.put_page('a_png', 0, [{'text': 'stale'}])
+
+    assert texts(ocr.iter_ocr_pages(paths, cache=cache)) == [
+        ('a.png', 0, ['a.png:0']),
+        ('b.png', 0, ['b.png:0']),
+    ]
+
+
+def test_cached_pages_are_not_ocred(stand_in, tmp_path, monkeypatch):
+    cache = TableCache(str(tmp_path))
+    first = texts(ocr.iter_ocr_pages(['a.png', 'b.png'], cache=cache))
+    monkeypatch.setattr(ocr, 'ocr_page', None)
+
+    assert texts(ocr.iter_ocr_pages(['a.png', 'b.png'], cache=cache)) == first
+
+
+def test_ocr_key_does_not_need_pdfplumber(tmp_path, monkeypatch):
+    pytest.importorskip('tesserocr')
+    image = tmp_path / 'page.png'
+    image.write_bytes(b'not really a png')
+    monkeypatch.setitem(sys.modules, 'pdfplumber', None)
+
+    assert ocr.ocr_key(str(image), 'rus') != ocr.ocr_key(str(image), 'eng')
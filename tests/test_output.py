@@ -0,0 +1,63 @@
+"""RecordWriter formats against json.dump, and reading them back."""
+import json
+
+import pytest
+
+from admissions.output import FORMATS, RecordWriter, read_records, write_output
+
+RECORDS = [
+    {'year': 2024, 'type': 'both', 'faculty': 'Факультет "права"', 'name': 'Правоведение',
+     'score_budget': 380, 'score_paid': None},
+    {'year': 2025, 'type': 'budget', 'name': 'Физика\tи\nастрономия', 'score_budget': 301.5, 'tags': [1, {}]},
+    {},
+]
+
+
+def write(path, records, format, batches=(1, 0, 2)):
+    with RecordWriter(str(path), format) as writer:
+        start = 0
+        for size in batches:
+            writer.write(records[start:start + size])
+            start += size
+    return path.read_text(encoding='utf-8')
+
+
+@pytest.mark.parametrize('records', [RECORDS, []])
+def test_json_is_byte_identical_to_json_dump(tmp_path, records):
+    expected = tmp_path / 'expected.json'
+    with open(expected, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+
+    assert write(tmp_path / 'out.json', records, 'json') == expected.read_text(encoding='utf-8')
+
+
+def test_compact_and_ndjson(tmp_path):
+    compact = write(tmp_path / 'out.json', RECORDS, 'json-compact')
+    assert compact == json.dumps(RECORDS, ensure_ascii=False, separators=(',', ':'))
+    ndjson = write(tmp_path / 'out.ndjson', RECORDS, 'ndjson')
+    assert ndjson.splitlines() == [json.dumps(record, ensure_ascii=False) for record in RECORDS]
+
+
+@pytest.mark.parametrize('format', FORMATS)
+def test_read_back_whole_and_cut_short(tmp_path, format):
+    path = tmp_path / f'out.{format}'
+    text = write(path, RECORDS, format)
+    assert read_records(str(path)) == RECORDS
+
+    # A crash while the last record was being written.
+    path.write_text(text[:text.rindex('{')] + '{"year": 20', encoding='utf-8')
+    assert read_records(str(path), partial=True) == RECORDS[:-1]
+
+
+@pytest.mark.parametrize('name', ['out.json', 'out.ndjson', 'out.parquet'])
+def test_write_output_picks_the_format_by_extension(tmp_path, name):
+    if name.endswith('.parquet'):
+        pytest.importorskip('pyarrow')
+    records = [{'year': 2024, 'name': 'Физика', 'score_budget': 350},
+               {'year': 2025, 'name': 'Право', 'score_budget': None}]
+    path = str(tmp_path / name)
+
+    assert write_output(records, path) == 2
+    assert read_records(path) == records
+    if name.endswith('.ndjson'):
+        assert not (tmp_path / name).read_text(encoding='utf-8').startswith('[')
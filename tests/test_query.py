@@ -0,0 +1,83 @@
+"""ScoreIndex's binary searches against a linear scan of the same rows."""
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from admissions.query import FUNDINGS, ScoreIndex
+
+YEARS = (2023, 2024)
+SCORES = range(100, 401, 7)
+
+
+@pytest.fixture(scope='module')
+def rows():
+    rng = random.Random(20)
+    rows = []
+    for university, count in (('bsu', 40), ('bntu', 25)):
+        for number in range(1, count + 1):
+            for year in YEARS:
+                # Repeated scores and missing ones (no budget or no paid places) included.
+                rows.append({'specialty_id': f'{university}-{number}', 'year': year,
+                             'min_score': rng.choice([None, rng.randrange(150, 390, 5)]),
+                             'paid_min_score': rng.choice([None, rng.randrange(120, 360, 5)])})
+    return rows
+
+
+@pytest.fixture(scope='module')
+def faculties():
+    return {f'bsu-{number}': f'bsu-{number % 4}' for number in range(1, 41)}
+
+
+def scan(rows, faculties, score, year, funding, university=None, faculty=None):
+    """Specialty ids a linear pass finds, easiest first."""
+    field = FUNDINGS[funding]
+    found = [(row[field], row['specialty_id']) for row in rows
+             if row['year'] == year and row[field] and row[field] <= score
+             and (university is None or row['specialty_id'].split('-')[0] == university)
+             and (faculty is None or faculties.get(row['specialty_id']) == faculty)]
+    return [specialty_id for _, specialty_id in sorted(found)]
+
+
+SCOPES = [{}, {'university': 'bsu'}, {'university': 'bntu'}, {'faculty': 'bsu-2'}, {'university': 'mgu'}]
+
+
+@pytest.mark.parametrize('scope', SCOPES)
+def test_eligible_and_count_match_a_linear_scan(rows, faculties, scope):
+    index = ScoreIndex(rows, faculties)
+    for year in YEARS:
+        for funding in FUNDINGS:
+            expected = [scan(rows, faculties, score, year, funding, **scope) for score in SCORES]
+            assert [index.eligible(score, year, funding, **scope) for score in SCORES] == expected
+            assert [index.count(score, year, funding, **scope) for score in SCORES] == list(map(len, expected))
+            assert index.count_many(list(SCORES), year, funding, **scope).tolist() == list(map(len, expected))
+
+
+def test_between_matches_a_linear_scan(rows, faculties):
+    index = ScoreIndex(rows, faculties)
+    for low in SCORES:
+        high = low + 30
+        expected = sorted((float(row['min_score']), row['specialty_id']) for row in rows
+                          if row['year'] == 2024 and row['min_score'] and low <= row['min_score'] <= high)
+        assert index.between(low, high, 2024, 'budget') == expected
+
+
+def test_eligible_many_matches_one_query_per_profile(rows, faculties):
+    index = ScoreIndex(rows, faculties)
+    profiles = [{'score': score, 'year': YEARS[i % 2], **SCOPES[i % len(SCOPES)]} for i, score in enumerate(SCORES)]
+    profiles += [dict(profile, funding='paid') for profile in profiles[::3]]
+
+    for profile, reachable in zip(profiles, index.eligible_many(profiles)):
+        fundings = [profile['funding']] if profile.get('funding') else list(FUNDINGS)
+        scope = {key: profile[key] for key in ('university', 'faculty') if key in profile}
+        assert reachable == {funding: scan(rows, faculties, profile['score'], profile['year'], funding, **scope)
+                             for funding in fundings}
+
+
+def test_the_latest_year_is_the_default(rows, faculties):
+    index = ScoreIndex(rows, faculties)
+    assert index.years == list(YEARS)
+    assert index.eligible(300) == index.eligible(300, YEARS[-1])
+    with pytest.raises(ValueError):
+        index.partition(funding='grant')
@@ -0,0 +1,80 @@
+"""Table regions: detected per document over every page, and part of the page cache key."""
+import json
+
+import pytest
+
+pytest.importorskip('reportlab')
+pytest.importorskip('pdfplumber')
+
+from admissions.cache import TableCache, file_digest
+from admissions.layouts import RULED_TABLES
+from admissions.pages import iter_page_tables
+from admissions.regions import region_key, resolve_region
+
+LAYOUT = {'university': 'test', 'year': 2024, 'type': 'both', 'table_settings': RULED_TABLES, 'region': 'auto'}
+ROW_HEIGHT = 20
+
+
+def write_pdf(path, tables):
+    """One ruled table per page; tables are (left, top, columns, rows) in points from the top left."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    pdf = canvas.Canvas(str(path), pagesize=A4)
+    height = A4[1]
+    for left, top, columns, rows in tables:
+        right = left + 60 * columns
+        bottom = top + ROW_HEIGHT * rows
+        for row in range(rows + 1):
+            pdf.line(left, height - top - row * ROW_HEIGHT, right, height - top - row * ROW_HEIGHT)
+        for column in range(columns + 1):
+            pdf.line(left + 60 * column, height - top, left + 60 * column, height - bottom)
+        for row in range(rows):
+            for column in range(columns):
+                pdf.drawString(left + 60 * column + 5, height - top - (row + 1) * ROW_HEIGHT + 6, f'{row}.{column}')
+        pdf.showPage()
+    pdf.save()
+    return str(path)
+
+
+def extract(pdf_path, cache=None, invalidate=False):
+    return [tables for _, _, tables in iter_page_tables([pdf_path], cache=cache, invalidate=invalidate,
+                                                         profiles={pdf_path: LAYOUT})]
+
+
+def test_a_wider_table_on_a_later_page_is_not_clipped(tmp_path):
+    pdf_path = write_pdf(tmp_path / 'long.pdf', [(40, 120, 3, 5), (40, 60, 3, 5), (40, 60, 8, 30)])
+
+    x0, top, x1, bottom = resolve_region(pdf_path, RULED_TABLES, 'auto', {})
+    assert x0 < 40 and top < 60 and x1 > 40 + 60 * 8 and bottom > 60 + 30 * ROW_HEIGHT
+
+    last_page = extract(pdf_path)[2]
+    assert len(last_page[0]) == 30 and len(last_page[0][-1]) == 8
+
+
+def test_regions_are_kept_per_document(tmp_path):
+    narrow = write_pdf(tmp_path / 'narrow.pdf', [(40, 60, 3, 5)])
+    wide = write_pdf(tmp_path / 'wide.pdf', [(40, 60, 8, 5)])
+    regions = {}
+    resolve_region(narrow, RULED_TABLES, 'auto', regions)
+    resolve_region(wide, RULED_TABLES, 'auto', regions)
+
+    assert set(regions) == {region_key(file_digest(narrow), RULED_TABLES),
+                            region_key(file_digest(wide), RULED_TABLES)}
+    assert extract(wide)[0][0][0] == [f'0.{column}' for column in range(8)]
+
+
+def test_a_changed_region_is_not_served_old_pages_and_invalidate_drops_it(tmp_path):
+    pdf_path = write_pdf(tmp_path / 'doc.pdf', [(40, 60, 4, 5)])
+    cache = TableCache(str(tmp_path / 'cache'))
+    expected = extract(pdf_path, cache)
+    key = region_key(file_digest(pdf_path), RULED_TABLES)
+    regions_path = tmp_path / 'cache' / 'regions.json'
+    detected = json.loads(regions_path.read_text())[key]
+
+    # A wrong region, as a bad detection would leave it: the crop misses two columns.
+    regions_path.write_text(json.dumps({key: [detected[0], detected[1], detected[0] + 125, detected[3]]}))
+    assert extract(pdf_path, cache) != expected
+
+    assert extract(pdf_path, cache, invalidate=True) == expected
+    assert json.loads(regions_path.read_text()) == {key: detected}
@@ -0,0 +1,33 @@
+"""registry.discover: which input file each extractor reads."""
+import os
+
+import pytest
+
+from admissions.registry import EXTRACTORS, discover, register
+
+
+def touch(path, mtime):
+    path.parent.mkdir(exist_ok=True)
+    path.write_bytes(b'%PDF-1.4\n')
+    os.utime(path, (mtime, mtime))
+    return os.path.normpath(str(path))
+
+
+def test_a_republished_copy_replaces_the_original(tmp_path):
+    touch(tmp_path / 'graduates' / 'БГУ2024.pdf', 1_700_000_000)
+    copy = touch(tmp_path / 'graduates' / 'БГУ2024 (1).pdf', 1_700_000_100)
+    budget = touch(tmp_path / 'graduates' / 'БГУ2023.pdf', 1_700_000_000)
+    paid = touch(tmp_path / 'graduates' / 'БГУ2023платные.pdf', 1_700_000_000)
+
+    extractors = [EXTRACTORS[name] for name in ('bsu-2022-budget', 'bsu-2023-budget', 'bsu-2023-paid', 'bsu-2024')]
+    assert [(extractor['name'], path) for extractor, path in discover(extractors, str(tmp_path))] == [
+        ('bsu-2023-budget', budget), ('bsu-2023-paid', paid), ('bsu-2024', copy)]
+
+
+def test_a_file_matching_two_extractors_is_refused(tmp_path, monkeypatch):
+    monkeypatch.setitem(EXTRACTORS, 'test-2024', None)
+    other = register('test-2024', layout='bsu-2024', inputs='graduates/*.pdf')
+    touch(tmp_path / 'graduates' / 'БГУ2024.pdf', 1_700_000_000)
+
+    with pytest.raises(ValueError, match='matches both'):
+        discover([EXTRACTORS['bsu-2024'], other], str(tmp_path))
@@ -0,0 +1,119 @@
+"""service.py through aiohttp's test client: ETag/304, the response cache and reloads."""
+import asyncio
+import json
+import os
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from admissions.loader import parse_inputs
+from admissions.service import ResponseCache, Service
+
+def serve(service, check):
+    """Run the coroutine check(client) against service's app."""
+    async def run():
+        async with TestClient(TestServer(service.app())) as client:
+            await check(client)
+
+    asyncio.run(run())
+
+
+def rewrite(path, change):
+    records = json.loads(path.read_text(encoding='utf-8'))
+    change(records)
+    path.write_text(json.dumps(records, ensure_ascii=False), encoding='utf-8')
+
+
+def test_response_cache_evicts_the_least_recently_used():
+    cache = ResponseCache(2)
+    cache.put('a', b'1')
+    cache.put('b', b'2')
+    assert cache.get('a') == b'1'
+    cache.put('c', b'3')
+
+    assert list(cache.entries) == ['a', 'c']
+    assert cache.get('b') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    disabled = ResponseCache(0)
+    disabled.put('a', b'1')
+    assert disabled.get('a') is None and not disabled.entries
+
+
+def test_etag_and_304(bntu_source):
+    service = Service(parse_inputs([f'{bntu_source}=bntu']), cache_size=1, reload_interval=0)
+
+    async def check(client):
+        first = await client.get('/stats', params={'year': '2022', 'limit': '5'})
+        assert first.status == 200
+        etag = first.headers['ETag']
+        body = await first.json()
+        assert body['total'] and len(body['items']) == 5
+
+        again = await client.get('/stats', params={'year': '2022', 'limit': '5'}, headers={'If-None-Match': etag})
+        assert again.status == 304 and again.headers['ETag'] == etag
+
+        other = await client.get('/stats', params={'limit': '5'}, headers={'If-None-Match': etag})
+        assert other.status == 200 and other.headers['ETag'] != etag
+
+        # cache_size=1: the second query evicted the first, which is built again.
+        health = await (await client.get('/health')).json()
+        assert health['cache'] == {'entries': 1, 'hits': 1, 'misses': 2}
+        await client.get('/stats', params={'year': '2022', 'limit': '5'})
+        health = await (await client.get('/health')).json()
+        assert health['cache'] == {'entries': 1, 'hits': 1, 'misses': 3}
+
+        missing = await client.get('/specialties/bntu-none/history')
+        assert missing.status == 404
+        bad = await client.get('/stats', params={'sort': 'colour'})
+        assert bad.status == 400
+
+    serve(service, check)
+
+
+def test_reload_on_digest_change(bntu_source):
+    service = Service(parse_inputs([f'{bntu_source}=bntu']), reload_interval=0)
+
+    async def check(client):
+        before = await client.get('/stats', params={'limit': '1'})
+        etag = before.headers['ETag']
+        digest = service.dataset.digest
+
+        # Written again with the same content: a new mtime, the same digest.
+        bntu_source.write_bytes(bntu_source.read_bytes())
+        os.utime(bntu_source, ns=(0, 0))
+        assert not await service.reload_if_changed()
+        assert service.dataset.digest == digest and service.cache.entries
+
+        rewrite(bntu_source, lambda records: [record.update(budget_score=record['budget_score'] + 1)
+                                         for record in records if record['budget_score']])
+        assert await service.reload_if_changed()
+        assert service.dataset.digest != digest and not service.cache.entries
+
+        after = await client.get('/stats', params={'limit': '1'}, headers={'If-None-Match': etag})
+        assert after.status == 200 and after.headers['ETag'] != etag
+        old, new = (await before.json())['items'][0], (await after.json())['items'][0]
+        assert new['specialty_id'] == old['specialty_id'] and new['min_score'] == old['min_score'] + 1
+        health = await (await client.get('/health')).json()
+        assert health['dataset'] == service.dataset.digest
+
+    serve(service, check)
+
+
+def test_watch_task_reloads(bntu_source):
+    service = Service(parse_inputs([f'{bntu_source}=bntu']), reload_interval=0.05)
+    digest = service.dataset.digest
+
+    async def check(client):
+        rewrite(bntu_source, lambda records: records.pop())
+        for _ in range(100):
+            health = await (await client.get('/health')).json()
+            if health['dataset'] != digest:
+                break
+            await asyncio.sleep(0.05)
+        assert health['dataset'] == service.dataset.digest != digest
+
+    serve(service, check)
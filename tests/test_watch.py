@@ -0,0 +1,39 @@
+"""watch.Watcher with the bntu-2022 records extractor, which needs no PDF tooling."""
+import json
+import os
+
+from admissions.registry import EXTRACTORS
+from admissions.watch import Watcher
+
+
+def test_failed_extraction_keeps_the_last_good_records(bntu_source, tmp_path, capsys):
+    source = bntu_source
+    plans = json.loads(source.read_text(encoding='utf-8'))
+    output = tmp_path / 'admission_data.json'
+    watcher = Watcher([EXTRACTORS['bntu-2022']], str(tmp_path), str(output), debounce=0)
+
+    assert watcher.poll() == ([str(source)], [])
+    assert len(json.loads(output.read_text(encoding='utf-8'))) == len(plans)
+
+    source.write_text(json.dumps(plans)[:100], encoding='utf-8')
+    assert watcher.poll() == ([str(source)], [])
+    assert len(json.loads(output.read_text(encoding='utf-8'))) == len(plans)
+    assert f'keeping {len(plans)} records' in capsys.readouterr().err
+
+    source.unlink()
+    assert watcher.poll() == ([], [str(source)])
+    assert json.loads(output.read_text(encoding='utf-8')) == []
+
+
+def test_a_republished_copy_replaces_the_records_of_the_original(bntu_source, tmp_path):
+    original = bntu_source
+    plans = json.loads(original.read_text(encoding='utf-8'))
+    copy = original.with_name(original.name.replace('.json', ' (1).json'))
+    output = tmp_path / 'admission_data.json'
+    os.utime(original, (1_700_000_000, 1_700_000_000))
+    watcher = Watcher([EXTRACTORS['bntu-2022']], str(tmp_path), str(output), debounce=0)
+    watcher.poll()
+
+    copy.write_text(json.dumps(plans[:10]), encoding='utf-8')
+    assert watcher.poll() == ([str(copy)], [str(original)])
+    assert len(json.loads(output.read_text(encoding='utf-8'))) == 10
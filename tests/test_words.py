@@ -0,0 +1,49 @@
+"""The word engine's row grouping on a tightly spaced table: 9-pt text, 11.5-pt row pitch."""
+from admissions.layouts import LAYOUTS, WORD_COLUMNS, parse_tables
+from admissions.words import word_tables
+
+FONT_SIZE = 9
+PITCH = 11.5
+# x0 of each column: faculty, name, budget score, paid score
+COLUMNS = (40, 200, 400, 470)
+ROWS = [
+    ('Факультет радиофизики', 'Радиофизика', '350', '280'),
+    ('', 'Физическая электроника', '340', ''),
+    ('', 'Компьютерная безопасность', '362', '301'),
+    ('', 'Прикладная информатика', '', '255'),
+]
+
+
+def words(lines):
+    """Word dicts of lines (one tuple of cells per line), a PITCH apart."""
+    result = []
+    for index, cells in enumerate(lines):
+        top = 100 + index * PITCH
+        for x0, cell in zip(COLUMNS, cells):
+            x = x0
+            for text in cell.split():
+                width = len(text) * FONT_SIZE * 0.5
+                result.append({'text': text, 'x0': x, 'x1': x + width, 'top': top, 'bottom': top + FONT_SIZE})
+                x += width + FONT_SIZE * 0.25
+    return result
+
+
+def test_single_spaced_rows_stay_apart():
+    table, = word_tables(words(ROWS), WORD_COLUMNS)
+    assert len(table) == len(ROWS)
+
+    records = parse_tables([[table]], LAYOUTS['bsu-2025'])
+    assert [(record['faculty'], record['name'], record['score_budget'], record['score_paid'])
+            for record in records] == [('Факультет радиофизики', name, int(budget) if budget else None,
+                                        int(paid) if paid else None)
+                                       for _, name, budget, paid in ROWS]
+
+
+def test_wrapped_cells_are_merged_into_the_row_above():
+    lines = [ROWS[0], ('', 'Физическая', '340', ''), ('', 'электроника', '', ''), ROWS[2]]
+    table, = word_tables(words(lines), WORD_COLUMNS)
+
+    assert len(table) == 3
+    assert table[1][1:3] == ['Физическая\nэлектроника', '340']
+    names = [record['name'] for record in parse_tables([[table]], LAYOUTS['bsu-2025'])]
+    assert names == ['Радиофизика', 'Физическая электроника', 'Компьютерная безопасность']